@@ -4,38 +4,51 @@ Accurate Reddit Scraper for Competitor Sentiment Analysis
 Uses Brian's specified Reddit search links for 6 competitors
 """
 
-import praw
-import json
 import os
-import requests
 from datetime import datetime, timezone, timedelta
-from textblob import TextBlob
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-import re
+import sqlite3
 import time
+import threading
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import nullcontext
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 
 # Load environment variables first
 load_dotenv()
 
 from config import *
+from rate_limiter import HostRateLimiter, OAUTH_HOST
+from source_state import SourceStateStore, COMPLETE_LISTING_STOPS
+from query_planner import plan_sources, parse_source, planned_fetch, SPLIT_MERGED_STOPS
+from post_index import PostIndex, canonical_post_id
+from pipeline_stages import StageStats, print_stage_report
+from sentiment_cache import SentimentCache, content_key
+from keyword_rules import DETECT_BRAND_PATTERNS, PRIMARY_BRAND_PATTERNS, shared_matcher
+from mention_index import MentionIndex
+from batch_scoring import score_posts, SENTIMENT_FIELDS
+from post_stream import stream, batched
+from sentiment_engines import create_engine
+from web_listings import json_listing_url, parse_json_listing, parse_html_listing
+from post_ndjson import PostWriter, partial_path
+import artifacts
+import data_codec
 
 class AccurateScraper:
-    def __init__(self):
+    def __init__(self, analysis_only=False, sentiment_engine=None):
+        # Sentiment models (all a batch-scoring worker needs)
+        self.sentiment_engine = create_engine(sentiment_engine)
+        if analysis_only:
+            return
+        
         # Initialize Reddit API if credentials available
         self.reddit = None
         print(f"Reddit API credentials check: ID={bool(REDDIT_CLIENT_ID)}, SECRET={bool(REDDIT_CLIENT_SECRET)}")
         
         if REDDIT_CLIENT_ID and REDDIT_CLIENT_SECRET:
             try:
-                self.reddit = praw.Reddit(
-                    client_id=REDDIT_CLIENT_ID,
-                    client_secret=REDDIT_CLIENT_SECRET,
-                    user_agent=REDDIT_USER_AGENT
-                )
+                self.reddit = self.new_reddit_client()
                 # Test the connection
                 print(f"Reddit API initialized successfully. User: {self.reddit.user.me()}")
             except Exception as e:
@@ -43,7 +56,224 @@ class AccurateScraper:
         else:
             print("Reddit API credentials not found - will use web scraping fallback")
         
-        self.analyzer = SentimentIntensityAnalyzer()
+        # Persistent sentiment results (keyed by text + primary brand + ruleset version)
+        self.sentiment_cache = SentimentCache(enabled=SENTIMENT_CACHE_ENABLED)
+        
+        # Per-host token buckets (replace the fixed sleep between sources)
+        self.rate_limiter = HostRateLimiter()
+        self._local = threading.local()
+        
+        # Post IDs already claimed this run (dedupe before analysis)
+        self.post_index = PostIndex()
+        self.stages = StageStats()
+        
+        # Pages/items used per PRAW listing source
+        self.listing_stats = {}
+        self.stats_lock = threading.Lock()
+        
+        # Shared keep-alive connection pools for web scraping (requests/urllib3 load here, not at import)
+        from http_session import SessionPool
+        from http_cache import HTTPCache
+        from hedged_requests import HedgedRequester
+        self.http = SessionPool(base_url=REDDIT_STANDIN_URL)
+        # Replayed fixtures must never be cached under the real URLs
+        self.http_cache = HTTPCache(enabled=HTTP_CACHE_ENABLED and not REDDIT_STANDIN_URL)
+        
+        # Slow old.reddit.com / www.reddit.com pages are raced against the other host
+        self.hedger = HedgedRequester(self.http.histograms) if HEDGED_REQUESTS else None
+        
+        # Per-source high-water marks for incremental refreshes
+        self.source_state = SourceStateStore() if INCREMENTAL_SCRAPE else None
+        
+    def get_reddit_client(self):
+        """Return a PRAW client for the current thread
+        
+        PRAW instances are not thread-safe, so each fetch worker gets its own.
+        """
+        if self.reddit is None or threading.current_thread() is threading.main_thread():
+            return self.reddit
+        
+        client = getattr(self._local, 'reddit', None)
+        if client is None:
+            client = self.new_reddit_client()
+            self._local.reddit = client
+        return client
+    
+    def new_reddit_client(self):
+        """A new PRAW client (pointed at REDDIT_STANDIN_URL when replaying fixtures)"""
+        import praw  # heavy; only the scraping path needs it
+        standin = {'oauth_url': REDDIT_STANDIN_URL, 'reddit_url': REDDIT_STANDIN_URL} if REDDIT_STANDIN_URL else {}
+        return praw.Reddit(
+            client_id=REDDIT_CLIENT_ID,
+            client_secret=REDDIT_CLIENT_SECRET,
+            user_agent=REDDIT_USER_AGENT,
+            **standin
+        )
+    
+    def throttle(self, url_or_host):
+        """Wait for the host's token bucket and track the wait for this thread"""
+        waited = self.rate_limiter.acquire(url_or_host)
+        self._local.rate_wait = getattr(self._local, 'rate_wait', 0.0) + waited
+        return waited
+    
+    def throttle_api(self):
+        """Feed this thread's PRAW quota (reddit.auth.limits) to the OAuth bucket, then wait for a slot"""
+        client = self.get_reddit_client()
+        if client is not None:
+            self.rate_limiter.update_quota(OAUTH_HOST, client.auth.limits)
+        return self.throttle(OAUTH_HOST)
+    
+    def http_get(self, url, headers, timeout=30, on_send=None):
+        """GET through the on-disk HTTP cache; only throttles when the network is used
+        
+        on_send: optional callback run once the rate limiter lets the request out
+        """
+        def fetch(url, request_headers):
+            self.throttle(url)
+            if on_send:
+                on_send()
+            response = self.http.get(url, headers=request_headers, timeout=timeout)
+            self.rate_limiter.observe(url, response.headers, response.status_code)
+            return response
+        
+        return self.http_cache.get(url, fetch, headers=headers)
+    
+    def web_get(self, url, headers, timeout=30, accept=None):
+        """GET a listing page (raising on HTTP errors), hedged to the alternate host when enabled
+        
+        accept(response): a hedged response only wins early if it passes (e.g. has listing markup).
+        """
+        if self.hedger is None:
+            response = self.http_get(url, headers, timeout=timeout)
+            response.raise_for_status()
+            return response
+        
+        sent = threading.Event()
+        
+        def fetch(target):
+            # Runs on a hedge thread - carry its rate-limit wait back with the response
+            self._local.rate_wait = 0.0
+            response = self.http_get(target, headers, timeout=timeout, on_send=sent.set if target == url else None)
+            response.raise_for_status()
+            response.rate_wait = self._local.rate_wait
+            return response
+        
+        # The hedge delay runs from when the primary is sent, not from its rate-limit wait
+        response = self.hedger.get(url, fetch, accept=accept, sent=sent)
+        self._local.rate_wait = getattr(self._local, 'rate_wait', 0.0) + getattr(response, 'rate_wait', 0.0)
+        return response
+    
+    def scrape_source(self, url, brand, start_time, end_time):
+        """Scrape one source incrementally
+        
+        Only posts newer than the source's high-water mark are fetched; they are
+        merged into the stored window and the window's posts are returned. A
+        listing that did not reach the window start, the mark or its end (an HTML
+        fallback page, a failed page, the page cap) is added to the window
+        without touching the stored state.
+        """
+        if self.source_state is None:
+            return self.scrape_reddit_link(url, brand, start_time, end_time)
+        
+        since = self.source_state.high_water_mark(url, start_time)
+        new_posts = self.scrape_reddit_link(url, brand, start_time, end_time, since=since)
+        stopped = (getattr(self._local, 'listing_stats', None) or {}).get('stopped')
+        if stopped in COMPLETE_LISTING_STOPS:
+            stored = self.source_state.merge(url, brand, new_posts, start_time, full_fetch=since is None)
+        else:
+            # Posts between the last page read and the old mark are still missing, so
+            # the mark stays where it is and the next run fetches them again
+            stored = self.source_state.stored_posts(url)
+        
+        if since is not None:
+            print(f"  Incremental: {len(new_posts)} new posts since high-water mark for {url}")
+        
+        # Stored posts are all real; keep any sample fallback posts from this fetch too
+        posts = {p['url']: p for p in stored if start_time.timestamp() <= p['created_utc'] <= end_time.timestamp()}
+        for post in new_posts:
+            posts.setdefault(post['url'], post)
+        return list(posts.values())
+    
+    def fetch_sources(self, jobs, start_time, end_time, incremental=True):
+        """Fetch (brand, url) sources concurrently with a bounded thread pool
+        
+        Returns per-source post lists in the same order as jobs, plus a timing
+        report comparing wall-clock time against a serialized run.
+        """
+        report = {}
+        results = [None] * len(jobs)
+        for index, posts, fetch_time, error in self.iter_sources(jobs, start_time, end_time, incremental, report):
+            results[index] = (posts, fetch_time, error)
+        return results, report
+    
+    def iter_sources(self, jobs, start_time, end_time, incremental=True, report=None):
+        """Yield (index, posts, fetch_time, error) for each (brand, url) source as its fetch completes
+        
+        SCRAPE_MAX_WORKERS fetches run at once and no more than that many finished
+        sources wait to be consumed, so a slow consumer holds back the fetching.
+        report (a dict) receives the fetch timing report once every source is done.
+        """
+        scrape = self.scrape_source if incremental else self.scrape_reddit_link
+        
+        def fetch(job):
+            brand, url = job
+            self._local.rate_wait = 0.0
+            self._local.listing_stats = None
+            started = time.perf_counter()
+            error = None
+            try:
+                posts = scrape(url, brand, start_time, end_time)
+            except Exception as e:
+                posts = []
+                error = str(e)
+            elapsed = time.perf_counter() - started
+            if self._local.listing_stats:
+                with self.stats_lock:
+                    self.listing_stats[url] = self._local.listing_stats
+            return posts, elapsed - self._local.rate_wait, error
+        
+        workers = max(1, min(SCRAPE_MAX_WORKERS, len(jobs)))
+        queued = iter(enumerate(jobs))
+        pending = {}
+        fetch_times = []
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            def submit_next():
+                for index, job in queued:
+                    pending[pool.submit(fetch, job)] = index
+                    return
+            
+            for _ in range(workers * 2):
+                submit_next()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    posts, fetch_time, error = future.result()
+                    fetch_times.append(fetch_time)
+                    submit_next()
+                    yield index, posts, fetch_time, error
+        wall_clock = time.perf_counter() - started
+        self.http_cache.evict()
+        if incremental and self.source_state is not None:
+            self.source_state.save()
+        
+        # Serialized = the old loop: every fetch back to back plus its time.sleep(1)
+        serialized = sum(fetch_times) + len(jobs) * 1.0
+        
+        report = {} if report is None else report
+        report.update({
+            'sources': len(jobs),
+            'workers': workers,
+            'wall_clock_seconds': round(wall_clock, 2),
+            'serialized_seconds': round(serialized, 2),
+            'speedup': round(serialized / wall_clock, 2) if wall_clock > 0 else 1.0,
+            'rate_limit': self.rate_limiter.stats(),
+            'http': self.http.stats(),
+            'http_cache': self.http_cache.stats(),
+            'hedging': self.hedger.stats() if self.hedger else None,
+            'listings': dict(self.listing_stats)
+        })
         
     def normalize_reddit_url(self, url):
         """Normalize Reddit URLs and ensure proper query params"""
@@ -73,9 +303,130 @@ class AccurateScraper:
         
         return urlunparse(parsed)
     
-    def scrape_reddit_web(self, url, brand, start_time, end_time):
-        """Scrape Reddit using web requests to old.reddit.com"""
+    def scrape_reddit_web(self, url, brand, start_time, end_time, since=None):
+        """Scrape Reddit without the API: public .json listings, old.reddit.com HTML as the fallback
+        
+        since: optional (created_utc, post_id) high-water mark; the new-sorted .json
+        listing stops there (the relevance-sorted HTML page ignores it)
+        """
+        if WEB_JSON_LISTINGS:
+            posts = self.scrape_reddit_json(url, brand, start_time, end_time, since=since)
+            if posts is not None:
+                return posts
+        return self.scrape_reddit_html(url, brand, start_time, end_time)
+    
+    def web_get_retrying(self, url, headers, accept=None, max_retries=3):
+        """web_get with exponential backoff; raises the last error
+        
+        Client errors other than 429 (blocked, not found) are raised without retrying.
+        """
+        import requests
+        
+        for attempt in range(max_retries):
+            try:
+                return self.web_get(url, headers, timeout=30, accept=accept)
+            except requests.exceptions.RequestException as e:
+                status = e.response.status_code if e.response is not None else None
+                if status is not None and 400 <= status < 500 and status != 429:
+                    raise
+                if attempt < max_retries - 1:
+                    wait_time = 2 ** attempt
+                    print(f"  Request failed (attempt {attempt + 1}), retrying in {wait_time}s: {e}")
+                    time.sleep(wait_time)
+                else:
+                    print(f"  Failed after {max_retries} attempts: {e}")
+                    raise
+    
+    def web_post(self, item, brand, source_url):
+        """Complete a parsed web listing post; None if another source already has it"""
+        post = dict(item, competitors_mentioned=[brand], source_brand=brand, source_url=source_url)
+        
+        # Same post already fetched by another source - don't analyze it twice
+        if not self.post_index.claim(canonical_post_id(post)):
+            return None
+        
+        # Cheap filters first; only posts that pass get the expensive analysis
+        # (batched across processes after fetch when BATCH_SCORING is on)
+        if self.passes_cheap_filters(post) and not BATCH_SCORING:
+            self.analyze_post(post)
+        return post
+    
+    def scrape_reddit_json(self, url, brand, start_time, end_time, since=None):
+        """Page through a source's public .json listing, newest first, like collect_listing
+        
+        Returns None when the first page cannot be fetched or is not a listing, so
+        the caller falls back to the HTML page; a later page failing keeps the posts so far.
+        """
+        import requests
+        
+        headers = {'User-Agent': REDDIT_USER_AGENT}
+        is_json = lambda response: response.content.lstrip()[:1] == b'{'
+        posts = []
+        skipped_known = 0
+        stats = {'pages': 0, 'items': 0, 'stopped': None}
+        after = None
+        
+        while stats['stopped'] is None:
+            if stats['pages'] >= LISTING_MAX_PAGES:
+                # Coverage may be incomplete - reported like the API listings
+                stats['stopped'] = 'max_pages'
+                break
+            try:
+                response = self.web_get_retrying(json_listing_url(url, after), headers, accept=is_json)
+                with self.stages.timed('parse'):
+                    items, after = parse_json_listing(response.content)
+            except (requests.exceptions.RequestException, ValueError) as e:
+                if not stats['pages']:
+                    print(f"  JSON listing unavailable for {url} ({e}), falling back to HTML")
+                    return None
+                print(f"  JSON listing page {stats['pages'] + 1} failed for {url}: {e}")
+                stats['stopped'] = 'error'
+                break
+            stats['pages'] += 1
+            
+            for item in items:
+                stats['items'] += 1
+                if item['created_utc'] < start_time.timestamp():
+                    stats['stopped'] = 'window'
+                    break
+                # Skip posts already held from a previous run
+                if self.is_at_or_below_high_water_mark(item['created_utc'], item['post_id'], since):
+                    skipped_known += 1
+                    stats['stopped'] = 'high_water_mark'
+                    break
+                if item['created_utc'] > end_time.timestamp():
+                    continue
+                
+                post = self.web_post(item, brand, url)
+                if post is None:
+                    skipped_known += 1
+                    continue
+                posts.append(post)
+            
+            if stats['stopped'] is None and (not after or not items):
+                stats['stopped'] = 'exhausted'
+        
+        self._local.listing_stats = stats
+        
+        # If no posts found, use sample data as fallback (nothing new since the high-water mark is not a failure)
+        if not posts and not skipped_known:
+            print(f"  No posts found, using sample data for {brand}")
+            posts = self.generate_sample_data(brand, start_time, end_time)
+        
+        return posts
+    
+    def scrape_reddit_html(self, url, brand, start_time, end_time):
+        """Scrape Reddit using web requests to old.reddit.com (one page, no self-text)
+        
+        Search pages are sorted by relevance, so there is no high-water mark to
+        stop at: every post on the page is returned, and the listing is recorded
+        as 'html' so scrape_source leaves the source's stored mark alone.
+        """
+        import requests
+        
         posts = []
+        skipped_known = 0
+        self._local.listing_stats = {'pages': 0, 'items': 0, 'stopped': 'html'}
         
         # Convert www.reddit.com to old.reddit.com for better web scraping
         if 'www.reddit.com' in url:
@@ -86,126 +437,39 @@ class AccurateScraper:
                 'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
             }
             
-            # Retry logic with backoff
-            max_retries = 3
-            response = None
-            for attempt in range(max_retries):
-                try:
-                    response = requests.get(url, headers=headers, timeout=30)
-                    response.raise_for_status()
-                    break
-                except (requests.exceptions.RequestException, requests.exceptions.HTTPError) as e:
-                    if attempt < max_retries - 1:
-                        wait_time = 2 ** attempt
-                        print(f"  Request failed (attempt {attempt + 1}), retrying in {wait_time}s: {e}")
-                        time.sleep(wait_time)
-                    else:
-                        print(f"  Failed after {max_retries} attempts: {e}")
-                        return self.generate_sample_data(brand, start_time, end_time)
+            try:
+                response = self.web_get_retrying(url, headers, accept=lambda response: b'class="thing' in response.content)
+            except requests.exceptions.RequestException:
+                return self.generate_sample_data(brand, start_time, end_time)
             
-            # Parse HTML with BeautifulSoup
-            if response:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Find all post links on old.reddit.com
-                for thing in soup.find_all('div', class_='thing'):
-                    try:
-                        # Extract post data
-                        title_elem = thing.find('a', class_='title')
-                        if not title_elem:
-                            continue
-                        
-                        title = title_elem.get_text().strip()
-                        post_url = title_elem.get('href', '')
-                        if post_url.startswith('/'):
-                            post_url = f"https://old.reddit.com{post_url}"
-                        
-                        # Get score
-                        score_elem = thing.find('div', class_='score')
-                        score = 0
-                        if score_elem:
-                            score_text = score_elem.get_text().strip()
-                            if score_text and score_text != '•':
-                                try:
-                                    score = int(score_text)
-                                except ValueError:
-                                    pass
-                        
-                        # Get comments count
-                        comments_elem = thing.find('a', class_='comments')
-                        num_comments = 0
-                        if comments_elem:
-                            comments_text = comments_elem.get_text().strip()
-                            num_comments = int(re.sub(r'\D', '', comments_text) or '0')
-                        
-                        # Get subreddit
-                        subreddit = 'Unknown'
-                        subreddit_elem = thing.find('a', class_='subreddit')
-                        if subreddit_elem:
-                            subreddit = subreddit_elem.get_text().strip()
-                        
-                        # Get author
-                        author = 'Unknown'
-                        author_elem = thing.find('a', class_='author')
-                        if author_elem:
-                            author = author_elem.get_text().strip()
-                        
-                        # Check if post is within date range
-                        post_time_elem = thing.find('time')
-                        created_utc = start_time.timestamp()
-                        if post_time_elem and 'datetime' in post_time_elem.attrs:
-                            try:
-                                created_utc = datetime.fromisoformat(post_time_elem['datetime'].replace('Z', '+00:00')).timestamp()
-                            except:
-                                created_utc = start_time.timestamp()
-                        
-                        # Create post dict
-                        post = {
-                            'title': title,
-                            'selftext': '',  # Old reddit search doesn't show full text
-                            'score': score,
-                            'num_comments': num_comments,
-                            'subreddit': subreddit,
-                            'url': post_url,
-                            'created_utc': created_utc,
-                            'competitors_mentioned': [brand],
-                            'author': author,
-                            'upvote_ratio': 0.8,  # Default
-                            'is_self': True,
-                            'source_brand': brand,
-                            'source_url': url
-                        }
-                        
-                        # Determine primary brand
-                        primary_brand = self.get_primary_brand(post)
-                        post['primary_brand'] = primary_brand
-                        
-                        # Analyze sentiment with primary brand context
-                        sentiment_result = self.analyze_sentiment(title, title_only=title, primary_brand=primary_brand)
-                        post['sentiment'] = sentiment_result['sentiment']
-                        post['confidence'] = sentiment_result['confidence']
-                        post['reasoning'] = sentiment_result['reasoning']
-                        
-                        posts.append(post)
-                        
-                    except Exception as e:
-                        print(f"  Error parsing post: {e}")
-                        continue
+            with self.stages.timed('parse'):
+                items = parse_html_listing(response.content, start_time.timestamp())
+            self._local.listing_stats = {'pages': 1, 'items': len(items), 'stopped': 'html'}
+            
+            for item in items:
+                post = self.web_post(item, brand, url)
+                if post is None:
+                    skipped_known += 1
+                    continue
+                posts.append(post)
             
         except Exception as e:
             print(f"  Web scraping error for {url}: {e}")
             posts = self.generate_sample_data(brand, start_time, end_time)
         
-        # If no posts found, use sample data as fallback
-        if not posts:
+        # If no posts found, use sample data as fallback (posts another source already has are not a failure)
+        if not posts and not skipped_known:
             print(f"  No posts found, using sample data for {brand}")
             posts = self.generate_sample_data(brand, start_time, end_time)
         
         return posts
         
-    def scrape_weekly_data(self, days_back=7):
-        """Scrape data using ROLLING 7-DAY WINDOW from current time or PREVIOUS COMPLETE WEEK"""
-        now = datetime.now(timezone.utc)
+    def scrape_weekly_data(self, days_back=7, now=None):
+        """Scrape data using ROLLING 7-DAY WINDOW from current time or PREVIOUS COMPLETE WEEK
+        
+        now: optional reference time (replaying recorded fixtures as of their recording)
+        """
+        now = now or datetime.now(timezone.utc)
         
         # Check if WEEK_MODE environment variable is set
         week_mode = os.getenv('WEEK_MODE', 'FULL_7')
@@ -243,8 +507,9 @@ class AccurateScraper:
             print(f"Date window: {start_time.strftime('%Y-%m-%d %H:%M')} to {end_time.strftime('%Y-%m-%d %H:%M')} UTC")
             print(f"(Past {days_back} days from current time)")
         
-        all_posts = []
-        saturday_posts = []
+        saturday_posts = []  # Fetched past end_time; only used if the week is too quiet
+        self.post_index = PostIndex()
+        self.stages = StageStats()
         
         print("Starting weekly Reddit scrape using your exact data sources...")
         
@@ -255,82 +520,146 @@ class AccurateScraper:
         # Track normalized URLs for metadata
         normalized_sources = {}
         
+        # Build the full list of normalized sources, then fetch them concurrently
+        jobs = []
         for brand, links in WEEKLY_LINKS.items():
-            print(f"\nScraping {brand}...")
-            
             # Handle single link or multiple links (Marley Spoon has both search + subreddit)
             if isinstance(links, str):
                 links = [links]
             
-            normalized_links = []
-            for link in links:
-                # Normalize URL to old.reddit.com
-                normalized_url = self.normalize_reddit_url(link)
-                normalized_links.append(normalized_url)
-                
-                try:
-                    posts = self.scrape_reddit_link(normalized_url, brand, start_time, end_time)
-                    all_posts.extend(posts)
-                    print(f"  Found {len(posts)} posts from {normalized_url}")
-                    time.sleep(1)  # Rate limiting
-                    
-                except Exception as e:
-                    print(f"  Error scraping {normalized_url}: {e}")
+            normalized_links = [self.normalize_reddit_url(link) for link in links]
+            jobs.extend((brand, normalized_url) for normalized_url in normalized_links)
             
             # Store normalized URLs for metadata
             normalized_sources[brand] = normalized_links if len(normalized_links) > 1 else normalized_links[0]
         
-        # Remove duplicates based on URL and count pre-filter
-        unique_posts = {}
-        for post in all_posts:
-            if post['url'] not in unique_posts:
-                unique_posts[post['url']] = post
+        # Merge overlapping sources into the fewest fetches
+        if QUERY_PLANNER_ENABLED:
+            plan = plan_sources(jobs)
+        else:
+            plan = [planned_fetch(url, [(brand, url)]) for brand, url in jobs]
+        planned_fetches = len(plan)
+        print(f"QUERY PLAN: {len(jobs)} sources -> {len(plan)} fetches")
+        
+        # Fetch once over the window plus the possible Saturday extension, so a quiet
+        # week never needs a second crawl; posts past end_time are buffered
+        saturday_end = end_time + timedelta(days=1, hours=23, minutes=59, seconds=59)
+        plan_jobs = [(planned['brands'][0], planned['url']) for planned in plan]
+        fetch_report = {}
+        split_report = {}
+        failed = set()  # plan indexes whose fetch raised
+        unattributed = [0]  # merged-fetch posts naming none of the fetch's brands
+        
+        # Posts stream fetch -> dedupe -> filter -> analysis as sources complete
+        # (bounded queues between stages; analysis overlaps with the network).
+        # Every analyzed post is still collected for final_data below.
+        unique_ids = set()
+        order = {}  # canonical post ID -> (plan index, position) for a stable output order
+        
+        def fetched_from(jobs, base, report):
+            split = []
+            for index, posts, _, error in self.iter_sources(jobs, start_time, saturday_end, report=report):
+                index += base
+                planned = plan[index]
+                print(f"\nScraped {', '.join(planned['brands'])}:")
+                if error:
+                    print(f"  Error scraping {planned['url']}: {error}")
+                    failed.add(index)
+                    continue
+                if len(planned['brands']) > 1:
+                    posts, dropped = self.attribute_brands(posts, planned['brands'])
+                    unattributed[0] += dropped
+                print(f"  Found {len(posts)} posts from {planned['url']}")
+                stopped = self.listing_stats.get(planned['url'], {}).get('stopped')
+                if len(planned['brands']) > 1 and stopped in SPLIT_MERGED_STOPS:
+                    # One page of a shared result set (or a capped listing) under-covers
+                    # each brand; fetch the original per-brand sources as well
+                    print(f"  Merged fetch stopped on '{stopped}' - splitting into {len(planned['jobs'])} source fetches")
+                    split.extend(dict(planned_fetch(url, [(brand, url)]), split_from=planned['url'])
+                                 for brand, url in planned['jobs'])
+                for position, post in enumerate(posts):
+                    yield (index, position), post
+            if split:
+                plan.extend(split)
+                yield from fetched_from([(planned['brands'][0], planned['url']) for planned in split],
+                                        len(plan) - len(split), split_report)
+        
+        def fetched():
+            return fetched_from(plan_jobs, 0, fetch_report)
+        
+        def dedupe(items, buffer_saturday=True):
+            # Remove duplicates by canonical post ID and count pre-filter
+            # (most were already skipped at ingest; this catches posts from stored windows)
+            for position, post in items:
+                if buffer_saturday and end_time.timestamp() < post['created_utc'] <= saturday_end.timestamp():
+                    saturday_posts.append(post)
+                    continue
+                post_id = canonical_post_id(post)
+                if post_id in unique_ids:
+                    continue
+                unique_ids.add(post_id)
+                order[post_id] = position
                 # Count pre-filter by brand
                 for brand in post.get('competitors_mentioned', []):
                     brand_pre_filter[brand] += 1
-        
-        # Check if we should include Saturday posts (>5 total posts threshold)
-        if len(unique_posts) <= INCLUDE_SATURDAY_THRESHOLD:
-            # Extend to include Saturday
-            saturday_end = end_time + timedelta(days=1, hours=23, minutes=59, seconds=59)
-            print(f"Only {len(unique_posts)} posts Mon-Fri, extending to include Saturday...")
+                yield post
+        
+        def keep_filtered(posts):
+            # Filter out excluded content and count post-filter
+            # (posts were already screened at ingest; this catches posts from stored windows)
+            for post in posts:
+                if not self.should_exclude_post(post):
+                    # Count post-filter by brand
+                    for brand in post.get('competitors_mentioned', []):
+                        brand_post_filter[brand] += 1
+                    yield post
+        
+        # Analyzed posts are appended to the NDJSON working file as they arrive
+        # (main() adds the final header and moves it into place; a failed run deletes it)
+        post_writer = None
+        if WORKING_NDJSON:
+            post_writer = PostWriter(partial_path(WORKING_POSTS_FILE), truncate=True, discard_on_error=True, header={
+                'date_range': {'start': start_time.isoformat(), 'end': end_time.isoformat()},
+                'order': 'arrival'
+            })
+        
+        def record(posts):
+            for batch in batched(posts, STREAM_ANALYSIS_BATCH):
+                if post_writer:
+                    post_writer.extend(batch)
+                yield from batch
+        
+        with post_writer or nullcontext():
+            analyze = self.analyze_stream
+            filtered_posts = list(stream(fetched(), [dedupe, keep_filtered, analyze, record]))
             
-            for brand, links in WEEKLY_LINKS.items():
-                if isinstance(links, str):
-                    links = [links]
-                
-                for link in links:
-                    try:
-                        saturday_posts_brand = self.scrape_reddit_link(link, brand, end_time + timedelta(seconds=1), saturday_end)
-                        for post in saturday_posts_brand:
-                            if post['url'] not in unique_posts:
-                                unique_posts[post['url']] = post
-                        time.sleep(1)
-                    except Exception as e:
-                        print(f"  Error scraping Saturday for {brand}: {e}")
+            fetch_report['query_plan'] = {'sources': len(jobs), 'fetches': planned_fetches,
+                                          'split_fetches': len(plan) - planned_fetches}
+            if split_report:
+                fetch_report['split'] = split_report
+            fetch_report['dedupe'] = self.post_index.stats()
+            self.print_fetch_report(fetch_report)
             
-            # Update end_time to include Saturday
-            end_time = saturday_end
-        
-        # Filter out excluded content and count post-filter
-        filtered_posts = []
-        for post in unique_posts.values():
-            if not self.should_exclude_post(post):
-                filtered_posts.append(post)
-                # Count post-filter by brand
-                for brand in post.get('competitors_mentioned', []):
-                    brand_post_filter[brand] += 1
+            # Check if we should include Saturday posts (>5 total posts threshold)
+            if len(unique_ids) <= INCLUDE_SATURDAY_THRESHOLD:
+                filtered_posts.extend(self.extend_to_saturday(
+                    plan, failed, fetch_report, saturday_posts, unique_ids, end_time, saturday_end,
+                    stages=[lambda items: dedupe(items, buffer_saturday=False), keep_filtered, analyze, record]))
+                end_time = saturday_end
         
-        # Print filter impact table
-        print(f"\nFILTER IMPACT TABLE")
-        print(f"{'Brand':<12} | {'Pre-Filter':<10} | {'Post-Filter':<11} | {'Removed':<7}")
-        print("-" * 50)
-        for brand in ALL_COMPETITORS:
-            pre = brand_pre_filter[brand]
-            post = brand_post_filter[brand]
-            removed = pre - post
-            print(f"{brand:<12} | {pre:<10} | {post:<11} | {removed:<7}")
-        print("-" * 50)
+        filtered_posts.sort(key=lambda post: order[canonical_post_id(post)])
+        
+        stage_report = self.stages.report()
+        print_stage_report(stage_report)
+        
+        self.sentiment_cache.evict()
+        sentiment_cache_stats = self.sentiment_cache.stats()
+        print(f"Sentiment cache: {sentiment_cache_stats['hits']} hits, {sentiment_cache_stats['misses']} misses "
+              f"(hit rate {sentiment_cache_stats['hit_rate']:.0%}, ruleset {sentiment_cache_stats['ruleset']})")
+        # The cache file is copied between CI runs without its -wal file
+        self.sentiment_cache.close()
+        
+        self.print_filter_impact(brand_pre_filter, brand_post_filter, unattributed[0])
         
         # Calculate filter stats
         filter_stats = {}
@@ -343,6 +672,7 @@ class AccurateScraper:
                 "post": post,
                 "removed": removed
             }
+        filter_stats['unattributed'] = unattributed[0]
         
         final_data = {
             'scrape_timestamp': datetime.now(timezone.utc).isoformat(),
@@ -354,28 +684,203 @@ class AccurateScraper:
             'total_posts': len(filtered_posts),
             'data_sources': normalized_sources,
             'filter_stats': filter_stats,
+            'fetch_stats': fetch_report,
+            'stage_stats': stage_report,
+            'sentiment_cache': sentiment_cache_stats,
             'posts': filtered_posts
         }
         
         return final_data
     
-    def scrape_reddit_link(self, url, brand, start_time, end_time):
-        """Scrape a specific Reddit URL"""
+    def extend_to_saturday(self, plan, failed, fetch_report, saturday_posts, unique_ids, end_time, saturday_end, stages):
+        """Widen a quiet week over the buffered Saturday posts; returns the filtered, analyzed additions
+        
+        Only listings that were cut short (page cap) or failed can be missing
+        Saturday posts, so only those are re-requested.
+        """
+        # Extend to include Saturday: widen the window over the posts already buffered
+        print(f"Only {len(unique_ids)} posts Mon-Fri, extending to include Saturday...")
+        truncated = [
+            planned for index, planned in enumerate(plan)
+            if index in failed or fetch_report['listings'].get(planned['url'], {}).get('stopped') == 'max_pages'
+        ]
+        buffered = len(saturday_posts)
+        saturday_report = None
+        if truncated:
+            saturday_jobs = [(planned['brands'][0], planned['url']) for planned in truncated]
+            saturday_results, saturday_report = self.fetch_sources(
+                saturday_jobs, end_time + timedelta(seconds=1), saturday_end, incremental=False)
+            for planned, (saturday_posts_brand, _, error) in zip(truncated, saturday_results):
+                if error:
+                    print(f"  Error scraping Saturday for {planned['url']}: {error}")
+                    continue
+                if len(planned['brands']) > 1:
+                    saturday_posts_brand, _ = self.attribute_brands(saturday_posts_brand, planned['brands'])
+                saturday_posts.extend(saturday_posts_brand)
+        
+        # Saturday posts sort after the week's, in the order they were fetched
+        before = len(unique_ids)
+        items = (((len(plan), position), post) for position, post in enumerate(saturday_posts))
+        added_posts = list(stream(items, stages))
+        added = len(unique_ids) - before
+        print(f"  Saturday: {added} posts added ({buffered} already buffered, "
+              f"{len(truncated)} of {len(plan)} sources re-requested)")
+        
+        fetch_report['saturday_pass'] = {
+            'buffered_posts': buffered,
+            'added_posts': added,
+            'refetched_sources': len(truncated),
+            'refetch': saturday_report
+        }
+        return added_posts
+    
+    def analyze_stream(self, posts):
+        """Streaming analysis stage: score posts in batches as they arrive
+        
+        Posts already scored at ingest (BATCH_SCORING off) pass straight through.
+        """
+        for batch in batched(posts, STREAM_ANALYSIS_BATCH):
+            self.analyze_posts([post for post in batch if 'sentiment' not in post])
+            yield from batch
+    
+    def print_filter_impact(self, brand_pre_filter, brand_post_filter, unattributed=0):
+        """Print filter impact table"""
+        print(f"\nFILTER IMPACT TABLE")
+        print(f"{'Brand':<12} | {'Pre-Filter':<10} | {'Post-Filter':<11} | {'Removed':<7}")
+        print("-" * 50)
+        for brand in ALL_COMPETITORS:
+            pre = brand_pre_filter[brand]
+            post = brand_post_filter[brand]
+            removed = pre - post
+            print(f"{brand:<12} | {pre:<10} | {post:<11} | {removed:<7}")
+        print("-" * 50)
+        if unattributed:
+            print(f"Dropped from merged fetches (no brand named): {unattributed}")
+    
+    def attribute_brands(self, posts, brands):
+        """Attribute posts from a merged (multi-brand) fetch using detect_brands
+        
+        A post naming one of the fetch's brands is that brand's. A post naming
+        several keeps the brand it was requested for if that is one of them,
+        else takes the first in the fetch's brand order (never the order the
+        names appear in the text). Posts naming none are dropped and released
+        so another source can still take them; returns (posts, dropped).
+        """
+        attributed = []
+        dropped = 0
+        for post in posts:
+            detected = self.detect_brands(post['title'] + ' ' + post.get('selftext', ''))
+            candidates = [b for b in brands if b in detected]
+            if not candidates:
+                self.post_index.release(canonical_post_id(post))
+                dropped += 1
+                continue
+            post['competitors_mentioned'] = candidates
+            if post.get('source_brand') not in candidates:
+                post['source_brand'] = candidates[0]
+            attributed.append(post)
+        return attributed, dropped
+    
+    def print_fetch_report(self, report):
+        """Print wall-clock vs serialized fetch time"""
+        print(f"\nFETCH TIMING")
+        print(f"  Sources fetched: {report['sources']} ({report['workers']} workers)")
+        print(f"  Wall-clock:      {report['wall_clock_seconds']:.1f}s")
+        print(f"  Serialized:      {report['serialized_seconds']:.1f}s (sequential fetches + 1s sleep each)")
+        print(f"  Speedup:         {report['speedup']:.1f}x")
+        for host, host_stats in report['rate_limit'].items():
+            print(f"  {host}: {host_stats['requests']} requests, {host_stats['wait_seconds']:.1f}s rate-limit wait")
+            if host_stats.get('remaining') is not None:
+                print(f"    adaptive: {host_stats['rate']:.2f} req/s now (min {host_stats['min_rate']}, base {host_stats['base_rate']}), "
+                      f"{host_stats['remaining']:.0f} left, reset in {host_stats['reset_in']:.0f}s")
+            if host_stats.get('pauses'):
+                print(f"    paused {host_stats['pauses']}x, {host_stats['rate_limited']} x 429")
+        
+        if report.get('http'):
+            print(f"\nHTTP TIMING (avg ms: dns / connect / tls / first byte / body)")
+            for host, host_stats in report['http'].items():
+                avg = host_stats['avg_ms']
+                print(f"  {host}: {host_stats['requests']} requests, {host_stats['reused_connections']} on kept-alive connections")
+                print(f"    {avg['dns']} / {avg['connect']} / {avg['tls']} / {avg['first_byte']} / {avg['body']}"
+                      f"  (handshakes = {host_stats['handshake_share']:.0%} of request time)")
+                print(f"    p50 {host_stats['p50_ms']} ms / p95 {host_stats['p95_ms']} ms")
+        
+        hedging = report.get('hedging')
+        if hedging and hedging['requests']:
+            print(f"\nHEDGED REQUESTS: {hedging['hedged']} of {hedging['requests']} hedged, "
+                  f"{hedging['alternate_wins']} won by the alternate host, {hedging['failed']} failed on both")
+            for host, delay_ms in hedging['delay_ms'].items():
+                print(f"  {host}: hedge after {delay_ms} ms")
+        
+        if report.get('listings'):
+            pages = sum(stats['pages'] for stats in report['listings'].values())
+            items = sum(stats['items'] for stats in report['listings'].values())
+            print(f"\nLISTINGS: {pages} pages / {items} items across {len(report['listings'])} paged sources")
+            for source_url, stats in report['listings'].items():
+                if stats['stopped'] == 'max_pages':
+                    print(f"  [WARNING] {source_url} hit LISTING_MAX_PAGES - coverage may be incomplete")
+            html = sum(1 for stats in report['listings'].values() if stats['stopped'] == 'html')
+            if html:
+                print(f"  [WARNING] {html} sources fell back to one relevance-sorted HTML page (no self-text) - coverage may be incomplete")
+        
+        plan_stats = report.get('query_plan')
+        if plan_stats and plan_stats.get('split_fetches'):
+            print(f"\nQUERY PLAN: {plan_stats['split_fetches']} source fetches added for merged fetches that stopped early")
+        
+        if report.get('dedupe'):
+            print(f"\nDEDUPE: {report['dedupe']['unique']} unique posts analyzed, "
+                  f"{report['dedupe']['duplicates_skipped']} cross-source duplicates skipped before analysis")
+        
+        cache_stats = report.get('http_cache')
+        if cache_stats:
+            print(f"\nHTTP CACHE: {cache_stats['fresh_hits']} fresh hits, {cache_stats['revalidated']} revalidated (304), "
+                  f"{cache_stats['misses']} misses, {cache_stats['bytes_saved'] / 1024:.0f} KB not re-downloaded")
+    
+    def is_at_or_below_high_water_mark(self, created_utc, post_id, since):
+        """True if a post is not newer than the (created_utc, post_id) high-water mark"""
+        if since is None:
+            return False
+        newest_created_utc, newest_id = since
+        return created_utc < newest_created_utc or (newest_id is not None and post_id == newest_id)
+    
+    def collect_listing(self, listing, brand, url, start_time, end_time, since=None):
+        """Extract in-window posts from a paged new-sorted listing
+        
+        Paging stops at the window start or the high-water mark; the pages and
+        items used are recorded for this source's fetch stats.
+        """
+        posts = []
+        is_known = lambda post: self.is_at_or_below_high_water_mark(post.created_utc, post.name, since)
+        try:
+            for post in listing.walk(start_time, is_known=is_known):
+                post_time = datetime.fromtimestamp(post.created_utc, tz=timezone.utc)
+                
+                if start_time <= post_time <= end_time:
+                    post_data = self.extract_post_data(post, brand, url)
+                    if post_data:
+                        posts.append(post_data)
+        finally:
+            self._local.listing_stats = listing.stats()
+        
+        return posts
+    
+    def scrape_reddit_link(self, url, brand, start_time, end_time, since=None):
+        """Scrape a specific Reddit URL
+        
+        since: optional (created_utc, post_id) high-water mark. Listings are sorted
+        by new, so iteration stops at the first post that is not newer.
+        """
+        from reddit_listings import subreddit_new, search_new  # imports praw
+        
         posts = []
         
         if self.reddit and 'reddit.com/r/' in url:
             # Use PRAW for subreddit scraping
             try:
                 subreddit_name = url.split('/r/')[1].split('/')[0]
-                subreddit = self.reddit.subreddit(subreddit_name)
-                
-                for post in subreddit.new(limit=50):
-                    post_time = datetime.fromtimestamp(post.created_utc, tz=timezone.utc)
-                    
-                    if start_time <= post_time <= end_time:
-                        post_data = self.extract_post_data(post, brand, url)
-                        if post_data:
-                            posts.append(post_data)
+                listing = subreddit_new(self.get_reddit_client(), subreddit_name,
+                                        before_page=self.throttle_api)
+                posts = self.collect_listing(listing, brand, url, start_time, end_time, since)
                             
             except Exception as e:
                 print(f"PRAW error for {url}: {e}")
@@ -384,22 +889,14 @@ class AccurateScraper:
             # Use PRAW for search results (limited but authenticated)
             try:
                 # Extract search query from URL
-                if 'q=' in url:
-                    query = url.split('q=')[1].split('&')[0]
-                    query = query.replace('%20', ' ').replace('+', ' ')
+                _, query = parse_source(url)
+                if query:
                     print(f"  Using PRAW API search for query: {query}")
                     
-                    search_results = self.reddit.subreddit('all').search(query, sort='new', time_filter='week', limit=100)
-                    
-                    found_count = 0
-                    for post in search_results:
-                        post_time = datetime.fromtimestamp(post.created_utc, tz=timezone.utc)
-                        
-                        if start_time <= post_time <= end_time:
-                            post_data = self.extract_post_data(post, brand, url)
-                            if post_data:
-                                posts.append(post_data)
-                                found_count += 1
+                    listing = search_new(self.get_reddit_client(), query, start_time,
+                                         before_page=self.throttle_api)
+                    posts = self.collect_listing(listing, brand, url, start_time, end_time, since)
+                    found_count = len(posts)
                     
                     print(f"  Found {found_count} posts via PRAW API")
                                 
@@ -411,22 +908,14 @@ class AccurateScraper:
             if self.reddit and 'reddit.com/search' in url:
                 try:
                     # Extract search query from URL
-                    if 'q=' in url:
-                        query = url.split('q=')[1].split('&')[0]
-                        query = query.replace('%20', ' ').replace('+', ' ')
+                    _, query = parse_source(url)
+                    if query:
                         print(f"  Using PRAW API search for query: {query}")
                         
-                        search_results = self.reddit.subreddit('all').search(query, sort='new', time_filter='week', limit=100)
-                        
-                        found_count = 0
-                        for post in search_results:
-                            post_time = datetime.fromtimestamp(post.created_utc, tz=timezone.utc)
-                            
-                            if start_time <= post_time <= end_time:
-                                post_data = self.extract_post_data(post, brand, url)
-                                if post_data:
-                                    posts.append(post_data)
-                                    found_count += 1
+                        listing = search_new(self.get_reddit_client(), query, start_time,
+                                             before_page=self.throttle_api)
+                        posts = self.collect_listing(listing, brand, url, start_time, end_time, since)
+                        found_count = len(posts)
                         
                         print(f"  Found {found_count} posts via PRAW API")
                         if found_count > 0:
@@ -437,27 +926,35 @@ class AccurateScraper:
             
             # Fallback to web scraping with new.reddit.com if old.reddit.com fails
             print(f"Using web scraping for {url}")
-            posts = self.scrape_reddit_web(url, brand, start_time, end_time)
+            posts = self.scrape_reddit_web(url, brand, start_time, end_time, since=since)
             
-            # If no posts found, try new.reddit.com as fallback
-            if not posts and 'old.reddit.com' in url:
+            # If no posts found, try new.reddit.com as fallback (hedged requests already race both hosts)
+            if not posts and 'old.reddit.com' in url and self.hedger is None:
                 new_url = url.replace('old.reddit.com', 'www.reddit.com')
                 print(f"  Trying fallback URL: {new_url}")
-                posts = self.scrape_reddit_web(new_url, brand, start_time, end_time)
+                posts = self.scrape_reddit_web(new_url, brand, start_time, end_time, since=since)
         
         return posts
     
     def extract_post_data(self, post, brand, source_url):
         """Extract data from a Reddit post object"""
+        # Same post already fetched by another source - don't analyze it twice
+        if not self.post_index.claim(post.name):
+            return None
+        
         try:
             # Detect which competitors are mentioned
-            text = post.title + " " + (post.selftext if hasattr(post, 'selftext') else "")
-            mentioned_brands = self.detect_brands(text)
+            with self.stages.timed('brand_detect') as stage:
+                text = post.title + " " + (post.selftext if hasattr(post, 'selftext') else "")
+                mentioned_brands = self.detect_brands(text)
+                if not mentioned_brands:
+                    stage['kept'] = 0
             
             if not mentioned_brands:
                 return None
             
             post_data = {
+                'post_id': post.name,
                 'title': post.title,
                 'selftext': getattr(post, 'selftext', ''),
                 'score': post.score,
@@ -473,13 +970,10 @@ class AccurateScraper:
                 'source_url': source_url
             }
             
-            # Determine PRIMARY brand (what the post is actually about)
-            primary_brand = self.get_primary_brand(post_data)
-            post_data['primary_brand'] = primary_brand
-            
-            # Add sentiment analysis (pass primary_brand for context-aware sentiment)
-            sentiment_data = self.analyze_sentiment(text, title_only=post.title, primary_brand=primary_brand)
-            post_data.update(sentiment_data)
+            # Cheap filters first; excluded posts are returned unanalyzed
+            # (they still count towards the pre-filter totals)
+            if self.passes_cheap_filters(post_data) and not BATCH_SCORING:
+                self.analyze_post(post_data)
             
             return post_data
             
@@ -487,29 +981,72 @@ class AccurateScraper:
             print(f"Error extracting post data: {e}")
             return None
     
-    def detect_brands(self, text):
-        """Detect which brands are mentioned in the text"""
-        text_lower = text.lower()
-        mentioned = []
-        
-        brand_patterns = {
-            'HelloFresh': ['hellofresh', 'hello fresh', 'hf '],
-            'Factor75': ['factor75', 'factor 75', 'factor', 'factor meal'],
-            'Blue Apron': ['blue apron', 'blueapron'],
-            'Home Chef': ['home chef', 'homechef'],
-            'Marley Spoon': ['marley spoon', 'marleyspoon', 'martha stewart'],
-            'Hungryroot': ['hungryroot', 'hungry root'],
-            'EveryPlate': ['everyplate', 'every plate'],
-            'Green Chef': ['green chef', 'greenchef']
-        }
+    def passes_cheap_filters(self, post):
+        """Cheap stage: subreddit whitelist, EXCLUDE_KEYWORDS and promo filters"""
+        with self.stages.timed('cheap_filter') as stage:
+            if self.should_exclude_post(post):
+                stage['kept'] = 0
+                return False
+        return True
+    
+    def analyze_post(self, post):
+        """Expensive stage: primary brand scoring + dual-model sentiment"""
+        with self.stages.timed('analysis'):
+            # Determine PRIMARY brand (what the post is actually about)
+            post['primary_brand'] = self.get_primary_brand(post)
+            
+            # Add sentiment analysis (pass primary_brand for context-aware sentiment)
+            text = post['title'] + " " + post.get('selftext', '')
+            key = content_key(text, post['title'], post['primary_brand'], self.sentiment_engine.name)
+            sentiment_data = self.sentiment_cache.get(key)
+            if sentiment_data is None:
+                sentiment_data = self.analyze_sentiment(text, title_only=post['title'], primary_brand=post['primary_brand'])
+                self.sentiment_cache.put(key, sentiment_data)
+            post.update(sentiment_data)
+        return post
+    
+    def analyze_posts(self, posts):
+        """Batch version of analyze_post: cached results inline, the rest through score_posts
         
-        for brand, patterns in brand_patterns.items():
-            for pattern in patterns:
-                if pattern in text_lower:
-                    mentioned.append(brand)
-                    break
+        Lists of BATCH_SCORING_MIN_POSTS+ uncached posts go to a process pool; the
+        scraper's stream batches are smaller and are scored inline.
+        """
+        if not posts:
+            return posts
+        started = time.perf_counter()
+        pending = {}  # cache key -> posts sharing it (identical text is scored once)
+        for post in posts:
+            post['primary_brand'] = self.get_primary_brand(post)
+            text = post['title'] + " " + post.get('selftext', '')
+            key = content_key(text, post['title'], post['primary_brand'], self.sentiment_engine.name)
+            sentiment_data = None if key in pending else self.sentiment_cache.get(key)
+            if sentiment_data is None:
+                pending.setdefault(key, []).append(post)
+            else:
+                post.update(sentiment_data)
+        
+        scored = score_posts([same[0] for same in pending.values()], scorer=self, engine=self.sentiment_engine.name)
+        for (key, same), result in zip(pending.items(), scored):
+            sentiment_data = {field: result[field] for field in SENTIMENT_FIELDS}
+            self.sentiment_cache.put(key, sentiment_data)
+            for post in same:
+                post.update(sentiment_data)
         
-        return mentioned
+        self.stages.record('analysis', len(posts), len(posts), time.perf_counter() - started)
+        return posts
+    
+    def score_post(self, post):
+        """Primary brand + sentiment for one post, uncached (posts carrying primary_brand keep it)"""
+        primary_brand = post['primary_brand'] if 'primary_brand' in post else self.get_primary_brand(post)
+        text = post['title'] + " " + post.get('selftext', '')
+        result = self.analyze_sentiment(text, title_only=post['title'], primary_brand=primary_brand)
+        result['primary_brand'] = primary_brand
+        return result
+    
+    def detect_brands(self, text):
+        """Detect which brands are mentioned in the text"""
+        matches = shared_matcher().scan(text.lower())
+        return [brand for brand in DETECT_BRAND_PATTERNS if matches.has(f'detect:{brand}')]
     
     def get_primary_brand(self, post):
         """Determine if post is CUSTOMER DISCUSSION about a brand's meal service"""
@@ -518,57 +1055,12 @@ class AccurateScraper:
         subreddit = post.get('subreddit', '').lower()
         full_text = title + ' ' + text
         
-        brand_patterns = {
-            'HelloFresh': ['hellofresh', 'hello fresh', 'hf'],
-            'Factor75': ['factor75', 'factor 75', 'factor meal', 'factor'],
-            'Blue Apron': ['blue apron', 'blueapron'],
-            'Home Chef': ['home chef', 'homechef'],
-            'Marley Spoon': ['marley spoon', 'marleyspoon'],
-            'Hungryroot': ['hungryroot', 'hungry root'],
-            'EveryPlate': ['everyplate', 'every plate'],
-            'Green Chef': ['green chef', 'greenchef'],
-            'Purple Carrot': ['purple carrot', 'purplecarrot']
-        }
-        
-        # CUSTOMER DISCUSSION INDICATORS - these show people are talking about using the service
-        customer_discussion_phrases = [
-            # Questions/Recommendations
-            'has anyone', 'anyone tried', 'anyone use', 'anyone done', 'recommendations',
-            'recommend', 'which is better', 'best meal', 'good meal service',
-            'meal service', 'meal kit', 'meal delivery', 'food delivery',
-            
-            # Personal Experience (first person)
-            'i did', 'i tried', 'i use', 'i used', 'i\'m using', 'i have', 'i had',
-            'i was', 'i am', 'i\'ve', 'i got', 'i received', 'i ordered',
-            'my box', 'my order', 'my meal', 'my experience', 'my subscription',
-            
-            # Personal Experience (plural/possessive)
-            'we did', 'we tried', 'we use', 'we used', 'we have', 'we had',
-            'our box', 'our order', 'our meal', 'our subscription', 'ours',
-            'been using', 'been with', 'subscriber', 'subscription',
-            
-            # Opinions/Reviews
-            'love', 'hate', 'like', 'dislike', 'disappointed', 'happy with',
-            'quality', 'fresh', 'taste', 'flavor', 'portion', 'recipe',
-            'delivery', 'arrived', 'shipping', 'packaging', 'box',
-            
-            # Service Issues/Feedback
-            'customer service', 'cancel', 'cancelled', 'refund', 'complaint',
-            'issue', 'problem', 'missing', 'wrong', 'damaged', 'spoiled',
-            'upcharge', 'price', 'cost', 'expensive', 'cheap',
-            
-            # Comparisons
-            'better than', 'worse than', 'compared to', 'vs', 'versus',
-            'switch', 'switched', 'alternative',
-            
-            # Meal/Recipe specific
-            'recipe', 'meal', 'dish', 'cooked', 'cooking', 'made this'
-        ]
+        # Brand patterns and customer discussion phrases live in keyword_rules;
+        # one scan finds every mention and phrase with its position
+        matches = shared_matcher().scan(full_text)
         
         # Check if this is a customer discussion post
-        has_customer_discussion = any(phrase in full_text for phrase in customer_discussion_phrases)
-        
-        if not has_customer_discussion:
+        if not matches.has('customer_discussion'):
             # Not a customer discussion - skip this post
             return None
         
@@ -593,37 +1085,24 @@ class AccurateScraper:
         brand_mention_counts = {}
         brand_context_scores = {}
         
-        for brand, patterns in brand_patterns.items():
-            mention_count = 0
-            context_score = 0
-            
-            for pattern in patterns:
-                # Count mentions
-                mention_count += full_text.count(pattern)
-                
-                # Check context around each mention
-                positions = [i for i in range(len(full_text)) if full_text[i:i+len(pattern)] == pattern]
-                for pos in positions:
-                    # Get 100 chars before and after
-                    context = full_text[max(0, pos-100):min(len(full_text), pos+len(pattern)+100)]
-                    
-                    # Score based on customer discussion phrases in context
-                    for phrase in customer_discussion_phrases:
-                        if phrase in context:
-                            context_score += 1
-            
+        # Mention positions per pattern + prefix counts of discussion phrases, built once;
+        # scoring the 100 chars before and after each mention is then a range query
+        mentions = MentionIndex(matches, PRIMARY_BRAND_PATTERNS)
+        
+        for brand in PRIMARY_BRAND_PATTERNS:
+            mention_count = mentions.mention_count(brand)
             if mention_count > 0:
                 brand_mention_counts[brand] = mention_count
-                brand_context_scores[brand] = context_score
+                brand_context_scores[brand] = mentions.context_score(brand)
         
         # If no brands mentioned, return None
         if not brand_mention_counts:
             return None
         
         # Priority 3: Brand in title gets priority
-        for brand, patterns in brand_patterns.items():
+        for brand, patterns in PRIMARY_BRAND_PATTERNS.items():
             for pattern in patterns:
-                if pattern in title and brand in brand_mention_counts:
+                if matches.contains(pattern, 0, len(title)) and brand in brand_mention_counts:
                     return brand
         
         # Priority 4: Brand with highest context score (most discussed)
@@ -655,66 +1134,29 @@ class AccurateScraper:
         text_lower = text.lower()
         title_lower = title_only.lower() if title_only else text_lower
         
-        # HIGH-CONFIDENCE COMPLAINT KEYWORDS (added Dec 22, 2025)
-        # These override all other sentiment analysis - if present, post is negative
-        # This catches subtle complaints that VADER/TextBlob miss (like "AI photos" post)
-        high_confidence_complaints = [
-            'fake', 'downgraded', 'frustrated', 'thrown off', 'vent', 'venting',
-            'not allowed', 'taking away', 'annoyed', 'upset', 'misleading',
-            'not happy', 'unhappy', 'angry', 'furious', 'ridiculous',
-            'unacceptable', 'pathetic', 'joke', 'laughable'
-        ]
+        # Keyword lists live in sentiment_rules so ruleset_version() tracks every edit;
+        # one scan finds all of them (and competitor names) with positions
+        matches = shared_matcher().scan(text_lower)
+        title_matches = shared_matcher().scan(title_lower) if title_only else matches
         
         # Check for high-confidence complaint keywords first (before any other analysis)
-        for keyword in high_confidence_complaints:
-            if keyword in text_lower:
-                return {
-                    'sentiment': 'negative',
-                    'confidence': 0.85,
-                    'reasoning': f'High-confidence complaint keyword detected: "{keyword}"'
-                }
-        
-        # Neutral comparison/switching keywords (Brian's feedback: ambiguous posts should be neutral)
-        # These indicate the post is asking for options/comparisons, not praising/criticizing
-        neutral_comparison = [
-            'switching to', 'switch to', 'switching from', 'compared to', 'vs', 'versus',
-            'which is better', 'better than', 'trying to decide', 'considering',
-            'what service', 'which service', 'what meal kit', 'which meal kit',
-            'recommendation', 'anyone know', 'anyone tried', 'anyone use',
-            'does anyone', 'has anyone', 'looking for', 'trying to find',
-            'best meal service', 'best meal kit', 'that don\'t use', 'that dont use'
-        ]
-        
-        # Strong negative keywords/phrases that override sentiment analysis
-        # NOTE: Only include phrases that express DISSATISFACTION, not just stating facts
-        strong_negative = [
-            'stay away', 'avoid', 'terrible', 'worst', 'horrible', 'awful', 
-            'disgusting', 'rotten', 'spoiled', 'cancelled', 'cancel', 'refund',
-            'scam', 'fraud', 'disappointed', 'issues with', 'problem with',
-            'never again', 'waste of money', 'do not recommend', 'not recommend',
-            'caution', 'warning', 'beware', 'upcharge', 'overpriced', 'rip off',
-            'complaint', 'unhappy', 'dissatisfied', 'poor quality', 'bad experience',
-            'missing', 'wrong', 'incorrect', 'damaged', 'late delivery', 'disaster',
-            'gross', 'contaminated', 'ruined', 'laughable'
-        ]
-        
-        # Strong positive keywords
-        strong_positive = [
-            'love it', 'loving', 'amazing', 'excellent', 'best', 'highly recommend',
-            'fantastic', 'perfect', 'delicious', 'fresh', 'great quality',
-            'satisfied', 'happy with', 'impressed', 'exceeded expectations',
-            'worth it', 'great value', 'favorite'
-        ]
+        keyword = matches.first('high_confidence_complaints')
+        if keyword:
+            return {
+                'sentiment': 'negative',
+                'confidence': 0.85,
+                'reasoning': f'High-confidence complaint keyword detected: "{keyword}"'
+            }
         
         # Check for neutral comparison first (Brian's feedback)
-        has_neutral_comparison = any(keyword in text_lower for keyword in neutral_comparison)
+        has_neutral_comparison = matches.has('neutral_comparison')
         
         # Check if title is a question (strong indicator of neutral)
-        is_question = title_lower.strip().endswith('?') or any(q in title_lower for q in ['what', 'which', 'how', 'does anyone', 'has anyone'])
+        is_question = title_lower.strip().endswith('?') or title_matches.has('question_words')
         
         # Check for strong keywords
-        has_strong_negative = any(keyword in text_lower for keyword in strong_negative)
-        has_strong_positive = any(keyword in text_lower for keyword in strong_positive)
+        has_strong_negative = matches.has('strong_negative')
+        has_strong_positive = matches.has('strong_positive')
         
         # Track if positive sentiment came from context-aware analysis
         context_aware_positive = False
@@ -729,16 +1171,15 @@ class AccurateScraper:
             # Check if negative words are near OTHER brands (within 50 chars)
             for other_brand in other_brands:
                 other_brand_lower = other_brand.lower()
-                if other_brand_lower in text_lower:
+                if matches.positions(other_brand_lower):
                     # Find position of other brand
-                    brand_pos = text_lower.find(other_brand_lower)
+                    brand_pos = matches.positions(other_brand_lower)[0]
                     # Check if negative words are near this other brand
                     context_start = max(0, brand_pos - 50)
                     context_end = min(len(text_lower), brand_pos + len(other_brand_lower) + 50)
-                    context = text_lower[context_start:context_end]
                     
                     # If negative words are in this context, they're about the OTHER brand
-                    if any(keyword in context for keyword in strong_negative):
+                    if matches.has('strong_negative', context_start, context_end):
                         # Check if primary brand is mentioned positively
                         # Look for brand name OR abbreviation (e.g., "HelloFresh" or "HF")
                         import re
@@ -759,70 +1200,60 @@ class AccurateScraper:
                                 primary_pos = match.start()
                                 primary_context_start = max(0, primary_pos - 50)
                                 primary_context_end = min(len(text_lower), primary_pos + 50)
-                                primary_context = text_lower[primary_context_start:primary_context_end]
                                 
                                 # Positive indicators: "better", "resolved", "fairly", "look better"
-                                positive_comparison = ['better', 'resolved', 'fairly', 'look better', 'makes', 'always']
-                                if any(pos in primary_context for pos in positive_comparison):
+                                if matches.has('positive_comparison', primary_context_start, primary_context_end):
                                     # This is POSITIVE for primary brand!
                                     has_strong_negative = False
                                     has_strong_positive = True
                                     context_aware_positive = True  # Mark as context-aware
                                     break
         
-        # VADER sentiment
-        vader_scores = self.analyzer.polarity_scores(text)
-        vader_compound = vader_scores['compound']
-        
-        # TextBlob sentiment
-        blob = TextBlob(text)
-        textblob_polarity = blob.sentiment.polarity
-        
         # Override with strong keywords (Brian's feedback: comparison/question posts should be neutral)
+        rule = None
         if has_strong_negative:
             # Clear negative sentiment always wins
-            sentiment = 'negative'
-            confidence = 0.9
+            rule = ('negative', 0.9)
         elif context_aware_positive:
             # Context-aware positive (e.g., "Don't switch!") wins over neutral comparison
-            sentiment = 'positive'
-            confidence = 0.9
+            rule = ('positive', 0.9)
         elif is_question or has_neutral_comparison:
             # Questions/comparisons are ALWAYS neutral (Brian's feedback)
             # Even if they contain positive words like "love" or "best"
-            sentiment = 'neutral'
-            confidence = 0.85
+            rule = ('neutral', 0.85)
         elif has_strong_positive:
             # Strong positive only if NOT a question/comparison
-            sentiment = 'positive'
-            confidence = 0.9
-        # Combined sentiment decision (Brian's spec: Positive/Negative/Suggestion(Neutral))
-        elif vader_compound >= POSITIVE_THRESHOLD and textblob_polarity >= 0.1:
-            sentiment = 'positive'
-            confidence = min(abs(vader_compound) + abs(textblob_polarity), 1.0)
-        elif vader_compound <= NEGATIVE_THRESHOLD and textblob_polarity <= -0.1:
-            sentiment = 'negative' 
-            confidence = min(abs(vader_compound) + abs(textblob_polarity), 1.0)
-        else:
-            sentiment = 'neutral'  # Suggestion/Neutral as per Brian's spec
-            confidence = 1.0 - abs(vader_compound - textblob_polarity)
+            rule = ('positive', 0.9)
+        
+        # Lazy engines skip the models entirely once a rule has decided
+        if rule and self.sentiment_engine.lazy:
+            return {
+                'sentiment': rule[0],
+                'confidence': rule[1],
+                'reasoning': 'Keyword rules (models skipped)'
+            }
+        
+        # Model sentiment (SENTIMENT_ENGINE: dual VADER + TextBlob, VADER-only, or rules-first)
+        result = self.sentiment_engine.score(text)
+        if rule:
+            result['sentiment'], result['confidence'] = rule
         
         return {
-            'sentiment': sentiment,
-            'confidence': round(confidence, 2),
-            'reasoning': f"VADER: {vader_compound:.2f}, TextBlob: {textblob_polarity:.2f}"
+            'sentiment': result['sentiment'],
+            'confidence': round(result['confidence'], 2),
+            'reasoning': result['reasoning']
         }
     
     def should_exclude_post(self, post):
         """Filter out spam/promo content as per Brian's spec"""
-        text = (post['title'] + ' ' + post['selftext']).lower()
         title = post['title'].lower()
+        text = title + ' ' + post['selftext'].lower()
         subreddit = post.get('subreddit', '').lower()
+        matches = shared_matcher().scan(text)
         
         # Check for excluded keywords
-        for keyword in EXCLUDE_KEYWORDS:
-            if keyword.lower() in text:
-                return True
+        if matches.has('exclude'):
+            return True
         
         # STRICT WHITELIST: Only keep posts that are genuinely about meal kit services
         
@@ -841,9 +1272,7 @@ class AccurateScraper:
         is_general_food_sub = any(food_sub in subreddit for food_sub in general_food_subs)
         
         # Check if brand names are in the title (main topic)
-        brand_names = ['hellofresh', 'factor75', 'factor 75', 'blue apron', 'home chef',
-                      'marley spoon', 'hungryroot', 'purple carrot', 'meal kit', 'meal service']
-        brand_in_title = any(brand in title for brand in brand_names)
+        brand_in_title = matches.has('title_brand', 0, len(title))
         
         # DECISION LOGIC:
         # Keep if: Brand subreddit OR (meal kit sub) OR (general food sub AND brand in title)
@@ -920,6 +1349,24 @@ class AccurateScraper:
         
         return sample_posts
 
+def write_step_summary(fetch_stats):
+    """Append the fetch timing table to the GitHub Actions job summary (if running in Actions)"""
+    summary_file = os.getenv('GITHUB_STEP_SUMMARY')
+    if not summary_file or not fetch_stats:
+        return
+    
+    lines = [
+        "### Reddit fetch timing",
+        "",
+        "| Sources | Workers | Wall-clock | Serialized | Speedup |",
+        "|---|---|---|---|---|",
+        f"| {fetch_stats['sources']} | {fetch_stats['workers']} | {fetch_stats['wall_clock_seconds']:.1f}s "
+        f"| {fetch_stats['serialized_seconds']:.1f}s | {fetch_stats['speedup']:.1f}x |",
+        ""
+    ]
+    with open(summary_file, 'a') as f:
+        f.write("\n".join(lines) + "\n")
+
 def main():
     """Main function to run the scraper"""
     scraper = AccurateScraper()
@@ -933,10 +1380,7 @@ def main():
     
     # Save to reports/raw/
     timestamp = datetime.now().strftime('%Y-%m-%d')
-    
     raw_file = f'reports/raw/raw_{timestamp}.json'
-    with open(raw_file, 'w') as f:
-        json.dump(data, f, indent=2)
     
     # Calculate brand counts for all 6 brands (including zeros)
     brand_counts = {brand: 0 for brand in ALL_COMPETITORS}
@@ -948,9 +1392,9 @@ def main():
     # Add brand_counts to data before saving as working data
     data['brand_counts'] = brand_counts
     
-    # Also save as working data
-    with open(WORKING_DATA_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+    # The dataset is serialized once; the raw snapshot and working data both reference it
+    artifact = artifacts.save(raw_file, data, **artifacts.summary_fields(data))
+    artifacts.write_reference(WORKING_DATA_FILE, artifact, **artifacts.summary_fields(data))
     
     # Ensure filter_stats includes all 6 brands
     complete_filter_stats = {}
@@ -959,6 +1403,7 @@ def main():
             'pre_filter': 0,
             'post_filter': 0
         })
+    complete_filter_stats['unattributed'] = data['filter_stats'].get('unattributed', 0)
     
     # Save metadata with all 6 brands
     metadata_file = f'reports/raw/metadata_{timestamp}.json'
@@ -969,14 +1414,44 @@ def main():
         'filter_stats': complete_filter_stats,
         'brand_counts': brand_counts,
         'brands_analyzed': ALL_COMPETITORS,
-        'total_posts': data['total_posts']
+        'total_posts': data['total_posts'],
+        'fetch_stats': data.get('fetch_stats', {}),
+        'artifact': artifact
     }
-    with open(metadata_file, 'w') as f:
-        json.dump(metadata, f, indent=2)
+    data_codec.dump(metadata_file, metadata)
+    
+    write_step_summary(data.get('fetch_stats', {}))
+    
+    # Complete the NDJSON working posts the scrape appended to (the final header
+    # record carries the totals), then replace last run's file
+    partial_posts_file = partial_path(WORKING_POSTS_FILE)
+    if WORKING_NDJSON and os.path.exists(partial_posts_file):
+        with PostWriter(partial_posts_file) as writer:
+            writer.update_header(**{key: value for key, value in data.items() if key != 'posts'})
+        os.replace(partial_posts_file, WORKING_POSTS_FILE)
+    elif os.path.exists(WORKING_POSTS_FILE):
+        os.remove(WORKING_POSTS_FILE)  # stale: steps would read it instead of this run's data
+    
+    # Upsert into the historical post store (window/trend queries without reading every snapshot)
+    if POST_STORE_ENABLED:
+        from post_store import PostStore
+        try:
+            store = PostStore()
+            # The store is not committed: a fresh checkout rebuilds it from the archive
+            seeded = store.seed()
+            if seeded:
+                print(f"[SUCCESS] Post store created from {seeded[0]} archived snapshots ({seeded[1]} posts)")
+            stored, _ = store.upsert(data['posts'], seen_at=data['scrape_timestamp'])
+            print(f"[SUCCESS] {stored} posts upserted into {POST_STORE_FILE}")
+        except sqlite3.Error as e:
+            print(f"[WARNING] Post store update failed ({POST_STORE_FILE}): {e}")
     
     print(f"\n[SUCCESS] Scraped {data['total_posts']} posts using Brian's data sources")
-    print(f"[SUCCESS] Data saved to {raw_file}")
+    print(f"[SUCCESS] Data saved to {artifact['path']} ({artifact['size'] / 1024:.0f} KB JSON, {artifact['bytes'] / 1024:.0f} KB on disk)")
+    print(f"[SUCCESS] Raw snapshot saved to {raw_file}")
     print(f"[SUCCESS] Working data saved to {WORKING_DATA_FILE}")
+    if WORKING_NDJSON:
+        print(f"[SUCCESS] Working posts saved to {WORKING_POSTS_FILE}")
     print(f"[SUCCESS] Metadata saved to {metadata_file}")
     
     print(f"\nBrand breakdown:")
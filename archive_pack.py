@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Packed Weekly Archive
+Compacts past days of reports/raw (raw_/filtered_/metadata_ snapshots) and
+reports/archive (archived chart/report files) into one compressed NDJSON file
+per ISO week, and indexes them in reports/packed/manifest.json (days, date
+range, brand counts, byte offsets). Each week file holds two independently
+compressed sections - 'data' (snapshots, with every distinct post stored once)
+and 'files' - so a reader seeks straight to one week's posts without
+decompressing anything else. Packing keeps the data, not the bytes: extract()
+returns archived files as stored, but re-serializes raw/filtered/metadata
+snapshots, which parse to the same JSON but may differ byte for byte.
+
+    python archive_pack.py --compact            pack weeks older than ARCHIVE_KEEP_DAYS
+    python archive_pack.py --list
+    python archive_pack.py --extract raw_2025-11-24.json --out /tmp/raw.json
+"""
+
+import argparse
+import base64
+import glob
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+from datetime import date, datetime, timedelta
+
+try:
+    import zstandard  # optional: smaller and faster than gzip
+except ImportError:
+    zstandard = None
+
+from config import RAW_DATA_DIR, ARCHIVE_DIR, ARCHIVE_PACK_DIR, ARCHIVE_PACK_CODEC, ARCHIVE_KEEP_DAYS
+import artifacts
+import data_codec
+from post_index import canonical_post_id
+from post_store import brand_counts
+
+PACK_FORMAT_VERSION = 1
+
+SNAPSHOT_RE = re.compile(r'^(raw|filtered|metadata)_(\d{4}-\d{2}-\d{2})\.json$')
+DAY_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+def pack_codec():
+    """Codec new weeks are written with"""
+    return 'zstd' if ARCHIVE_PACK_CODEC == 'zstd' and zstandard is not None else 'gzip'
+
+
+def compress(body, codec):
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=19).compress(body)
+    return gzip.compress(body, compresslevel=9, mtime=0)
+
+
+def decompress(body, codec):
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("This week was packed with zstd - pip install zstandard to read it")
+        return zstandard.ZstdDecompressor().decompress(body)
+    return gzip.decompress(body)
+
+
+def week_of(day):
+    """ISO week key ('2025-W47') for a date or 'YYYY-MM-DD'"""
+    day = date.fromisoformat(day) if isinstance(day, str) else day
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def content_key(data):
+    """Hash of data independent of key order (a week rebuilt from its pack dedupes the same)"""
+    return hashlib.sha256(json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+class WeekBuilder:
+    """Collects one week's snapshots and files, deduplicated, as NDJSON records"""
+
+    def __init__(self):
+        self.posts = {}  # content key -> post
+        self.datasets = {}  # content key -> dataset record (raw_ and filtered_ usually share one)
+        self.metadata = {}  # file name -> metadata record
+        self.files = {}  # archive-relative name -> (sha256, bytes)
+
+    def add_dataset(self, name, day, data):
+        keys = []
+        for post in data.get('posts', []):
+            key = content_key(post)[:16]
+            self.posts.setdefault(key, post)
+            keys.append(key)
+        record = self.datasets.setdefault(content_key(data), {
+            'type': 'dataset',
+            'names': [],
+            'date': day,
+            'fields': {field: value for field, value in data.items() if field != 'posts'},
+            'posts': keys
+        })
+        if name not in record['names']:
+            record['names'].append(name)
+
+    def add_metadata(self, name, day, data):
+        self.metadata[name] = {'type': 'metadata', 'name': name, 'date': day, 'data': data}
+
+    def add_file(self, name, body):
+        self.files[name] = (hashlib.sha256(body).hexdigest(), body)
+
+    def merge(self, archive, week):
+        """Start from a week that is already packed (new loose files for an old week)"""
+        for names, data in archive.datasets(week):
+            for name in names:
+                self.add_dataset(name, SNAPSHOT_RE.match(name).group(2), data)
+        for record in archive.records(week, 'data'):
+            if record['type'] == 'metadata':
+                self.metadata[record['name']] = record
+        for name, body in archive.files(week):
+            self.add_file(name, body)
+
+    def sections(self):
+        """{'data': [record, ...], 'files': [record, ...]}"""
+        data = [{'type': 'post', 'key': key, 'post': post} for key, post in self.posts.items()]
+        data += sorted(self.datasets.values(), key=lambda record: record['names'])
+        data += [self.metadata[name] for name in sorted(self.metadata)]
+
+        files = []
+        first_with = {}
+        for name in sorted(self.files):
+            digest, body = self.files[name]
+            if digest in first_with:
+                # Same chart/report archived twice - stored once
+                files.append({'type': 'file', 'name': name, 'sha256': digest, 'same_as': first_with[digest]})
+            else:
+                first_with[digest] = name
+                files.append({'type': 'file', 'name': name, 'sha256': digest,
+                              'data': base64.b64encode(body).decode('ascii')})
+        return {'data': data, 'files': files}
+
+    def summary(self):
+        """Index fields for the manifest: days, date range covered, brand counts over unique posts"""
+        unique = {}
+        ranges = []
+        for record in sorted(self.datasets.values(), key=lambda record: record['date']):
+            for key in record['posts']:
+                post = self.posts[key]
+                unique[canonical_post_id(post)] = post
+            if record['fields'].get('date_range'):
+                ranges.append(record['fields']['date_range'])
+        days = sorted({record['date'] for record in self.datasets.values()} |
+                      {record['date'] for record in self.metadata.values()} |
+                      {name.split('/', 1)[0] for name in self.files})
+        return {
+            'days': days,
+            'date_range': {'start': min(r['start'] for r in ranges), 'end': max(r['end'] for r in ranges)} if ranges else {},
+            'posts': len(unique),
+            'brand_counts': brand_counts(unique.values())
+        }
+
+
+class PackedArchive:
+    """Reader/writer for the packed weeks in ARCHIVE_PACK_DIR"""
+
+    def __init__(self, path=None):
+        self.path = path or ARCHIVE_PACK_DIR
+        self.manifest = {'format_version': PACK_FORMAT_VERSION, 'weeks': {}}
+        manifest_file = os.path.join(self.path, 'manifest.json')
+        if os.path.exists(manifest_file):
+            self.manifest = data_codec.load(manifest_file)
+            if self.manifest.get('format_version') != PACK_FORMAT_VERSION:
+                raise ValueError(f"{self.path}: pack format {self.manifest.get('format_version')}, "
+                                 f"expected {PACK_FORMAT_VERSION}")
+
+    @property
+    def weeks(self):
+        return self.manifest['weeks']
+
+    def records(self, week, section='data'):
+        """Iterate one section of one week (only that section is read and decompressed)"""
+        entry = self.weeks[week]
+        location = entry['sections'][section]
+        with open(os.path.join(self.path, entry['file']), 'rb') as f:
+            f.seek(location['offset'])
+            body = f.read(location['length'])
+        for line in decompress(body, entry['codec']).splitlines():
+            yield data_codec.loads(line)
+
+    def datasets(self, week):
+        """(names, full snapshot data) for each distinct snapshot in a week"""
+        posts = {}
+        for record in self.records(week, 'data'):
+            if record['type'] == 'post':
+                posts[record['key']] = record['post']
+            elif record['type'] == 'dataset':
+                yield record['names'], dict(record['fields'], posts=[posts[key] for key in record['posts']])
+
+    def posts(self, week):
+        """Every distinct post version stored for a week"""
+        return [record['post'] for record in self.records(week, 'data') if record['type'] == 'post']
+
+    def files(self, week):
+        """(archive-relative name, bytes) for a week's archived files"""
+        by_name = {}
+        for record in self.records(week, 'files'):
+            source = by_name[record['same_as']] if 'same_as' in record else base64.b64decode(record['data'])
+            by_name[record['name']] = source
+            yield record['name'], source
+
+    def extract(self, name):
+        """Contents of a packed file: 'raw_<date>.json', 'metadata_<date>.json' or '<date>/<file>'
+
+        Archived '<date>/<file>' entries come back byte for byte; snapshots are
+        re-serialized from their parsed data.
+        """
+        match = SNAPSHOT_RE.match(os.path.basename(name))
+        day = match.group(2) if match else name.split('/', 1)[0]
+        week = week_of(day)
+        if week not in self.weeks:
+            raise FileNotFoundError(f"{name}: week {week} is not packed")
+        if not match:
+            for file_name, body in self.files(week):
+                if file_name == name:
+                    return body
+        elif match.group(1) == 'metadata':
+            for record in self.records(week, 'data'):
+                if record['type'] == 'metadata' and record['name'] == name:
+                    return data_codec.dumps(record['data'], pretty=True)
+        else:
+            for names, data in self.datasets(week):
+                if name in names:
+                    return data_codec.dumps(data, pretty=True)
+        raise FileNotFoundError(f"{name} is not in packed week {week}")
+
+    def write_week(self, week, builder):
+        """Write a week file (replacing any earlier pack of the week) and index it"""
+        codec = pack_codec()
+        body = b''
+        sections = {}
+        for section, records in builder.sections().items():
+            lines = b''.join(artifacts.dumps(record) + b'\n' for record in records)
+            member = compress(lines, codec)
+            sections[section] = {'offset': len(body), 'length': len(member), 'records': len(records)}
+            body += member
+        file_name = f"{week}.ndjson.{'zst' if codec == 'zstd' else 'gz'}"
+        artifacts.write_atomic(os.path.join(self.path, file_name), body)
+        previous = self.weeks.get(week)
+        if previous and previous['file'] != file_name:
+            os.remove(os.path.join(self.path, previous['file']))
+        self.weeks[week] = dict(builder.summary(), file=file_name, codec=codec, bytes=len(body), sections=sections)
+        return self.weeks[week]
+
+    def save(self):
+        self.manifest['weeks'] = dict(sorted(self.weeks.items()))
+        artifacts.write_atomic(os.path.join(self.path, 'manifest.json'),
+                               data_codec.dumps(self.manifest, pretty=True))
+
+
+def loose_days(raw_dir=RAW_DATA_DIR, archive_dir=ARCHIVE_DIR):
+    """{day: [paths]} of unpacked snapshots and archive directories"""
+    days = {}
+    for path in glob.glob(os.path.join(raw_dir, '*.json')):
+        match = SNAPSHOT_RE.match(os.path.basename(path))
+        if match:
+            days.setdefault(match.group(2), []).append(path)
+    for path in glob.glob(os.path.join(archive_dir, '*')):
+        if os.path.isdir(path) and DAY_RE.match(os.path.basename(path)):
+            days.setdefault(os.path.basename(path), []).append(path)
+    return days
+
+
+def compact(keep_days=None, today=None, raw_dir=RAW_DATA_DIR, archive_dir=ARCHIVE_DIR, pack_dir=None, dry_run=False):
+    """Pack every week that ended more than keep_days ago, then delete its loose files
+
+    Returns [(week, loose bytes, packed bytes)]. A week is checked by reading it
+    back before anything is deleted.
+    """
+    keep_days = ARCHIVE_KEEP_DAYS if keep_days is None else keep_days
+    cutoff = (today or datetime.now().date()) - timedelta(days=keep_days)
+    weeks = {}
+    for day, paths in loose_days(raw_dir, archive_dir).items():
+        week_end = date.fromisoformat(day) + timedelta(days=6 - date.fromisoformat(day).weekday())
+        if week_end < cutoff:
+            weeks.setdefault(week_of(day), []).extend((day, path) for path in paths)
+
+    archive = PackedArchive(pack_dir)
+    results = []
+    for week, sources in sorted(weeks.items()):
+        builder = WeekBuilder()
+        if week in archive.weeks:
+            builder.merge(archive, week)
+        loose_bytes = 0
+        for day, path in sorted(sources):
+            if os.path.isdir(path):
+                for file_path in sorted(glob.glob(os.path.join(path, '**', '*'), recursive=True)):
+                    if os.path.isfile(file_path):
+                        with open(file_path, 'rb') as f:
+                            builder.add_file(os.path.relpath(file_path, archive_dir), f.read())
+                        loose_bytes += os.path.getsize(file_path)
+                continue
+            reference = artifacts.reference_of(path)
+            loose_bytes += os.path.getsize(path) + (reference['bytes'] if reference else 0)
+            name = os.path.basename(path)
+            if name.startswith('metadata_'):
+                builder.add_metadata(name, day, artifacts.load(path))
+            else:
+                builder.add_dataset(name, day, artifacts.load(path))
+        if dry_run:
+            results.append((week, loose_bytes, None))
+            continue
+
+        entry = archive.write_week(week, builder)
+        expected = {section: location['records'] for section, location in entry['sections'].items()}
+        if {section: sum(1 for _ in archive.records(week, section)) for section in expected} != expected:
+            raise RuntimeError(f"Packed week {week} did not read back - loose files kept")
+        archive.save()
+        for _, path in sources:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+        results.append((week, loose_bytes, entry['bytes']))
+
+    if results and not dry_run:
+        # raw_/filtered_ references that were packed no longer hold their objects
+        artifacts.collect_garbage()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack past reports into compressed weekly NDJSON files")
+    parser.add_argument('--compact', action='store_true', help='Pack weeks older than --keep-days and delete their loose files')
+    parser.add_argument('--keep-days', type=int, default=ARCHIVE_KEEP_DAYS, help='Days left unpacked')
+    parser.add_argument('--dry-run', action='store_true', help='Show which weeks would be packed')
+    parser.add_argument('--list', action='store_true', help='List packed weeks')
+    parser.add_argument('--extract', metavar='NAME', help='Restore a packed file (raw_<date>.json, <date>/step1_chart.png, ...)')
+    parser.add_argument('--out', help='Where --extract writes (default: stdout)')
+    args = parser.parse_args()
+
+    if args.compact:
+        results = compact(args.keep_days, dry_run=args.dry_run)
+        for week, loose_bytes, packed_bytes in results:
+            packed = f"{packed_bytes / 1024:.0f} KB" if packed_bytes is not None else "(dry run)"
+            print(f"  {week}: {loose_bytes / 1024:.0f} KB loose -> {packed}")
+        print(f"{'Would pack' if args.dry_run else 'Packed'} {len(results)} weeks")
+
+    archive = PackedArchive()
+    if args.list:
+        print(f"{'Week':<8} | {'Days':<4} | {'Posts':<5} | {'Data KB':<7} | {'Files KB':<8} | Date range")
+        print("-" * 80)
+        for week, entry in archive.weeks.items():
+            sections = entry['sections']
+            date_range = entry['date_range']
+            print(f"{week:<8} | {len(entry['days']):>4} | {entry['posts']:>5} | {sections['data']['length'] / 1024:>7.0f} | "
+                  f"{sections['files']['length'] / 1024:>8.0f} | {date_range.get('start', '')[:10]} to {date_range.get('end', '')[:10]}")
+
+    if args.extract:
+        body = archive.extract(args.extract)
+        if args.out:
+            with open(args.out, 'wb') as f:
+                f.write(body)
+            print(f"Extracted {args.extract} to {args.out}")
+        else:
+            print(body.decode('utf-8', errors='replace'))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Run Artifacts
+Each dataset a run produces is serialized once - compact JSON, gzipped by
+default - to reports/objects/<sha256>.json.gz, named by the hash of its
+content. raw_<date>.json, filtered_<date>.json and working_reddit_data.json
+are small reference files pointing at it, so identical datasets are stored
+once however many names they have:
+
+    {"$artifact": "sha256:<hex>", "path": "reports/objects/<hex>.json.gz", "size": ..., "bytes": ..., ...}
+
+load() reads either a reference or a legacy full JSON file.
+
+    python artifacts.py --migrate reports/raw    turn full snapshots into references
+    python artifacts.py --gc                     delete objects no reference points at
+"""
+
+import argparse
+import glob
+import gzip
+import hashlib
+import os
+
+from config import ARTIFACT_DIR, ARTIFACT_COMPRESSION, RAW_DATA_DIR, WORKING_DATA_FILE
+import data_codec
+
+REFERENCE_KEY = '$artifact'
+
+
+def dumps(data):
+    """Compact UTF-8 JSON (the bytes an artifact's hash is taken over)"""
+    return data_codec.dumps(data)
+
+
+def object_path(digest, compression=None):
+    compression = ARTIFACT_COMPRESSION if compression is None else compression
+    return os.path.join(ARTIFACT_DIR, f"{digest}.json{'.gz' if compression == 'gzip' else ''}")
+
+
+def write_atomic(path, body):
+    """Write via a temp file + rename, so readers never see half a file"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = f"{path}.tmp{os.getpid()}"
+    with open(temp_path, 'wb') as f:
+        f.write(body)
+    os.replace(temp_path, path)
+
+
+def store(data):
+    """Write data as a content-addressed object (no-op if already stored); returns its reference"""
+    body = dumps(data)
+    digest = hashlib.sha256(body).hexdigest()
+    path = object_path(digest)
+    if not os.path.exists(path):
+        # mtime=0 keeps the gzip bytes identical for identical content
+        write_atomic(path, gzip.compress(body, mtime=0) if path.endswith('.gz') else body)
+    return {REFERENCE_KEY: f"sha256:{digest}", 'path': path, 'size': len(body), 'bytes': os.path.getsize(path)}
+
+
+def write_reference(path, reference, **summary):
+    """Point a named artifact (e.g. raw_<date>.json) at a stored object
+
+    summary: small fields copied into the reference (date_range, total_posts)
+    so callers that only need those never open the object.
+    """
+    write_atomic(path, data_codec.dumps(dict(reference, **summary), pretty=True))
+    return reference
+
+
+def save(path, data, **summary):
+    """store() data and write a reference to it at path"""
+    return write_reference(path, store(data), **summary)
+
+
+def summary_fields(data):
+    """The fields save() copies into a dataset's references"""
+    return {key: data[key] for key in ('scrape_timestamp', 'date_range', 'total_posts') if key in data}
+
+
+def reference_of(path):
+    """The reference stored at path, or None if path is missing or a full JSON file"""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(4096)
+            if REFERENCE_KEY.encode('utf-8') not in head:
+                return None
+            reference = data_codec.loads(head + f.read())
+    except (OSError, ValueError):
+        return None
+    return reference if isinstance(reference, dict) and REFERENCE_KEY in reference else None
+
+
+def link(source_path, path):
+    """Give the artifact at source_path another name without re-serializing it"""
+    reference = reference_of(source_path)
+    if reference is None:
+        data = load(source_path)
+        return save(path, data, **summary_fields(data))
+    return write_reference(path, reference, **{key: value for key, value in reference.items()
+                                               if key not in (REFERENCE_KEY, 'path', 'size', 'bytes')})
+
+
+def load_object(reference):
+    """Data for a reference (the recorded path, or the object under either compression)"""
+    digest = reference[REFERENCE_KEY].split(':', 1)[1]
+    for path in [reference.get('path'), object_path(digest, 'gzip'), object_path(digest, 'none')]:
+        if path and os.path.exists(path):
+            with open(path, 'rb') as f:
+                body = f.read()
+            return data_codec.loads(gzip.decompress(body) if path.endswith('.gz') else body)
+    raise FileNotFoundError(f"Artifact {reference[REFERENCE_KEY]} not found in {ARTIFACT_DIR}")
+
+
+def load(path):
+    """JSON data at path, following an artifact reference if it is one"""
+    data = data_codec.load(path)
+    if isinstance(data, dict) and REFERENCE_KEY in data:
+        return load_object(data)
+    return data
+
+
+def migrate(raw_dir=RAW_DATA_DIR):
+    """Replace full raw_/filtered_ snapshots with references; returns (files, bytes before, bytes after)"""
+    files = before = after = 0
+    paths = glob.glob(os.path.join(raw_dir, 'raw_*.json')) + glob.glob(os.path.join(raw_dir, 'filtered_*.json'))
+    objects = set()
+    for path in sorted(paths):
+        if reference_of(path) is not None:
+            continue
+        before += os.path.getsize(path)
+        data = load(path)
+        reference = save(path, data, **summary_fields(data))
+        after += os.path.getsize(path)
+        if reference['path'] not in objects:
+            objects.add(reference['path'])
+            after += reference['bytes']
+        files += 1
+    return files, before, after
+
+
+def collect_garbage(reference_dirs=None):
+    """Delete objects no reference file points at; returns (deleted, bytes freed)"""
+    reference_dirs = reference_dirs or [RAW_DATA_DIR, os.path.dirname(WORKING_DATA_FILE)]
+    referenced = set()
+    for directory in reference_dirs:
+        for path in glob.glob(os.path.join(directory, '*.json')):
+            reference = reference_of(path)
+            if reference is not None:
+                referenced.add(reference[REFERENCE_KEY].split(':', 1)[1])
+
+    deleted = freed = 0
+    for path in glob.glob(os.path.join(ARTIFACT_DIR, '*.json*')):
+        if os.path.basename(path).split('.', 1)[0] not in referenced:
+            freed += os.path.getsize(path)
+            os.remove(path)
+            deleted += 1
+    return deleted, freed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Content-addressed run artifacts")
+    parser.add_argument('--migrate', nargs='?', const=RAW_DATA_DIR, metavar='DIR',
+                        help='Turn full raw_/filtered_ snapshots into references (default: reports/raw)')
+    parser.add_argument('--gc', action='store_true', help='Delete objects nothing references')
+    args = parser.parse_args()
+
+    if args.migrate:
+        files, before, after = migrate(args.migrate)
+        print(f"Migrated {files} snapshots: {before / 1024:.0f} KB -> {after / 1024:.0f} KB")
+    if args.gc:
+        deleted, freed = collect_garbage()
+        print(f"Deleted {deleted} unreferenced objects ({freed / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Multi-Core Batch Sentiment Scoring
+Scores lists of posts (primary brand + sentiment) across a ProcessPoolExecutor.
+Each worker builds its analyzers once in the pool initializer, chunks are sized
+from the batch and worker count, and results always come back in input order
+"""
+
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from config import BATCH_SCORING_WORKERS, BATCH_SCORING_MIN_POSTS, BATCH_SCORING_MAX_CHUNK
+
+SENTIMENT_FIELDS = ['sentiment', 'confidence', 'reasoning']
+SCORED_FIELDS = ['primary_brand'] + SENTIMENT_FIELDS
+
+# Only what scoring reads is sent to the workers
+INPUT_FIELDS = ['title', 'selftext', 'subreddit', 'primary_brand']
+
+_worker_scorer = None
+
+
+def _new_scorer(engine=None):
+    from accurate_scraper import AccurateScraper  # deferred: accurate_scraper imports this module
+    return AccurateScraper(analysis_only=True, sentiment_engine=engine)
+
+
+def _init_worker(engine):
+    """Pool initializer: build the analyzers once and warm their lexicons"""
+    global _worker_scorer
+    _worker_scorer = _new_scorer(engine)
+    _worker_scorer.score_post({'title': 'Warm up', 'selftext': 'I tried my hellofresh box and loved it', 'subreddit': ''})
+
+
+def _score_chunk(posts):
+    return [_worker_scorer.score_post(post) for post in posts]
+
+
+def worker_count(workers=None):
+    workers = workers or BATCH_SCORING_WORKERS or os.cpu_count() or 1
+    return max(1, workers)
+
+
+def chunk_size(total, workers):
+    """About four chunks per worker (evens out slow posts), capped so results stream back steadily"""
+    return max(1, min(BATCH_SCORING_MAX_CHUNK, math.ceil(total / (workers * 4))))
+
+
+def score_posts(posts, workers=None, chunksize=None, scorer=None, min_posts=None, engine=None):
+    """Score posts and return one {primary_brand, sentiment, confidence, reasoning} dict per post, in order
+
+    Batches smaller than min_posts (or a single worker) are scored inline with
+    scorer, an AccurateScraper, so short runs never pay for pool startup.
+    engine names the sentiment engine (SENTIMENT_ENGINE by default).
+    """
+    if not posts:
+        return []
+    workers = worker_count(workers)
+    min_posts = BATCH_SCORING_MIN_POSTS if min_posts is None else min_posts
+    payload = [{field: post[field] for field in INPUT_FIELDS if field in post} for post in posts]
+
+    if workers == 1 or len(posts) < min_posts:
+        scorer = scorer or _new_scorer(engine)
+        return [scorer.score_post(post) for post in payload]
+
+    chunksize = chunksize or chunk_size(len(posts), workers)
+    chunks = [payload[i:i + chunksize] for i in range(0, len(payload), chunksize)]
+    results = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=_init_worker, initargs=(engine,)) as pool:
+        # map() yields in submission order, so output order never depends on worker timing
+        for chunk_results in pool.map(_score_chunk, chunks):
+            results.extend(chunk_results)
+    return results
+
+
+def main():
+    """Backfill: rescore every archived post in reports/raw and report throughput"""
+    from benchmark_keywords import load_archived_posts
+    from config import RAW_DATA_DIR
+
+    parser = argparse.ArgumentParser(description="Batch-score archived posts across a process pool")
+    parser.add_argument('--raw-dir', default=RAW_DATA_DIR, help='Directory of archived raw_/filtered_ snapshots')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: one per CPU)')
+    parser.add_argument('--chunksize', type=int, default=None, help='Posts per task (default: sized from the batch)')
+    parser.add_argument('--output', help='Write the scored posts to this JSON file')
+    args = parser.parse_args()
+
+    posts = [dict(post, selftext=post.get('selftext', '')) for post in load_archived_posts(args.raw_dir)]
+    for post in posts:
+        post.pop('primary_brand', None)  # rescore from scratch
+    workers = worker_count(args.workers)
+    print(f"Scoring {len(posts)} archived posts with {workers} worker(s)...")
+
+    started = time.perf_counter()
+    results = score_posts(posts, workers=workers, chunksize=args.chunksize, min_posts=0)
+    elapsed = time.perf_counter() - started
+
+    labelled = [(post, result) for post, result in zip(posts, results) if post.get('sentiment')]
+    agreement = sum(post['sentiment'] == result['sentiment'] for post, result in labelled)
+    print(f"Scored {len(results)} posts in {elapsed:.2f}s ({len(results) / elapsed:.0f} posts/sec)")
+    if labelled:
+        print(f"Agreement with archived labels: {agreement}/{len(labelled)} ({agreement / len(labelled):.1%})")
+
+    if args.output:
+        for post, result in zip(posts, results):
+            post.update(result)
+        with open(args.output, 'w') as f:
+            json.dump({'total_posts': len(posts), 'posts': posts}, f, indent=2)
+        print(f"Saved scored posts to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
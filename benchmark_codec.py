@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+JSON Codec Benchmark
+Builds working-data datasets of 10k and 100k posts (archived posts repeated
+with unique URLs) and times writing, reading and typed decoding with every
+installed data_codec codec, against the stdlib indent=2 files the pipeline
+used to write
+"""
+
+import argparse
+import json
+import time
+
+import data_codec
+from benchmark_keywords import load_archived_posts
+
+SIZES = [10000, 100000]
+
+
+def make_dataset(posts, size):
+    """A working-data shaped dataset of size posts"""
+    scaled = [dict(posts[i % len(posts)], url=f"{posts[i % len(posts)].get('url', '')}#{i}") for i in range(size)]
+    return {
+        'scrape_timestamp': '2025-11-24T12:00:00+00:00',
+        'date_range': {'start': '2025-11-17T00:00:00+00:00', 'end': '2025-11-23T23:59:59+00:00'},
+        'total_posts': size,
+        'posts': scaled
+    }
+
+
+def best_of(func, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def with_codec(codec, func):
+    def run():
+        previous, data_codec.CODEC = data_codec.CODEC, codec
+        try:
+            return func()
+        finally:
+            data_codec.CODEC = previous
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark data_codec codecs on large working datasets")
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='Dataset sizes in posts')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing runs (best is reported)')
+    args = parser.parse_args()
+
+    posts = load_archived_posts()
+    if not posts:
+        raise SystemExit("No archived posts to build datasets from")
+
+    codecs = data_codec.available_codecs()
+    print(f"JSON CODEC BENCHMARK ({len(posts)} archived posts repeated, best of {args.repeat}; codecs: {', '.join(codecs)})")
+    for size in args.sizes:
+        data = make_dataset(posts, size)
+        print(f"\n{size} posts")
+        print(f"{'Codec':<16} | {'MB':<6} | {'Write ms':<9} | {'Read ms':<8} | {'Typed ms':<8} | {'Read speedup':<12}")
+        print("-" * 74)
+
+        # What every stage did before: stdlib json, indent=2
+        write_seconds, body = best_of(lambda: json.dumps(data, indent=2).encode('utf-8'), args.repeat)
+        read_seconds, _ = best_of(lambda: json.loads(body), args.repeat)
+        baseline = read_seconds
+        print(f"{'json indent=2':<16} | {len(body) / 1e6:>6.1f} | {write_seconds * 1e3:>9.0f} | {read_seconds * 1e3:>8.0f} | "
+              f"{'-':>8} | {1.0:>11.1f}x")
+
+        for codec in codecs:
+            write_seconds, body = best_of(with_codec(codec, lambda: data_codec.dumps(data)), args.repeat)
+            read_seconds, decoded = best_of(with_codec(codec, lambda: data_codec.loads(body)), args.repeat)
+            typed_seconds, typed = best_of(with_codec(codec, lambda: data_codec.decode_posts(body)), args.repeat)
+            if decoded != data or len(typed) != size:
+                raise SystemExit(f"{codec} did not round-trip the {size} post dataset")
+            print(f"{codec + ' compact':<16} | {len(body) / 1e6:>6.1f} | {write_seconds * 1e3:>9.0f} | {read_seconds * 1e3:>8.0f} | "
+                  f"{typed_seconds * 1e3:>8.0f} | {baseline / read_seconds:>11.1f}x")
+        print("-" * 74)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Keyword Matching Benchmark
+Replays archived posts from reports/raw through the shared Aho-Corasick matcher
+and through the per-phrase substring loops it replaced, checks both agree on
+every keyword set, and reports the time per post for each. --scaling adds a
+micro-benchmark of primary-brand mention scoring as posts get longer
+"""
+
+import argparse
+import glob
+import os
+import time
+
+import artifacts
+from archive_pack import PackedArchive
+from config import RAW_DATA_DIR
+from keyword_matcher import KeywordMatcher
+from keyword_rules import keyword_sets, shared_matcher, PRIMARY_BRAND_PATTERNS, CUSTOMER_DISCUSSION_PHRASES
+from mention_index import MentionIndex
+
+SCALING_LENGTHS = [500, 1000, 2000, 4000, 8000, 16000]
+
+
+def load_archived_posts(raw_dir=RAW_DATA_DIR):
+    """Unique posts (by URL) from every packed week and raw_/filtered_ snapshot in reports/raw"""
+    posts = {}
+    archive = PackedArchive()
+    for week in archive.weeks:
+        for post in archive.posts(week):
+            posts.setdefault(post.get('url'), post)
+    for path in sorted(glob.glob(os.path.join(raw_dir, '*.json'))):
+        if os.path.basename(path).startswith('metadata_'):
+            continue
+        try:
+            data = artifacts.load(path)
+        except (OSError, ValueError):
+            continue
+        for post in data.get('posts', []):
+            posts.setdefault(post.get('url'), post)
+    return list(posts.values())
+
+
+def post_text(post):
+    return (post.get('title', '') + ' ' + post.get('selftext', '')).lower()
+
+
+def substring_pass(text, sets):
+    """What the scraper and report steps did before: one `in` scan per phrase, per set"""
+    return {name for name, phrases in sets.items() if any(phrase in text for phrase in phrases)}
+
+
+def automaton_pass(text, matcher):
+    matches = matcher.scan(text)
+    return {name for name in matcher.keyword_sets if matches.has(name)}
+
+
+def slice_scan_brand_scores(full_text):
+    """get_primary_brand's mention scoring before the mention index (slice per character)"""
+    scores = {}
+    for brand, patterns in PRIMARY_BRAND_PATTERNS.items():
+        mention_count = 0
+        context_score = 0
+        for pattern in patterns:
+            mention_count += full_text.count(pattern)
+            positions = [i for i in range(len(full_text)) if full_text[i:i+len(pattern)] == pattern]
+            for pos in positions:
+                context = full_text[max(0, pos-100):min(len(full_text), pos+len(pattern)+100)]
+                for phrase in CUSTOMER_DISCUSSION_PHRASES:
+                    if phrase in context:
+                        context_score += 1
+        if mention_count > 0:
+            scores[brand] = (mention_count, context_score)
+    return scores
+
+
+def indexed_brand_scores(full_text):
+    """get_primary_brand's mention scoring with one scan + MentionIndex"""
+    mentions = MentionIndex(shared_matcher().scan(full_text), PRIMARY_BRAND_PATTERNS)
+    scores = {}
+    for brand in PRIMARY_BRAND_PATTERNS:
+        mention_count = mentions.mention_count(brand)
+        if mention_count > 0:
+            scores[brand] = (mention_count, mentions.context_score(brand))
+    return scores
+
+
+def time_per_post(texts, func, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in texts:
+            func(text)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best / max(len(texts), 1)
+
+
+def run_scaling(texts, repeat):
+    """Mention scoring time as post length grows (archived text concatenated to length)"""
+    corpus = ' '.join(text for text in texts if text.strip())
+    print(f"\nMENTION SCORING SCALING")
+    print(f"{'Length':<8} | {'Slice scan':<14} | {'Mention index':<13} | {'Speedup':<7}")
+    print("-" * 54)
+    for length in SCALING_LENGTHS:
+        offsets = range(0, max(len(corpus) - length, 1), max(len(corpus) // 20, 1))
+        samples = [corpus[start:start + length] for start in offsets][:20]
+        for sample in samples:
+            if slice_scan_brand_scores(sample) != indexed_brand_scores(sample):
+                raise SystemExit(f"Mention score mismatch at length {length}")
+        sliced = time_per_post(samples, slice_scan_brand_scores, repeat)
+        indexed = time_per_post(samples, indexed_brand_scores, repeat)
+        print(f"{length:<8} | {sliced * 1e3:>11.2f} ms | {indexed * 1e3:>10.2f} ms | {sliced / indexed:>6.1f}x")
+    print("-" * 54)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the shared keyword matcher against substring loops")
+    parser.add_argument('--raw-dir', default=RAW_DATA_DIR, help='Directory of archived raw_/filtered_ snapshots')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing runs (best is reported)')
+    parser.add_argument('--scaling', action='store_true', help='Also benchmark mention scoring against post length')
+    args = parser.parse_args()
+
+    posts = load_archived_posts(args.raw_dir)
+    if not posts:
+        print(f"No archived posts found in {args.raw_dir}")
+        return
+    texts = [post_text(post) for post in posts]
+    sets = {name: [phrase.lower() for phrase in phrases] for name, phrases in keyword_sets().items()}
+    phrase_count = sum(len(phrases) for phrases in sets.values())
+
+    matchers = [KeywordMatcher(sets, use_c=False)]
+    if matchers[0].engine != KeywordMatcher(sets).engine:
+        matchers.append(KeywordMatcher(sets))
+
+    # Correctness first: every set must be found in exactly the same posts
+    for matcher in matchers:
+        for text in texts:
+            expected = substring_pass(text, sets)
+            actual = automaton_pass(text, matcher)
+            if expected != actual:
+                raise SystemExit(f"Mismatch ({matcher.engine}): {sorted(expected ^ actual)} in {text[:80]!r}")
+
+    avg_chars = sum(len(text) for text in texts) / len(texts)
+    print(f"KEYWORD MATCHING BENCHMARK")
+    print(f"{len(texts)} archived posts (avg {avg_chars:.0f} chars), {len(sets)} keyword sets, {phrase_count} phrases")
+    print(f"{'Method':<26} | {'Per post':<10} | {'Speedup':<7}")
+    print("-" * 50)
+
+    baseline = time_per_post(texts, lambda text: substring_pass(text, sets), args.repeat)
+    print(f"{'substring loops':<26} | {baseline * 1e6:>7.1f} us | {1.0:>6.2f}x")
+    for matcher in matchers:
+        elapsed = time_per_post(texts, lambda text: automaton_pass(text, matcher), args.repeat)
+        print(f"{'automaton (' + matcher.engine + ')':<26} | {elapsed * 1e6:>7.1f} us | {baseline / elapsed:>6.2f}x")
+    print("-" * 50)
+    print("All keyword sets matched identically")
+
+    if args.scaling:
+        run_scaling(texts, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+End-to-End Scraper Benchmark (offline)
+Runs scrape_weekly_data against standin_server.py replaying a recorded fixture
+set, once per worker count, and reports fetch wall-clock, retries/faults seen
+by the server and posts found - deterministic for a given fixture set and seed
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+import accurate_scraper
+from rate_limiter import HostRateLimiter
+from reddit_fixtures import FixtureSet
+from standin_server import StandinServer, StandinConfig
+
+
+def run_scrape(server, fixtures, workers, api, unthrottled, seed, verbose):
+    """One full scrape against the stand-in; returns (data, elapsed seconds, server stats delta)"""
+    # accurate_scraper reads these module-level settings (from config) at call time
+    accurate_scraper.REDDIT_STANDIN_URL = server.url
+    accurate_scraper.HTTP_CACHE_ENABLED = False
+    accurate_scraper.INCREMENTAL_SCRAPE = False
+    accurate_scraper.SENTIMENT_CACHE_ENABLED = False
+    accurate_scraper.WORKING_NDJSON = False
+    accurate_scraper.SCRAPE_MAX_WORKERS = workers
+    accurate_scraper.REDDIT_CLIENT_ID = 'standin' if api else None
+    accurate_scraper.REDDIT_CLIENT_SECRET = 'standin' if api else None
+
+    random.seed(seed)  # generate_sample_data fills sources the fixtures do not cover
+    before = server.stats()
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output) if not verbose else contextlib.nullcontext():
+        scraper = accurate_scraper.AccurateScraper()
+        if unthrottled:
+            scraper.rate_limiter = HostRateLimiter(limits={}, default=(1000.0, 1000))
+        started = time.perf_counter()
+        data = scraper.scrape_weekly_data(now=fixtures.recorded_at)
+        elapsed = time.perf_counter() - started
+    after = server.stats()
+    return data, elapsed, {name: after.get(name, 0) - before.get(name, 0) for name in after}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper offline against recorded fixtures")
+    parser.add_argument('--fixtures', required=True, help='Fixture directory (reports/fixtures/<name>)')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8], help='SCRAPE_MAX_WORKERS values to compare')
+    parser.add_argument('--api', action='store_true', help='Scrape through PRAW (API listings) instead of web pages')
+    parser.add_argument('--unthrottled', action='store_true', help='Disable the per-host token buckets')
+    parser.add_argument('--latency', type=float, default=0.2, help='Stand-in seconds per response')
+    parser.add_argument('--jitter', type=float, default=0.1, help='Stand-in extra seconds per response (max)')
+    parser.add_argument('--host-latency', action='append', default=[], metavar='HOST=SECONDS',
+                        help='Latency override for one host, e.g. old.reddit.com=3')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of requests answered 503')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Share of requests answered 429')
+    parser.add_argument('--max-rps', type=float, default=0, help='Per-host requests/sec before 429s (0 = off)')
+    parser.add_argument('--quota', type=int, default=0, help='Per-host requests per quota window (0 = off)')
+    parser.add_argument('--quota-window', type=int, default=600, help='Quota window in seconds')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--verbose', action='store_true', help='Show the scraper output')
+    args = parser.parse_args()
+
+    fixtures = FixtureSet(args.fixtures)
+    host_latency = {host: float(seconds) for host, seconds in (item.split('=', 1) for item in args.host_latency)}
+    config = StandinConfig(args.latency, args.jitter, args.error_rate, args.rate_limit_rate,
+                           args.max_rps, host_latency, args.seed, args.quota, args.quota_window)
+    server = StandinServer(fixtures, config, ('127.0.0.1', 0)).start()
+
+    print(f"SCRAPER BENCHMARK ({len(fixtures.entries)} recorded responses, as of {fixtures.recorded_at}, "
+          f"{'API' if args.api else 'web'} path)")
+    print(f"{'Workers':<7} | {'Fetch':<7} | {'Total':<7} | {'Requests':<8} | {'429s':<5} | {'503s':<5} | {'Unrecorded':<10} | {'Posts':<5}")
+    print("-" * 80)
+    for workers in args.workers:
+        data, elapsed, stats = run_scrape(server, fixtures, workers, args.api, args.unthrottled, args.seed, args.verbose)
+        fetch = data['fetch_stats']['wall_clock_seconds']
+        print(f"{workers:<7} | {fetch:>6.1f}s | {elapsed:>6.1f}s | {stats.get('requests', 0):>8} | "
+              f"{stats.get('rate_limited', 0):>5} | {stats.get('errors', 0):>5} | {stats.get('misses', 0):>10} | {data['total_posts']:>5}")
+    print("-" * 80)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Sentiment Engine Benchmark
+Replays archived posts from reports/raw through every sentiment engine and
+reports throughput (posts/sec) and how often each engine agrees with the
+archived labels and with the dual-model engine, to pick a speed/quality trade-off
+"""
+
+import argparse
+import time
+
+from accurate_scraper import AccurateScraper
+from benchmark_keywords import load_archived_posts
+from config import RAW_DATA_DIR
+from sentiment_engines import ENGINES
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sentiment engines on archived posts")
+    parser.add_argument('--raw-dir', default=RAW_DATA_DIR, help='Directory of archived raw_/filtered_ snapshots')
+    parser.add_argument('--engines', nargs='+', default=list(ENGINES), choices=list(ENGINES), help='Engines to compare')
+    args = parser.parse_args()
+
+    posts = [dict(post, selftext=post.get('selftext', '')) for post in load_archived_posts(args.raw_dir)]
+    if not posts:
+        print(f"No archived posts found in {args.raw_dir}")
+        return
+
+    # Primary brand does not depend on the engine - resolve it once up front
+    scorer = AccurateScraper(analysis_only=True, sentiment_engine='dual')
+    inputs = []
+    for post in posts:
+        text = post['title'] + " " + post['selftext']
+        inputs.append((text, post['title'], scorer.get_primary_brand(post)))
+
+    labels = {}
+    timings = {}
+    for name in dict.fromkeys(['dual'] + args.engines):
+        engine_scorer = AccurateScraper(analysis_only=True, sentiment_engine=name)
+        engine_scorer.analyze_sentiment('Warm up: I tried my box and loved it')
+        started = time.perf_counter()
+        labels[name] = [
+            engine_scorer.analyze_sentiment(text, title_only=title, primary_brand=primary_brand)['sentiment']
+            for text, title, primary_brand in inputs
+        ]
+        timings[name] = time.perf_counter() - started
+
+    archived = [post.get('sentiment') for post in posts]
+    labelled = [i for i, label in enumerate(archived) if label]
+
+    print(f"SENTIMENT ENGINE BENCHMARK ({len(posts)} archived posts)")
+    print(f"{'Engine':<8} | {'Posts/sec':<9} | {'vs archived':<11} | {'vs dual':<7} | {'Pos/Neg/Neu':<15}")
+    print("-" * 64)
+    for name in args.engines:
+        engine_labels = labels[name]
+        vs_archived = sum(engine_labels[i] == archived[i] for i in labelled) / len(labelled) if labelled else 0.0
+        vs_dual = sum(a == b for a, b in zip(engine_labels, labels['dual'])) / len(posts)
+        mix = '/'.join(str(engine_labels.count(s)) for s in ['positive', 'negative', 'neutral'])
+        print(f"{name:<8} | {len(posts) / timings[name]:>9.0f} | {vs_archived:>10.1%} | {vs_dual:>6.1%} | {mix:<15}")
+    print("-" * 64)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Web Listing Parse Benchmark
+Parses the listing pages in a recorded fixture set (reddit_fixtures.py) with
+the old old.reddit.com HTML parser (BeautifulSoup) and as .json listings
+(with every installed data_codec codec), and reports parse time per page and
+per post plus how many posts come with self-text
+"""
+
+import argparse
+import time
+
+import data_codec
+import web_listings
+from reddit_fixtures import FixtureSet, API_HOST
+
+
+def recorded_pages(fixtures):
+    """(HTML bodies, JSON bodies) of the successful listing responses in a fixture set
+
+    JSON pages are the web fallback's .json listings, or the API listings when
+    none were recorded (same format).
+    """
+    html, web_json, api_json = [], [], []
+    for key, entry in sorted(fixtures.entries.items()):
+        if entry['status'] != 200:
+            continue
+        _, _, body = fixtures.lookup(key)
+        path = key.split('?', 1)[0]
+        if key.startswith('old.reddit.com') and 'html' in entry['content_type']:
+            html.append(body)
+        elif key.startswith(API_HOST):
+            api_json.append(body)
+        elif path.endswith('.json'):
+            web_json.append(body)
+    return html, web_json or api_json
+
+
+def time_pages(pages, parse, repeat):
+    """(best seconds for one pass over pages, posts parsed per pass)"""
+    best = None
+    posts = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        posts = [post for page in pages for post in parse(page)]
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, posts
+
+
+def json_parser(codec):
+    """parse_json_listing decoding with the given data_codec codec"""
+    def parse(body):
+        previous, data_codec.CODEC = data_codec.CODEC, codec
+        try:
+            return web_listings.parse_json_listing(body)[0]
+        finally:
+            data_codec.CODEC = previous
+    return parse
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML vs JSON parsing of recorded listing pages")
+    parser.add_argument('--fixtures', required=True, help='Fixture directory (reports/fixtures/<name>)')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing runs (best is reported)')
+    args = parser.parse_args()
+
+    html_pages, json_pages = recorded_pages(FixtureSet(args.fixtures))
+    if not html_pages and not json_pages:
+        raise SystemExit(f"No recorded listing pages in {args.fixtures}")
+
+    parsers = [('HTML (bs4)', html_pages, lambda body: web_listings.parse_html_listing(body, 0.0))]
+    for codec in reversed(data_codec.available_codecs()):
+        parsers.append((f"JSON ({codec})", json_pages, json_parser(codec)))
+
+    print(f"WEB LISTING PARSE ({len(html_pages)} HTML pages, {len(json_pages)} JSON pages, best of {args.repeat})")
+    print(f"{'Parser':<14} | {'KB/page':<7} | {'Posts':<6} | {'ms/page':<8} | {'us/post':<8} | {'Self-text':<9}")
+    print("-" * 68)
+    for name, pages, parse in parsers:
+        if not pages:
+            continue
+        seconds, posts = time_pages(pages, parse, args.repeat)
+        kb = sum(len(page) for page in pages) / len(pages) / 1024
+        with_text = sum(1 for post in posts if post['selftext'])
+        print(f"{name:<14} | {kb:>7.0f} | {len(posts):>6} | {seconds / len(pages) * 1e3:>8.2f} | "
+              f"{seconds / max(len(posts), 1) * 1e6:>8.1f} | {with_text / max(len(posts), 1):>8.0%}")
+    print("-" * 68)
+
+
+if __name__ == "__main__":
+    main()
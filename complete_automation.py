@@ -13,6 +13,8 @@ import logging
 from collections import defaultdict
 import argparse
 from config import *
+import artifacts
+import data_codec
 
 # Configure logging
 logging.basicConfig(
@@ -164,51 +166,41 @@ def run_pipeline(send_email=False, email_recipients=None):
         log_and_print("[SUCCESS] Scraper completed - data saved to working_reddit_data.json")
         
         # Load data for validation
-        with open(WORKING_DATA_FILE, 'r') as f:
-            data = json.load(f)
+        data = artifacts.load(WORKING_DATA_FILE)
         
         # Step 2: Generate filtered, metadata files
         log_and_print("\n[STEP 2] Processing raw data...")
         timestamp = datetime.now().strftime('%Y-%m-%d')
         
-        # Create filtered dataset (same as raw for now)
-        filtered_data = data.copy()
+        # Filtered dataset (same as raw for now): another reference to the scraper's artifact
         filtered_file = f'{RAW_DATA_DIR}/filtered_{timestamp}.json'
         os.makedirs(RAW_DATA_DIR, exist_ok=True)
-        with open(filtered_file, 'w') as f:
-            json.dump(filtered_data, f, indent=2)
-        
-        # Extract filter stats from the data (if available)
-        filter_stats = {}
-        for brand in ALL_COMPETITORS:
-            filter_stats[brand] = {
-                'pre_filter': 0,
-                'post_filter': 0
-            }
-            for post in filtered_data.get('posts', []):
-                if brand in post.get('competitors_mentioned', []):
-                    filter_stats[brand]['post_filter'] += 1
-        
-        # Create metadata
-        metadata = {
-            'processing_timestamp': datetime.now(timezone.utc).isoformat(),
-            'total_posts': len(filtered_data.get('posts', [])),
-            'date_range': filtered_data.get('date_range', {}),
-            'brands_analyzed': ALL_COMPETITORS,
-            'data_sources': WEEKLY_LINKS,
-            'validation_status': 'pending',
-            'commit_hash': get_git_commit_hash(),
-            'filter_stats': filter_stats
-        }
+        artifacts.link(WORKING_DATA_FILE, filtered_file)
         
+        # Metadata: the scraper's (it has the real pre/post filter counts), written
+        # once below with the validation result
         metadata_file = f'{RAW_DATA_DIR}/metadata_{timestamp}.json'
-        with open(metadata_file, 'w') as f:
-            json.dump(metadata, f, indent=2)
-        
-        # Also copy raw file with timestamp
-        raw_file = f'{RAW_DATA_DIR}/raw_{timestamp}.json'
-        with open(raw_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        if os.path.exists(metadata_file):
+            metadata = data_codec.load(metadata_file)
+        else:
+            filter_stats = {}
+            for brand in ALL_COMPETITORS:
+                filter_stats[brand] = {
+                    'pre_filter': 0,
+                    'post_filter': 0
+                }
+                for post in data.get('posts', []):
+                    if brand in post.get('competitors_mentioned', []):
+                        filter_stats[brand]['post_filter'] += 1
+            metadata = {
+                'processing_timestamp': datetime.now(timezone.utc).isoformat(),
+                'total_posts': len(data.get('posts', [])),
+                'date_range': data.get('date_range', {}),
+                'brands_analyzed': ALL_COMPETITORS,
+                'data_sources': WEEKLY_LINKS,
+                'filter_stats': filter_stats
+            }
+        metadata['commit_hash'] = get_git_commit_hash()
         
         log_and_print(f"[SUCCESS] Raw data processing complete - files saved with {timestamp}")
         
@@ -247,8 +239,7 @@ def run_pipeline(send_email=False, email_recipients=None):
             # Update metadata with failure
             metadata['validation_status'] = 'failed'
             metadata['validation_errors'] = validation_errors
-            with open(metadata_file, 'w') as f:
-                json.dump(metadata, f, indent=2)
+            data_codec.dump(metadata_file, metadata)
             
             return False
         
@@ -256,8 +247,7 @@ def run_pipeline(send_email=False, email_recipients=None):
         
         # Update metadata with success
         metadata['validation_status'] = 'passed'
-        with open(metadata_file, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        data_codec.dump(metadata_file, metadata)
         
         # Step 6: Archive artifacts
         log_and_print("\n[STEP 6] Archiving artifacts...")
@@ -272,6 +262,19 @@ def run_pipeline(send_email=False, email_recipients=None):
         
         log_and_print(f"[SUCCESS] Artifacts archived to {archive_dir}")
         
+        # Pack past weeks so the repo (and every CI clone) stops growing by a full day per run
+        if ARCHIVE_COMPACTION:
+            try:
+                import archive_pack
+                packed = archive_pack.compact()
+                if packed:
+                    loose = sum(loose_bytes for _, loose_bytes, _ in packed) / 1024
+                    size = sum(packed_bytes for _, _, packed_bytes in packed) / 1024
+                    log_and_print(f"[SUCCESS] Packed {len(packed)} past weeks into {ARCHIVE_PACK_DIR} "
+                                  f"({loose:.0f} KB -> {size:.0f} KB)")
+            except Exception as e:
+                log_and_print(f"[WARNING] Archive compaction failed (loose files kept): {e}", "WARNING")
+        
         # Step 7: Update homepage with current data
         log_and_print("\n[STEP 7] Updating homepage with current data...")
         try:
@@ -291,8 +294,7 @@ def run_pipeline(send_email=False, email_recipients=None):
             # Load metadata to get processing timestamp
             metadata_file = f'reports/raw/metadata_{datetime.now().strftime("%Y-%m-%d")}.json'
             if os.path.exists(metadata_file):
-                with open(metadata_file, 'r') as f:
-                    metadata = json.load(f)
+                metadata = data_codec.load(metadata_file)
                 
                 # Generate BUILD_TOKEN from processing timestamp
                 processing_timestamp = metadata.get('processing_timestamp', datetime.now(timezone.utc).isoformat())
@@ -325,9 +327,8 @@ def run_pipeline(send_email=False, email_recipients=None):
                 metadata_files = [f for f in os.listdir('reports/raw') if f.startswith('metadata_')]
                 if metadata_files:
                     latest_metadata = max(metadata_files)
-                    with open(f'reports/raw/{latest_metadata}', 'r') as f:
-                        metadata = json.load(f)
-                        date_range = metadata.get('date_range', {})
+                    metadata = data_codec.load(f'reports/raw/{latest_metadata}')
+                    date_range = metadata.get('date_range', {})
                 else:
                     date_range = {}
                 
@@ -93,9 +93,117 @@ CHART_OUTPUT = "reports/step1_chart.png"
 
 # File Paths
 WORKING_DATA_FILE = "reports/working_reddit_data.json"
+WORKING_POSTS_FILE = "reports/working_posts.ndjson"  # Same dataset as NDJSON (post_ndjson.py)
 AUTOMATION_LOG = "automation.log"
 
 # Analysis Configuration
 STEP2_OUTPUT = "reports/step2_ACTIONABLE_analysis_LATEST.html"
 ARCHIVE_DIR = "reports/archive"
-RAW_DATA_DIR = "reports/raw"
\ No newline at end of file
+RAW_DATA_DIR = "reports/raw"
+
+# Fetch Concurrency Configuration
+SCRAPE_MAX_WORKERS = int(os.getenv('SCRAPE_MAX_WORKERS', '8'))  # Sources fetched in parallel
+
+# Per-host token buckets: host -> (requests per second, burst size)
+# Replaces the old fixed time.sleep(1) after every source
+HOST_RATE_LIMITS = {
+    'old.reddit.com': (1.0, 2),
+    'www.reddit.com': (1.0, 2),
+    'oauth.reddit.com': (1.0, 4)  # PRAW / OAuth API
+}
+DEFAULT_HOST_RATE_LIMIT = (1.0, 1)
+
+# Adaptive rate limiting: once Reddit reports a host's quota (X-Ratelimit-* headers or
+# PRAW's reddit.auth.limits), its bucket spreads the remaining requests over the reset window
+ADAPTIVE_RATE_LIMIT = os.getenv('ADAPTIVE_RATE_LIMIT', '1') != '0'
+RATE_LIMIT_RESERVE = 5  # Requests per window held back (other clients sharing the quota)
+RATE_LIMIT_MIN_RATE = 0.05  # Requests/sec floor while quota remains
+RATE_LIMIT_MAX_RATE = 10.0  # Requests/sec ceiling however much quota is left
+
+# HTTP Session Pool Configuration (keep-alive connections shared across fetch threads)
+HTTP_POOL_CONNECTIONS = 4  # Number of per-host pools to keep (old/www/oauth reddit)
+HTTP_POOL_MAXSIZE = SCRAPE_MAX_WORKERS * 2  # Keep-alive connections per host (every fetch thread plus its hedge)
+
+# HTTP Cache Configuration (on-disk, conditional revalidation for web scraping)
+HTTP_CACHE_ENABLED = os.getenv('HTTP_CACHE_ENABLED', '1') != '0'
+HTTP_CACHE_DIR = "reports/cache/http"
+HTTP_CACHE_TTL_SECONDS = 3600  # Served without revalidation for 1 hour
+HTTP_CACHE_MAX_BYTES = 200 * 1024 * 1024  # Evict oldest entries beyond 200 MB
+HTTP_CACHE_MAX_AGE_DAYS = 7  # Evict entries older than a week
+
+# Incremental Scraping (per-source high-water marks)
+INCREMENTAL_SCRAPE = os.getenv('INCREMENTAL_SCRAPE', '1') != '0'
+INCREMENTAL_STATE_FILE = "reports/state/source_state.json"
+INCREMENTAL_RETENTION_DAYS = 8  # Stored window kept per source (covers the 7-day window)
+
+# Paginated PRAW Listings (walk new-sorted pages until posts predate the window)
+LISTING_PAGE_SIZE = 100  # Reddit's maximum per request
+LISTING_MAX_PAGES = 10  # Reddit listings stop at ~1000 items anyway
+
+# Web Fallback without API credentials (public .json listings, paged like the API;
+# old.reddit.com HTML only when the .json endpoint fails or returns something else)
+WEB_JSON_LISTINGS = os.getenv('WEB_JSON_LISTINGS', '1') != '0'
+WEB_JSON_HOST = 'www.reddit.com'  # Hedged requests race old.reddit.com
+
+# Query Planner (merge overlapping WEEKLY_LINKS sources before scraping)
+QUERY_PLANNER_ENABLED = os.getenv('QUERY_PLANNER', '1') != '0'
+QUERY_PLANNER_MERGE_GLOBAL = False  # Combine different brands' global searches into OR queries
+QUERY_MAX_BRANDS_PER_FETCH = 3  # Brands sharing one OR query (one relevance page leaves ~8 results each)
+QUERY_MAX_LENGTH = 512  # Reddit search query length limit
+
+# Sentiment Result Cache (SQLite, keyed by content hash + primary brand + ruleset version)
+SENTIMENT_CACHE_ENABLED = os.getenv('SENTIMENT_CACHE_ENABLED', '1') != '0'
+SENTIMENT_CACHE_FILE = "reports/cache/sentiment.sqlite3"
+SENTIMENT_CACHE_MAX_ENTRIES = 200000  # Least recently used results evicted beyond this
+
+# Batch Sentiment Scoring (analysis deferred until after fetch + dedupe; the process
+# pool is for batch_scoring.py re-scoring - the scraper's stream batches are scored inline)
+BATCH_SCORING = os.getenv('BATCH_SCORING', '1') != '0'
+BATCH_SCORING_WORKERS = int(os.getenv('BATCH_SCORING_WORKERS', '0'))  # 0 = one per CPU
+BATCH_SCORING_MIN_POSTS = 200  # Smaller batches are scored inline (pool startup costs more)
+BATCH_SCORING_MAX_CHUNK = 250  # Posts per task sent to a worker
+
+# Sentiment Engine: 'dual' (VADER + TextBlob), 'vader' (VADER only) or 'rules' (models only when no keyword rule fires)
+SENTIMENT_ENGINE = os.getenv('SENTIMENT_ENGINE', 'dual')
+
+# Streaming Pipeline (fetch -> dedupe -> filter -> analysis threads joined by bounded queues)
+STREAM_QUEUE_SIZE = 500  # Posts buffered between two stages before the upstream stage waits
+STREAM_ANALYSIS_BATCH = 20  # Posts scored (inline) per batch; weekly runs keep ~25-40 posts, so larger batches wait for the last fetch
+
+# Hedged Web Requests (race old.reddit.com / www.reddit.com when the primary is slow)
+HEDGED_REQUESTS = os.getenv('HEDGED_REQUESTS', '1') != '0'
+HEDGE_PERCENTILE = 95  # Hedge once the primary is slower than this percentile of its host's latency
+HEDGE_MIN_SAMPLES = 5  # Fewer timed requests than this on a host -> HEDGE_DEFAULT_DELAY
+HEDGE_DEFAULT_DELAY = 2.0  # Seconds
+HEDGE_MIN_DELAY = 0.25  # Never hedge sooner (fast hosts would double every request)
+HEDGE_MAX_DELAY = 5.0  # Never wait longer on a stalled host
+
+# Offline Replay (reddit_fixtures.py records pages, standin_server.py replays them)
+FIXTURE_DIR = "reports/fixtures"
+REDDIT_STANDIN_URL = os.getenv('REDDIT_STANDIN_URL')  # e.g. http://127.0.0.1:8765 - web + API requests go here instead
+
+# Historical Post Store (SQLite; every scraped post upserted by Reddit ID - post_store.py --import loads reports/raw)
+POST_STORE_ENABLED = os.getenv('POST_STORE', '1') != '0'
+POST_STORE_FILE = "reports/store/posts.sqlite3"  # Gitignored; rebuilt from the archive when missing
+# Steps 1-3 report on this window from the post store instead of WORKING_DATA_FILE when set (ISO dates, UTC)
+REPORT_WINDOW_START = os.getenv('REPORT_WINDOW_START')
+REPORT_WINDOW_END = os.getenv('REPORT_WINDOW_END')  # Default: now
+
+# Content-Addressed Artifacts (each run's dataset is written once to ARTIFACT_DIR/<sha256>.json.gz;
+# raw_/filtered_ snapshots and WORKING_DATA_FILE are small references to it)
+ARTIFACT_DIR = "reports/objects"
+ARTIFACT_COMPRESSION = os.getenv('ARTIFACT_COMPRESSION', 'gzip')  # 'gzip' or 'none'
+
+# Packed Archive (archive_pack.py: reports/raw + reports/archive days older than ARCHIVE_KEEP_DAYS are packed
+# into one compressed NDJSON file per ISO week under ARCHIVE_PACK_DIR, indexed by manifest.json)
+ARCHIVE_COMPACTION = os.getenv('ARCHIVE_COMPACTION', '1') != '0'  # complete_automation packs before committing
+ARCHIVE_PACK_DIR = "reports/packed"
+ARCHIVE_PACK_CODEC = os.getenv('ARCHIVE_PACK_CODEC', 'zstd')  # 'zstd' (gzip when zstandard is not installed) or 'gzip'
+ARCHIVE_KEEP_DAYS = 14  # Days left loose (this report week and the one before)
+
+# JSON Codec (data_codec.py - every dataset/metadata read and write goes through it)
+JSON_CODEC = os.getenv('JSON_CODEC', 'auto')  # 'auto' (orjson, then msgspec, then json), 'orjson', 'msgspec' or 'json'
+
+# NDJSON Working Posts (the scraper appends each post to WORKING_POSTS_FILE as it leaves analysis;
+# steps 1-3 stream posts from it instead of loading the whole working dataset)
+WORKING_NDJSON = os.getenv('WORKING_NDJSON', '1') != '0'
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Shared JSON Codec
+Every dataset, reference, metadata file and stored post is encoded and decoded
+here, with the fastest codec installed: orjson, then msgspec, then the json
+module (JSON_CODEC forces one). Output is compact unless pretty=True is asked
+for. decode_posts() gives typed Post records instead of dicts.
+"""
+
+import json
+from dataclasses import dataclass, field, fields, asdict
+from typing import List, Optional
+
+try:
+    import orjson  # optional: C encoder/decoder, several times faster than json
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec  # optional: C encoder/decoder
+except ImportError:
+    msgspec = None
+
+from config import JSON_CODEC
+
+CODECS = ['orjson', 'msgspec', 'json']
+
+
+def available_codecs():
+    return [name for name, module in zip(CODECS, [orjson, msgspec, json]) if module is not None]
+
+
+def resolve_codec(name=JSON_CODEC):
+    """The codec to use for name ('auto' = fastest installed)"""
+    available = available_codecs()
+    if name in (None, '', 'auto'):
+        return available[0]
+    if name not in available:
+        print(f"[WARNING] JSON_CODEC={name} is not installed - using {available[0]}")
+        return available[0]
+    return name
+
+
+CODEC = resolve_codec()
+
+
+def dumps(data, pretty=False):
+    """UTF-8 JSON bytes: compact, or indented by 2 when pretty"""
+    if CODEC == 'orjson':
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0))
+    if CODEC == 'msgspec':
+        body = msgspec.json.encode(data)
+        return msgspec.json.format(body, indent=2) if pretty else body
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def loads(body):
+    """Data from JSON bytes or str (invalid JSON raises ValueError, whichever codec)"""
+    if CODEC == 'orjson':
+        return orjson.loads(body)
+    if CODEC == 'msgspec':
+        try:
+            return msgspec.json.decode(body)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+    return json.loads(body)
+
+
+def load(path):
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def dump(path, data, pretty=False):
+    with open(path, 'wb') as f:
+        f.write(dumps(data, pretty))
+
+
+@dataclass
+class Post:
+    """A scraped post, as accurate_scraper writes it (fields it does not know are dropped)"""
+    post_id: Optional[str] = None  # t3_ fullname, the dedupe key (post_index.canonical_post_id)
+    title: str = ''
+    selftext: str = ''
+    score: int = 0
+    num_comments: int = 0
+    subreddit: str = ''
+    url: str = ''
+    created_utc: float = 0.0
+    competitors_mentioned: List[str] = field(default_factory=list)
+    author: str = ''
+    upvote_ratio: float = 0.0
+    is_self: bool = False
+    source_brand: Optional[str] = None
+    source_url: Optional[str] = None
+    primary_brand: Optional[str] = None
+    sentiment: Optional[str] = None
+    confidence: float = 0.0
+    reasoning: str = ''
+
+    @classmethod
+    def from_dict(cls, post):
+        return cls(**{name: post[name] for name in POST_FIELDS if name in post})
+
+    def to_dict(self):
+        return asdict(self)
+
+
+POST_FIELDS = [f.name for f in fields(Post)]
+
+
+def decode_posts(body):
+    """Typed Post records from a dataset's JSON bytes (decoded with the active codec)"""
+    return [Post.from_dict(post) for post in loads(body).get('posts', [])]
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Hedged Requests for old.reddit.com / www.reddit.com
+If the primary host has not answered within a percentile of its own recent
+latency, the same page is requested from the alternate host and whichever
+usable response arrives first wins. Per-host latency histograms set the delay.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
+
+from config import (HEDGE_PERCENTILE, HEDGE_MIN_SAMPLES, HEDGE_DEFAULT_DELAY,
+                    HEDGE_MIN_DELAY, HEDGE_MAX_DELAY, SCRAPE_MAX_WORKERS)
+
+# Hosts serving the same listings
+ALTERNATE_HOSTS = {
+    'old.reddit.com': 'www.reddit.com',
+    'www.reddit.com': 'old.reddit.com'
+}
+
+
+def alternate_url(url):
+    """The same URL on the alternate Reddit host, or None"""
+    parsed = urlparse(url)
+    host = ALTERNATE_HOSTS.get(parsed.netloc)
+    return parsed._replace(netloc=host).geturl() if host else None
+
+
+class LatencyHistogram:
+    """Log-spaced latency buckets from 10ms to ~60s (each bound 25% above the last)"""
+
+    BOUNDS = [0.01 * 1.25 ** i for i in range(40)]
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS) + 1)  # last bucket: slower than every bound
+        self.total = 0
+        self.lock = threading.Lock()
+
+    def observe(self, seconds):
+        index = next((i for i, bound in enumerate(self.BOUNDS) if seconds <= bound), len(self.BOUNDS))
+        with self.lock:
+            self.counts[index] += 1
+            self.total += 1
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile (seconds), or None if empty"""
+        with self.lock:
+            counts = list(self.counts)
+            total = self.total
+        if not total:
+            return None
+        rank = total * p / 100.0
+        seen = 0
+        for i, count in enumerate(counts):
+            seen += count
+            if seen >= rank:
+                return self.BOUNDS[min(i, len(self.BOUNDS) - 1)]
+        return self.BOUNDS[-1]
+
+
+class HedgedRequester:
+    """Races a slow primary request against the alternate host
+
+    histograms maps host -> LatencyHistogram (SessionPool.histograms); the
+    hedge delay is that host's HEDGE_PERCENTILE latency, clamped to
+    [HEDGE_MIN_DELAY, HEDGE_MAX_DELAY]. A primary that fails outright is hedged
+    immediately.
+    """
+
+    def __init__(self, histograms, percentile=None, max_workers=None):
+        self.histograms = histograms
+        self.percentile = percentile or HEDGE_PERCENTILE
+        self.pool = ThreadPoolExecutor(max_workers=max_workers or SCRAPE_MAX_WORKERS * 2,
+                                       thread_name_prefix='hedge')
+        self.lock = threading.Lock()
+        self.counts = {'requests': 0, 'hedged': 0, 'primary_wins': 0, 'alternate_wins': 0, 'failed': 0}
+
+    def _count(self, name):
+        with self.lock:
+            self.counts[name] += 1
+
+    def delay(self, host):
+        """Seconds to wait on host before hedging"""
+        histogram = self.histograms.get(host)
+        if histogram is None or histogram.total < HEDGE_MIN_SAMPLES:
+            return HEDGE_DEFAULT_DELAY
+        return min(HEDGE_MAX_DELAY, max(HEDGE_MIN_DELAY, histogram.percentile(self.percentile)))
+
+    def get(self, url, fetch, accept=None, sent=None):
+        """fetch(url), hedged to the alternate host; returns the winning response
+
+        fetch raises on failure (e.g. via raise_for_status). accept(response)
+        rejects responses that arrived but are unusable; if nothing is
+        accepted, the primary's response is returned (or its error raised).
+        sent: optional threading.Event fetch sets once the primary request goes
+        out, so time spent queued on a local rate limiter does not count.
+        """
+        self._count('requests')
+        accept = accept or (lambda response: True)
+        alternate = alternate_url(url)
+        primary = self.pool.submit(fetch, url)
+        if alternate is None:
+            return primary.result()
+
+        if sent is not None:
+            primary.add_done_callback(lambda _: sent.set())
+            sent.wait()
+        done, _ = wait([primary], timeout=self.delay(urlparse(url).netloc))
+        if done and primary.exception() is None and accept(primary.result()):
+            self._count('primary_wins')
+            return primary.result()
+
+        # Primary is slow, failed or unusable - race the alternate host
+        self._count('hedged')
+        hedge = self.pool.submit(fetch, alternate)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None and accept(future.result()):
+                    self._count('primary_wins' if future is primary else 'alternate_wins')
+                    return future.result()
+
+        if primary.exception() is None:
+            self._count('primary_wins')
+            return primary.result()
+        if hedge.exception() is None:
+            self._count('alternate_wins')
+            return hedge.result()
+        self._count('failed')
+        raise primary.exception()
+
+    def stats(self):
+        """Hedge counts plus the current hedge delay per host (ms)"""
+        with self.lock:
+            stats = dict(self.counts)
+        stats['delay_ms'] = {host: round(self.delay(host) * 1000) for host in list(self.histograms)}
+        return stats
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+On-Disk Conditional HTTP Cache for Reddit Pages
+Stores bodies + validators under reports/cache/http, serves fresh entries
+without a request, revalidates stale ones with If-None-Match / If-Modified-Since,
+and evicts by total size and age
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from config import HTTP_CACHE_DIR, HTTP_CACHE_TTL_SECONDS, HTTP_CACHE_MAX_BYTES, HTTP_CACHE_MAX_AGE_DAYS
+
+# Response headers kept with the cached body
+STORED_HEADERS = ['Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Date']
+
+
+class HTTPCache:
+    """Persistent HTTP cache keyed by URL"""
+
+    def __init__(self, cache_dir=None, ttl=None, max_bytes=None, max_age_days=None, enabled=True):
+        self.cache_dir = cache_dir or HTTP_CACHE_DIR
+        self.ttl = HTTP_CACHE_TTL_SECONDS if ttl is None else ttl
+        self.max_bytes = HTTP_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.max_age = (HTTP_CACHE_MAX_AGE_DAYS if max_age_days is None else max_age_days) * 86400
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.counts = {'fresh_hits': 0, 'revalidated': 0, 'misses': 0, 'stored': 0, 'evicted': 0, 'swept': 0, 'bytes_saved': 0}
+
+        if self.enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self.evict()
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + '.json', base + '.body'
+
+    def _load(self, url):
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            return None, None
+        if meta.get('url') != url:
+            return None, None
+        return meta, body
+
+    def _store(self, url, response, stored_at):
+        cache_control = response.headers.get('Cache-Control', '').lower()
+        if response.status_code != 200 or 'no-store' in cache_control:
+            return
+
+        meta_path, body_path = self._paths(url)
+        meta = {
+            'url': url,
+            'stored_at': stored_at,
+            'size': len(response.content),
+            'headers': {h: response.headers[h] for h in STORED_HEADERS if h in response.headers}
+        }
+        # Write body first, then metadata, each atomically
+        for path, payload, mode in [(body_path, response.content, 'wb'), (meta_path, json.dumps(meta), 'w')]:
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, mode) as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+
+        with self.lock:
+            self.counts['stored'] += 1
+
+    def _touch(self, url, meta):
+        meta_path, _ = self._paths(url)
+        tmp_path = f"{meta_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    def _cached_response(self, url, meta, body):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        response.headers = CaseInsensitiveDict(meta.get('headers', {}))
+        response.url = url
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.from_cache = True
+        return response
+
+    def get(self, url, fetch, headers=None):
+        """Return a response for url, calling fetch(url, headers) only when needed
+
+        Fresh entries are returned without touching the network; stale entries
+        are revalidated with conditional headers and reused on 304.
+        """
+        if not self.enabled:
+            return fetch(url, headers)
+
+        headers = dict(headers or {})
+        meta, body = self._load(url)
+        now = time.time()
+
+        if meta is not None and now - meta['stored_at'] < self.ttl:
+            with self.lock:
+                self.counts['fresh_hits'] += 1
+                self.counts['bytes_saved'] += meta['size']
+            return self._cached_response(url, meta, body)
+
+        if meta is not None:
+            validators = meta.get('headers', {})
+            if 'ETag' in validators:
+                headers['If-None-Match'] = validators['ETag']
+            if 'Last-Modified' in validators:
+                headers['If-Modified-Since'] = validators['Last-Modified']
+
+        response = fetch(url, headers)
+
+        if response.status_code == 304 and meta is not None:
+            meta['stored_at'] = now
+            self._touch(url, meta)
+            with self.lock:
+                self.counts['revalidated'] += 1
+                self.counts['bytes_saved'] += meta['size']
+            return self._cached_response(url, meta, body)
+
+        with self.lock:
+            self.counts['misses'] += 1
+        self._store(url, response, now)
+        response.from_cache = False
+        return response
+
+    def evict(self):
+        """Drop entries older than max age, then the oldest until under max bytes
+
+        Also sweeps files no entry owns - *.tmp left by an interrupted write and
+        .body files without metadata - once they are older than the TTL.
+        """
+        if not self.enabled:
+            return 0
+        names = os.listdir(self.cache_dir)
+        self._sweep(names)
+        entries = []
+        for name in names:
+            if not name.endswith('.json'):
+                continue
+            meta_path = os.path.join(self.cache_dir, name)
+            body_path = meta_path[:-len('.json')] + '.body'
+            try:
+                with open(meta_path, 'r') as f:
+                    meta = json.load(f)
+                stored_at, size = meta['stored_at'], meta['size']
+            except (OSError, ValueError, KeyError):
+                stored_at, size = 0, 0
+            entries.append((stored_at, size, meta_path, body_path))
+
+        entries.sort()
+        total = sum(size for _, size, _, _ in entries)
+        cutoff = time.time() - self.max_age
+        evicted = 0
+
+        for stored_at, size, meta_path, body_path in entries:
+            if stored_at >= cutoff and total <= self.max_bytes:
+                break
+            for path in (meta_path, body_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            total -= size
+            evicted += 1
+
+        with self.lock:
+            self.counts['evicted'] += evicted
+        return evicted
+
+    def _sweep(self, names):
+        """Remove stray tmp files and unpaired bodies (a fresh one may be a write in progress)"""
+        present = set(names)
+        cutoff = time.time() - self.ttl
+        swept = 0
+        for name in names:
+            stray = name.endswith('.tmp') or (name.endswith('.body') and name[:-len('.body')] + '.json' not in present)
+            if not stray:
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    swept += 1
+            except OSError:
+                continue
+        with self.lock:
+            self.counts['swept'] += swept
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counts)
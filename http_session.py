@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP Sessions for the Reddit Web Scraper
+Keep-alive connection pools shared across fetch threads, gzip negotiation,
+per-request timing (DNS / connect / TLS / first byte / body) and per-host
+latency histograms (which set the hedged-request delay)
+"""
+
+import socket
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from config import HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE
+from hedged_requests import LatencyHistogram
+
+PHASES = ['dns', 'connect', 'tls', 'first_byte', 'body']
+
+
+class _TimedConnectionMixin:
+    """Records DNS, TCP connect and TLS handshake time when a new socket is opened"""
+
+    timing = None
+
+    def _new_conn(self):
+        started = time.perf_counter()
+        # _dns_host is urllib3-private (the host it resolves, self.host minus IPv6 brackets);
+        # without it, DNS is left to urllib3 and timed as part of connect
+        dns_host = getattr(self, '_dns_host', None)
+        if dns_host is None:
+            sock = super()._new_conn()
+            self.timing = {'dns': 0.0, 'connect': time.perf_counter() - started, 'tls': 0.0}
+            return sock
+        try:
+            addr = socket.getaddrinfo(dns_host, self.port, 0, socket.SOCK_STREAM)[0][4][0]
+        except OSError:
+            # Let urllib3 raise its own NameResolutionError
+            return super()._new_conn()
+        resolved = time.perf_counter()
+
+        # Connect to the resolved address so DNS is not paid twice (SNI still uses self.host)
+        self._dns_host = addr
+        try:
+            sock = super()._new_conn()
+        finally:
+            self._dns_host = dns_host
+
+        self.timing = {'dns': resolved - started, 'connect': time.perf_counter() - resolved, 'tls': 0.0}
+        return sock
+
+    def connect(self):
+        started = time.perf_counter()
+        super().connect()
+        if self.timing is not None:
+            # Whatever connect() spent beyond opening the socket is the TLS handshake
+            socket_time = self.timing['dns'] + self.timing['connect']
+            self.timing['tls'] = max(0.0, time.perf_counter() - started - socket_time)
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools use the timed connection classes"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool
+        }
+
+
+class SessionPool:
+    """Keep-alive sessions shared by all fetch threads
+
+    Each thread gets its own requests.Session (cookies are per session), but every
+    session is mounted on the same adapter, so TCP+TLS connections are pooled
+    across threads and reused between retries and hosts' repeat requests.
+    """
+
+    def __init__(self, pool_connections=None, pool_maxsize=None, headers=None, base_url=None):
+        self.adapter = TimedHTTPAdapter(
+            pool_connections=pool_connections or HTTP_POOL_CONNECTIONS,
+            pool_maxsize=pool_maxsize or HTTP_POOL_MAXSIZE
+        )
+        self.headers = {
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive'
+        }
+        self.headers.update(headers or {})
+        # Stand-in server (standin_server.py): requests go there, tagged with their real host
+        self.base_url = base_url.rstrip('/') if base_url else None
+        self._local = threading.local()
+        self.lock = threading.Lock()
+        # Running per-host totals (a run-long list of every request's timing would only grow)
+        self.totals = defaultdict(lambda: dict({phase: 0.0 for phase in PHASES},
+                                               requests=0, reused=0, wire_bytes=0, total=0.0))
+        self.histograms = defaultdict(LatencyHistogram)
+
+    def session(self):
+        """The calling thread's session"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            session.mount('https://', self.adapter)
+            session.mount('http://', self.adapter)
+            self._local.session = session
+        return session
+
+    def get(self, url, **kwargs):
+        """GET a URL, reading the body eagerly and recording phase timings"""
+        host = urlparse(url).netloc
+        if self.base_url:
+            parsed = urlparse(url)
+            url = self.base_url + parsed.path + (f"?{parsed.query}" if parsed.query else '')
+            kwargs['headers'] = dict(kwargs.get('headers') or {}, **{'X-Reddit-Host': host})
+        
+        started = time.perf_counter()
+        response = self.session().get(url, stream=True, **kwargs)
+        headers_received = time.perf_counter()
+
+        connection = getattr(response.raw, 'connection', None) or getattr(response.raw, '_connection', None)
+        conn_timing = getattr(connection, 'timing', None)
+        if connection is not None:
+            # Clear it so the next request on this (kept-alive) socket counts as reused
+            connection.timing = None
+
+        response.content  # read the body now so it can be timed
+        finished = time.perf_counter()
+
+        timing = {'dns': 0.0, 'connect': 0.0, 'tls': 0.0}
+        if conn_timing:
+            timing.update(conn_timing)
+        handshake = timing['dns'] + timing['connect'] + timing['tls']
+        timing['first_byte'] = max(0.0, headers_received - started - handshake)
+        timing['body'] = finished - headers_received
+        timing['total'] = finished - started
+        timing['reused'] = conn_timing is None
+        timing['status'] = response.status_code
+        timing['wire_bytes'] = response.raw.tell() if hasattr(response.raw, 'tell') else len(response.content)
+
+        with self.lock:
+            totals = self.totals[host]
+            totals['requests'] += 1
+            totals['reused'] += timing['reused']
+            totals['wire_bytes'] += timing['wire_bytes']
+            totals['total'] += timing['total']
+            for phase in PHASES:
+                totals[phase] += timing[phase]
+            histogram = self.histograms[host]
+        histogram.observe(timing['total'])
+
+        response.timing = timing
+        return response
+
+    def stats(self):
+        """Per-host request counts, connection reuse, average phase times and p50/p95 latency (ms)"""
+        with self.lock:
+            hosts = {host: dict(totals) for host, totals in self.totals.items()}
+
+        stats = {}
+        for host, totals in hosts.items():
+            count = totals['requests']
+            total = totals['total']
+            handshake = totals['dns'] + totals['connect'] + totals['tls']
+            stats[host] = {
+                'requests': count,
+                'reused_connections': totals['reused'],
+                'wire_bytes': totals['wire_bytes'],
+                'avg_ms': {phase: round(totals[phase] / count * 1000, 1) for phase in PHASES},
+                'handshake_share': round(handshake / total, 3) if total > 0 else 0.0,
+                'p50_ms': round(self.histograms[host].percentile(50) * 1000),
+                'p95_ms': round(self.histograms[host].percentile(95) * 1000)
+            }
+        return stats
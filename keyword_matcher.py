@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Aho-Corasick Multi-Pattern Keyword Matcher
+Compiles every named keyword set into one automaton and finds all of them in a
+single pass over a document, returning each match with its position - instead
+of one `keyword in text` scan per phrase, per set, per function
+"""
+
+from bisect import bisect_left
+
+try:
+    import ahocorasick  # pyahocorasick: same automaton, built in C
+except ImportError:
+    ahocorasick = None
+
+
+class KeywordMatches:
+    """Every keyword occurrence in one document, queryable by set, phrase and range"""
+
+    def __init__(self, matcher, hits, length):
+        self.matcher = matcher
+        self.hits = hits  # phrase -> sorted start positions
+        self.length = length
+        self.sets = set()
+        for phrase in hits:
+            self.sets.update(matcher.phrase_sets[phrase])
+
+    def positions(self, phrase):
+        """Start offsets of every (possibly overlapping) occurrence of phrase"""
+        return self.hits.get(phrase, [])
+
+    def count(self, phrase):
+        """Non-overlapping occurrences, same as str.count"""
+        total = 0
+        next_start = 0
+        for pos in self.hits.get(phrase, []):
+            if pos >= next_start:
+                total += 1
+                next_start = pos + len(phrase)
+        return total
+
+    def contains(self, phrase, start=0, end=None):
+        """True if phrase occurs entirely inside text[start:end]"""
+        positions = self.hits.get(phrase)
+        if not positions:
+            return False
+        end = self.length if end is None else end
+        i = bisect_left(positions, max(start, 0))
+        return i < len(positions) and positions[i] + len(phrase) <= end
+
+    def has(self, set_name, start=0, end=None):
+        """True if any phrase of the set occurs inside text[start:end]"""
+        if set_name not in self.sets:
+            return False
+        if start <= 0 and (end is None or end >= self.length):
+            return True
+        return any(self.contains(phrase, start, end) for phrase in self.matcher.unique_phrases[set_name])
+
+    def found(self, set_name, start=0, end=None):
+        """Phrases of the set present inside text[start:end], in the set's own order (duplicates kept)"""
+        if set_name not in self.sets:
+            return []
+        return [phrase for phrase in self.matcher.keyword_sets[set_name] if self.contains(phrase, start, end)]
+
+    def first(self, set_name, start=0, end=None):
+        """First phrase of the set (in list order) present inside text[start:end], or None"""
+        if set_name not in self.sets:
+            return None
+        for phrase in self.matcher.keyword_sets[set_name]:
+            if self.contains(phrase, start, end):
+                return phrase
+        return None
+
+    def matches(self):
+        """All matches as (start, end, phrase), in document order"""
+        return sorted((pos, pos + len(phrase), phrase) for phrase, positions in self.hits.items() for pos in positions)
+
+
+class KeywordMatcher:
+    """One Aho-Corasick automaton over every phrase of every named keyword set
+
+    Phrases are lower-cased; pass lower-cased text to scan(). Uses pyahocorasick
+    when it is installed and an equivalent pure-Python automaton otherwise.
+    """
+
+    def __init__(self, keyword_sets, use_c=True):
+        self.keyword_sets = {name: [phrase.lower() for phrase in phrases] for name, phrases in keyword_sets.items()}
+        self.unique_phrases = {name: list(dict.fromkeys(phrases)) for name, phrases in self.keyword_sets.items()}
+        self.phrase_sets = {}
+        for name, phrases in self.keyword_sets.items():
+            for phrase in phrases:
+                if phrase:
+                    self.phrase_sets.setdefault(phrase, set()).add(name)
+
+        if use_c and ahocorasick is not None:
+            self.engine = 'pyahocorasick'
+            self._automaton = ahocorasick.Automaton()
+            for phrase in self.phrase_sets:
+                self._automaton.add_word(phrase, phrase)
+            self._automaton.make_automaton()
+        else:
+            self.engine = 'python'
+            self._build()
+
+    def _build(self):
+        """Goto/fail construction, flattened into a full transition table per state"""
+        goto = [{}]
+        output = [()]
+        for phrase in self.phrase_sets:
+            state = 0
+            for ch in phrase:
+                if ch not in goto[state]:
+                    goto.append({})
+                    output.append(())
+                    goto[state][ch] = len(goto) - 1
+                state = goto[state][ch]
+            output[state] = output[state] + (phrase,)
+
+        # Breadth-first: each state inherits the transitions and outputs of its fail state
+        fail = [0] * len(goto)
+        delta = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = list(goto[0].values())
+        while queue:
+            next_queue = []
+            for state in queue:
+                delta[state] = dict(delta[fail[state]])
+                delta[state].update(goto[state])
+                output[state] = output[state] + output[fail[state]]
+                for ch, child in goto[state].items():
+                    fail[child] = delta[fail[state]].get(ch, 0)
+                    next_queue.append(child)
+            queue = next_queue
+        self._delta = delta
+        self._output = output
+
+    def scan(self, text):
+        """Single pass over text; returns a KeywordMatches"""
+        hits = {}
+        if self.engine == 'pyahocorasick':
+            for end, phrase in self._automaton.iter(text):
+                hits.setdefault(phrase, []).append(end - len(phrase) + 1)
+        else:
+            delta = self._delta
+            output = self._output
+            state = 0
+            for i, ch in enumerate(text):
+                state = delta[state].get(ch, 0)
+                if output[state]:
+                    for phrase in output[state]:
+                        hits.setdefault(phrase, []).append(i - len(phrase) + 1)
+        return KeywordMatches(self, hits, len(text))
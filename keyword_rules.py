@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Shared Keyword Sets
+Brand patterns, customer-discussion phrases, exclusion rules and report themes,
+compiled together with the sentiment rules into one KeywordMatcher so each
+document is scanned once for all of them
+"""
+
+from config import ALL_COMPETITORS, EXCLUDE_KEYWORDS
+from keyword_matcher import KeywordMatcher
+from sentiment_rules import (HIGH_CONFIDENCE_COMPLAINTS, NEUTRAL_COMPARISON, STRONG_NEGATIVE,
+                             STRONG_POSITIVE, QUESTION_WORDS, POSITIVE_COMPARISON)
+
+# detect_brands: any mention at all (source attribution)
+DETECT_BRAND_PATTERNS = {
+    'HelloFresh': ['hellofresh', 'hello fresh', 'hf '],
+    'Factor75': ['factor75', 'factor 75', 'factor', 'factor meal'],
+    'Blue Apron': ['blue apron', 'blueapron'],
+    'Home Chef': ['home chef', 'homechef'],
+    'Marley Spoon': ['marley spoon', 'marleyspoon', 'martha stewart'],
+    'Hungryroot': ['hungryroot', 'hungry root'],
+    'EveryPlate': ['everyplate', 'every plate'],
+    'Green Chef': ['green chef', 'greenchef']
+}
+
+# get_primary_brand: mentions counted and scored for customer-discussion context
+PRIMARY_BRAND_PATTERNS = {
+    'HelloFresh': ['hellofresh', 'hello fresh', 'hf'],
+    'Factor75': ['factor75', 'factor 75', 'factor meal', 'factor'],
+    'Blue Apron': ['blue apron', 'blueapron'],
+    'Home Chef': ['home chef', 'homechef'],
+    'Marley Spoon': ['marley spoon', 'marleyspoon'],
+    'Hungryroot': ['hungryroot', 'hungry root'],
+    'EveryPlate': ['everyplate', 'every plate'],
+    'Green Chef': ['green chef', 'greenchef'],
+    'Purple Carrot': ['purple carrot', 'purplecarrot']
+}
+
+# CUSTOMER DISCUSSION INDICATORS - these show people are talking about using the service
+# (duplicates are intentional: each listed phrase adds to the context score)
+CUSTOMER_DISCUSSION_PHRASES = [
+    # Questions/Recommendations
+    'has anyone', 'anyone tried', 'anyone use', 'anyone done', 'recommendations',
+    'recommend', 'which is better', 'best meal', 'good meal service',
+    'meal service', 'meal kit', 'meal delivery', 'food delivery',
+
+    # Personal Experience (first person)
+    'i did', 'i tried', 'i use', 'i used', 'i\'m using', 'i have', 'i had',
+    'i was', 'i am', 'i\'ve', 'i got', 'i received', 'i ordered',
+    'my box', 'my order', 'my meal', 'my experience', 'my subscription',
+
+    # Personal Experience (plural/possessive)
+    'we did', 'we tried', 'we use', 'we used', 'we have', 'we had',
+    'our box', 'our order', 'our meal', 'our subscription', 'ours',
+    'been using', 'been with', 'subscriber', 'subscription',
+
+    # Opinions/Reviews
+    'love', 'hate', 'like', 'dislike', 'disappointed', 'happy with',
+    'quality', 'fresh', 'taste', 'flavor', 'portion', 'recipe',
+    'delivery', 'arrived', 'shipping', 'packaging', 'box',
+
+    # Service Issues/Feedback
+    'customer service', 'cancel', 'cancelled', 'refund', 'complaint',
+    'issue', 'problem', 'missing', 'wrong', 'damaged', 'spoiled',
+    'upcharge', 'price', 'cost', 'expensive', 'cheap',
+
+    # Comparisons
+    'better than', 'worse than', 'compared to', 'vs', 'versus',
+    'switch', 'switched', 'alternative',
+
+    # Meal/Recipe specific
+    'recipe', 'meal', 'dish', 'cooked', 'cooking', 'made this'
+]
+
+# should_exclude_post: brand names that make a general food sub post relevant (title only)
+TITLE_BRAND_NAMES = ['hellofresh', 'factor75', 'factor 75', 'blue apron', 'home chef',
+                     'marley spoon', 'hungryroot', 'purple carrot', 'meal kit', 'meal service']
+
+# Report themes (step 2 actionable analysis)
+STEP2_THEME_KEYWORDS = {
+    'Quality': ['taste', 'flavor', 'fresh', 'quality', 'ingredients', 'cooking', 'recipe', 'delicious', 'bland', 'tasteless'],
+    'Delivery': ['delivery', 'shipping', 'late', 'on time', 'packaging', 'arrived', 'damaged', 'cold', 'frozen'],
+    'Service': ['customer service', 'support', 'refund', 'cancel', 'subscription', 'billing', 'help', 'complaint'],
+    'Price': ['price', 'cost', 'expensive', 'cheap', 'value', 'money', 'worth', 'affordable', 'overpriced']
+}
+
+# Report themes (step 3 competitor analysis)
+STEP3_THEME_KEYWORDS = {
+    'Quality': ['taste', 'flavor', 'fresh', 'quality', 'ingredients', 'cooking', 'recipe', 'delicious', 'bland', 'tasteless', 'amazing', 'terrible'],
+    'Delivery': ['delivery', 'shipping', 'late', 'on time', 'packaging', 'arrived', 'damaged', 'cold', 'frozen', 'early', 'fast'],
+    'Service': ['customer service', 'support', 'refund', 'cancel', 'subscription', 'billing', 'help', 'complaint', 'response', 'staff'],
+    'Price': ['price', 'cost', 'expensive', 'cheap', 'value', 'money', 'worth', 'affordable', 'overpriced', 'budget', 'deal']
+}
+
+
+def keyword_sets():
+    """Every named keyword set, as compiled into the shared matcher"""
+    sets = {
+        'customer_discussion': CUSTOMER_DISCUSSION_PHRASES,
+        'exclude': EXCLUDE_KEYWORDS,
+        'title_brand': TITLE_BRAND_NAMES,
+        'competitor': ALL_COMPETITORS,
+        'high_confidence_complaints': HIGH_CONFIDENCE_COMPLAINTS,
+        'neutral_comparison': NEUTRAL_COMPARISON,
+        'strong_negative': STRONG_NEGATIVE,
+        'strong_positive': STRONG_POSITIVE,
+        'question_words': QUESTION_WORDS,
+        'positive_comparison': POSITIVE_COMPARISON
+    }
+    for brand, patterns in DETECT_BRAND_PATTERNS.items():
+        sets[f'detect:{brand}'] = patterns
+    for brand, patterns in PRIMARY_BRAND_PATTERNS.items():
+        sets[f'primary:{brand}'] = patterns
+    for theme, keywords in STEP2_THEME_KEYWORDS.items():
+        sets[f'step2_theme:{theme}'] = keywords
+    for theme, keywords in STEP3_THEME_KEYWORDS.items():
+        sets[f'step3_theme:{theme}'] = keywords
+    return sets
+
+
+_matcher = None
+
+
+def shared_matcher():
+    """The process-wide KeywordMatcher (compiled on first use)"""
+    global _matcher
+    if _matcher is None:
+        _matcher = KeywordMatcher(keyword_sets())
+    return _matcher
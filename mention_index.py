@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Per-Post Mention Index for Primary Brand Scoring
+Built once per post from a single keyword scan: a positions table per brand
+pattern, plus sorted occurrence offsets per customer-discussion phrase so
+"which phrases fall within 100 chars of this mention" is a pair of
+prefix-count lookups instead of a rescan of the context window
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import Counter
+
+CONTEXT_RADIUS = 100  # Characters either side of a mention scored for discussion phrases
+
+
+class MentionIndex:
+    """Brand mention positions and discussion-phrase range counts for one post"""
+
+    def __init__(self, matches, brand_patterns, phrase_set='customer_discussion'):
+        self.length = matches.length
+        self.matches = matches
+
+        # Positions table: brand -> [(pattern, start offsets)]
+        self.mentions = {
+            brand: [(pattern, matches.positions(pattern)) for pattern in patterns]
+            for brand, patterns in brand_patterns.items()
+        }
+
+        # Discussion phrases present in the post: (length, weight, sorted start offsets).
+        # bisect over the offsets is the prefix count "occurrences starting before x";
+        # weight is how often the phrase is listed, since each listing scores once.
+        weights = Counter(matches.matcher.keyword_sets[phrase_set])
+        self.phrases = [
+            (len(phrase), weight, matches.positions(phrase))
+            for phrase, weight in weights.items() if matches.positions(phrase)
+        ]
+
+    def phrase_score(self, start, end):
+        """Weighted number of distinct phrases lying entirely inside text[start:end]"""
+        score = 0
+        for length, weight, starts in self.phrases:
+            if bisect_right(starts, end - length) > bisect_left(starts, start):
+                score += weight
+        return score
+
+    def mention_count(self, brand):
+        """Non-overlapping mentions of the brand's patterns (str.count semantics)"""
+        return sum(self.matches.count(pattern) for pattern, _ in self.mentions[brand])
+
+    def context_score(self, brand, radius=CONTEXT_RADIUS):
+        """Discussion phrases around every mention of the brand, summed"""
+        score = 0
+        for pattern, positions in self.mentions[brand]:
+            for pos in positions:
+                score += self.phrase_score(max(0, pos - radius), min(self.length, pos + len(pattern) + radius))
+        return score
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Per-Stage Pipeline Accounting
+Counts posts in/out and time spent for each scraper stage (cheap filters
+first, expensive analysis last) so the work avoided by filtering early is visible
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StageStats:
+    """Thread-safe in/out/time counters per named stage, in first-seen order"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stages = {}
+
+    def record(self, stage, seen=1, kept=1, seconds=0.0):
+        with self.lock:
+            entry = self.stages.setdefault(stage, {'in': 0, 'out': 0, 'seconds': 0.0})
+            entry['in'] += seen
+            entry['out'] += kept
+            entry['seconds'] += seconds
+
+    @contextmanager
+    def timed(self, stage, seen=1):
+        """Time a block; set result['kept'] = 0 inside it to count the item as dropped"""
+        result = {'kept': seen}
+        started = time.perf_counter()
+        try:
+            yield result
+        finally:
+            self.record(stage, seen, result['kept'], time.perf_counter() - started)
+
+    def report(self):
+        """Stage stats plus the analysis time avoided by the cheap filters"""
+        with self.lock:
+            report = {stage: dict(entry, seconds=round(entry['seconds'], 3)) for stage, entry in self.stages.items()}
+
+        analysis = self.stages.get('analysis')
+        cheap_filter = self.stages.get('cheap_filter')
+        if analysis and analysis['in'] and cheap_filter:
+            per_post = analysis['seconds'] / analysis['in']
+            excluded = cheap_filter['in'] - cheap_filter['out']
+            report['avoided'] = {'posts': excluded, 'seconds': round(excluded * per_post, 3)}
+        return report
+
+
+def print_stage_report(report):
+    """Print the stage table"""
+    print(f"\nPIPELINE STAGES")
+    print(f"{'Stage':<14} | {'In':<6} | {'Out':<6} | {'Time':<8}")
+    print("-" * 44)
+    for stage, entry in report.items():
+        if stage == 'avoided':
+            continue
+        print(f"{stage:<14} | {entry['in']:<6} | {entry['out']:<6} | {entry['seconds']:.2f}s")
+    print("-" * 44)
+    if 'avoided' in report:
+        print(f"Analysis skipped for {report['avoided']['posts']} filtered posts (~{report['avoided']['seconds']:.2f}s saved)")
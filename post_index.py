@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Canonical Reddit Post IDs
+Every post is identified by its t3_ fullname, whichever host or permalink
+form it was fetched from, so duplicates are dropped at ingest - before any
+brand detection or sentiment analysis runs
+"""
+
+import re
+import threading
+
+COMMENTS_ID_RE = re.compile(r'/comments/([a-z0-9]+)', re.IGNORECASE)
+
+
+def canonical_post_id(post):
+    """t3_ fullname for a post dict (falls back to the URL for sample/unknown posts)"""
+    post_id = post.get('post_id')
+    if post_id:
+        return post_id if post_id.startswith('t3_') else f't3_{post_id}'
+
+    match = COMMENTS_ID_RE.search(post.get('url', ''))
+    if match:
+        return f't3_{match.group(1).lower()}'
+    return post.get('url')
+
+
+class PostIndex:
+    """Thread-safe set of post IDs already claimed during a run"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.ids = set()
+        self.duplicates = 0
+
+    def claim(self, post_id):
+        """Claim a post for analysis; False if another source already has it"""
+        if not post_id:
+            return True
+        with self.lock:
+            if post_id in self.ids:
+                self.duplicates += 1
+                return False
+            self.ids.add(post_id)
+            return True
+
+    def release(self, post_id):
+        """Give up a claim (the post was dropped) so another source can still take it"""
+        with self.lock:
+            self.ids.discard(post_id)
+
+    def stats(self):
+        with self.lock:
+            return {'unique': len(self.ids), 'duplicates_skipped': self.duplicates}
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+NDJSON Post Files
+One post per line after a header record, so readers stream posts in constant
+memory (filtering by brand and time as they go) and writers append posts as
+they are produced instead of rewriting a whole dataset:
+
+    {"$header": {"format": "posts-ndjson", "version": 1, "date_range": {...}, ...}}
+    {"title": "...", "primary_brand": "HelloFresh", "created_utc": 1763400000.0, ...}
+    {"$header": {"total_posts": 180, "brand_counts": {...}}}
+
+Header records may appear anywhere; later ones update earlier ones. Posts are
+in the order they were appended. A torn last line (writer killed mid-append)
+is ignored.
+
+    python post_ndjson.py reports/working_posts.ndjson --brand HelloFresh --since 2025-11-17
+"""
+
+import argparse
+import os
+
+from config import WORKING_DATA_FILE, WORKING_POSTS_FILE, WORKING_NDJSON
+import artifacts
+import data_codec
+from post_store import parse_time, report_window
+
+HEADER_KEY = '$header'
+FORMAT = 'posts-ndjson'
+VERSION = 1
+
+_HEADER_PREFIX = b'{"' + HEADER_KEY.encode('utf-8') + b'"'
+
+
+def partial_path(path):
+    """Where a file is appended to before it replaces path"""
+    return f"{path}.partial"
+
+
+class PostWriter:
+    """Appends posts and header updates to an NDJSON post file
+
+    As a context manager it closes the file on exit; with discard_on_error an
+    exception also deletes it, so an unfinished file is never left to be read.
+    """
+
+    def __init__(self, path, header=None, truncate=False, discard_on_error=False):
+        self.path = path
+        self.discard_on_error = discard_on_error
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        new = truncate or not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, 'wb' if new else 'ab')
+        self.posts = 0
+        if new:
+            self.update_header(format=FORMAT, version=VERSION, **(header or {}))
+        elif header:
+            self.update_header(**header)
+
+    def append(self, post):
+        self.file.write(data_codec.dumps(post) + b'\n')
+        self.posts += 1
+
+    def extend(self, posts):
+        for post in posts:
+            self.append(post)
+        self.file.flush()
+
+    def update_header(self, **fields):
+        self.file.write(data_codec.dumps({HEADER_KEY: fields}) + b'\n')
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+        if exc_type is not None and self.discard_on_error and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _lines(path):
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                return  # torn append
+            if line.strip():
+                yield line
+
+
+def read_header(path):
+    """Every header record merged (post lines are not decoded)"""
+    header = {}
+    for line in _lines(path):
+        if line.startswith(_HEADER_PREFIX):
+            header.update(data_codec.loads(line)[HEADER_KEY])
+    if header.get('format') != FORMAT:
+        raise ValueError(f"{path} is not a {FORMAT} file")
+    return header
+
+
+def bounds(start=None, end=None):
+    """(start, end) as epoch seconds or None (a bare end date includes that day)"""
+    return (parse_time(start).timestamp() if start is not None else None,
+            parse_time(end, end_of_day=True).timestamp() if end is not None else None)
+
+
+def matches(post, brands=None, mentioned=None, start=None, end=None):
+    """Whether a post passes the predicates (start/end as epoch seconds, see bounds())"""
+    if brands and post.get('primary_brand') not in brands:
+        return False
+    if mentioned and not any(brand in mentioned for brand in post.get('competitors_mentioned', [])):
+        return False
+    if start is not None or end is not None:
+        created = post.get('created_utc')
+        if created is None or (start is not None and created < start) or (end is not None and created > end):
+            return False
+    return True
+
+
+def iter_posts(path, brands=None, mentioned=None, start=None, end=None, where=None):
+    """Posts matching every given predicate, one at a time
+
+    brands: primary_brand in brands. mentioned: any of competitors_mentioned in
+    mentioned. start/end: created_utc within [start, end] (datetimes or ISO
+    strings). where: any other test on the post. Lines that cannot contain a
+    wanted brand are skipped without decoding.
+    """
+    wanted = brands or mentioned
+    needles = [brand.encode('utf-8') for brand in wanted] if wanted else None
+    start, end = bounds(start, end)
+    for line in _lines(path):
+        if line.startswith(_HEADER_PREFIX):
+            continue
+        if needles and not any(needle in line for needle in needles):
+            continue
+        post = data_codec.loads(line)
+        if matches(post, brands, mentioned, start, end) and (where is None or where(post)):
+            yield post
+
+
+class PostFile:
+    """The posts of an NDJSON post file as an iterable that re-reads the file on every pass"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def __iter__(self):
+        return iter_posts(self.path)
+
+    def where(self, **predicates):
+        return iter_posts(self.path, **predicates)
+
+
+def open_dataset(path):
+    """A dataset dict like artifacts.load() returns, with posts streamed from the file"""
+    header = read_header(path)
+    return dict({key: value for key, value in header.items() if key not in ('format', 'version')},
+                posts=PostFile(path))
+
+
+def load_working_data(stream=True):
+    """The dataset every report reader uses (steps 1-3, update_homepage, the email)
+
+    A post store window when REPORT_WINDOW_START is set; otherwise this run's
+    WORKING_DATA_FILE. Its posts are streamed from WORKING_POSTS_FILE when that
+    file was completed by the same scrape (matching scrape_timestamp), so a
+    stale or unfinished NDJSON file is never read instead of the dataset.
+    stream=False always returns the posts as a list.
+    """
+    data = report_window()
+    if data is not None:
+        return data
+    if not os.path.exists(WORKING_DATA_FILE):
+        raise FileNotFoundError("No working data found. Run accurate_scraper.py first.")
+
+    reference = artifacts.reference_of(WORKING_DATA_FILE)
+    if stream and WORKING_NDJSON and reference and os.path.exists(WORKING_POSTS_FILE):
+        try:
+            dataset = open_dataset(WORKING_POSTS_FILE)
+        except (OSError, ValueError):
+            dataset = None
+        if dataset and dataset.get('scrape_timestamp') == reference.get('scrape_timestamp'):
+            return dataset
+    return artifacts.load(WORKING_DATA_FILE)
+
+
+def select(posts, brands=None, mentioned=None, start=None, end=None):
+    """Filter a dataset's posts by the iter_posts predicates, streaming when posts is a PostFile"""
+    if isinstance(posts, PostFile):
+        return posts.where(brands=brands, mentioned=mentioned, start=start, end=end)
+    start, end = bounds(start, end)
+    return (post for post in posts if matches(post, brands, mentioned, start, end))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read an NDJSON post file")
+    parser.add_argument('path', help='Post file (e.g. reports/working_posts.ndjson)')
+    parser.add_argument('--brand', action='append', help='primary_brand to keep (repeatable)')
+    parser.add_argument('--since', help='Created on/after (ISO date or datetime)')
+    parser.add_argument('--until', help='Created on/before (ISO date or datetime)')
+    args = parser.parse_args()
+
+    header = read_header(args.path)
+    print(f"{args.path}: {header.get('total_posts', '?')} posts, "
+          f"{header.get('date_range', {}).get('start', '?')[:10]} to {header.get('date_range', {}).get('end', '?')[:10]}")
+    count = 0
+    for post in iter_posts(args.path, brands=args.brand, start=args.since, end=args.until):
+        count += 1
+        print(f"  [{post.get('primary_brand')}/{post.get('sentiment')}] {post.get('title', '')[:80]}")
+    print(f"{count} matching posts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Historical Post Store
+SQLite table of every scraped post, upserted by Reddit ID (the newest snapshot
+of a post wins), indexed on primary_brand, created_utc, sentiment and
+subreddit so steps 1-3 and trend queries read a window with an index scan
+instead of opening every reports/raw snapshot:
+
+    python post_store.py --import                     ingest reports/packed and reports/raw snapshots
+    python post_store.py --window 2025-11-01 2025-11-30
+    python post_store.py --trend 2025-09-01 2025-12-31
+"""
+
+import argparse
+import glob
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone, time as day_time
+
+from config import (POST_STORE_FILE, RAW_DATA_DIR, ALL_COMPETITORS,
+                    REPORT_WINDOW_START, REPORT_WINDOW_END)
+from post_index import canonical_post_id
+import artifacts
+import data_codec
+
+# Indexed columns (the full post is kept as JSON in `data`)
+COLUMNS = ['post_id', 'created_utc', 'primary_brand', 'sentiment', 'subreddit',
+           'score', 'num_comments', 'first_seen', 'last_seen', 'data']
+
+
+def parse_time(value, end_of_day=False):
+    """UTC datetime from an ISO date/datetime string (a bare date is its start, or its end)"""
+    if isinstance(value, datetime):
+        parsed = value
+    elif len(value) == 10:
+        day = datetime.fromisoformat(value).date()
+        parsed = datetime.combine(day, day_time.max if end_of_day else day_time.min)
+    else:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def brand_counts(posts):
+    """Posts per brand in ALL_COMPETITORS (zeros included), as accurate_scraper.main() counts them"""
+    counts = {brand: 0 for brand in ALL_COMPETITORS}
+    for post in posts:
+        for brand in post.get('competitors_mentioned', []):
+            if brand in counts:
+                counts[brand] += 1
+    return counts
+
+
+class PostStore:
+    """SQLite-backed post history, one row per Reddit post"""
+
+    def __init__(self, path=None):
+        self.path = path or POST_STORE_FILE
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        db = self._db()
+        db.execute("""CREATE TABLE IF NOT EXISTS posts (
+            post_id TEXT PRIMARY KEY,
+            created_utc REAL NOT NULL,
+            primary_brand TEXT,
+            sentiment TEXT,
+            subreddit TEXT,
+            score INTEGER,
+            num_comments INTEGER,
+            first_seen REAL NOT NULL,
+            last_seen REAL NOT NULL,
+            data TEXT NOT NULL
+        )""")
+        # Brand queries are almost always over a time window too
+        db.execute("CREATE INDEX IF NOT EXISTS posts_brand_created ON posts (primary_brand, created_utc)")
+        db.execute("CREATE INDEX IF NOT EXISTS posts_created ON posts (created_utc)")
+        db.execute("CREATE INDEX IF NOT EXISTS posts_sentiment ON posts (sentiment)")
+        db.execute("CREATE INDEX IF NOT EXISTS posts_subreddit ON posts (subreddit)")
+        db.commit()
+
+    def _db(self):
+        """One connection per thread (sqlite3 connections are not shareable)"""
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def upsert(self, posts, seen_at=None):
+        """Insert or update posts by Reddit ID; returns (stored, skipped)
+
+        seen_at: when the posts were scraped (epoch seconds or ISO string, default
+        now). A row only takes the values of a snapshot at least as new as its
+        own, so importing old files after new ones never rolls a post back.
+        Posts without a Reddit ID (sample data) are skipped.
+        """
+        if seen_at is None:
+            seen_at = datetime.now(timezone.utc).timestamp()
+        elif isinstance(seen_at, str):
+            seen_at = parse_time(seen_at).timestamp()
+
+        rows = []
+        skipped = 0
+        for post in posts:
+            post_id = canonical_post_id(post)
+            if not post_id or not post_id.startswith('t3_') or post.get('created_utc') is None:
+                skipped += 1
+                continue
+            rows.append((post_id, float(post['created_utc']), post.get('primary_brand'), post.get('sentiment'),
+                         post.get('subreddit'), post.get('score'), post.get('num_comments'),
+                         seen_at, seen_at, data_codec.dumps(post).decode('utf-8')))
+
+        newer = "excluded.last_seen >= posts.last_seen"
+        updates = ', '.join(f"{column} = CASE WHEN {newer} THEN excluded.{column} ELSE posts.{column} END"
+                            for column in COLUMNS if column not in ('post_id', 'first_seen'))
+        db = self._db()
+        db.executemany(
+            f"INSERT INTO posts ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))}) "
+            f"ON CONFLICT(post_id) DO UPDATE SET {updates}, first_seen = MIN(posts.first_seen, excluded.first_seen)",
+            rows
+        )
+        db.commit()
+        return len(rows), skipped
+
+    def window(self, start, end, brands=None, sentiment=None, subreddit=None):
+        """Posts created in [start, end] (datetimes or ISO strings), oldest first"""
+        start = parse_time(start).timestamp()
+        end = parse_time(end, end_of_day=True).timestamp()
+        sql = "SELECT data FROM posts WHERE created_utc BETWEEN ? AND ?"
+        params = [start, end]
+        if brands:
+            sql += f" AND primary_brand IN ({', '.join('?' * len(brands))})"
+            params.extend(brands)
+        if sentiment:
+            sql += " AND sentiment = ?"
+            params.append(sentiment)
+        if subreddit:
+            sql += " AND subreddit = ?"
+            params.append(subreddit)
+        sql += " ORDER BY created_utc, post_id"
+        return [data_codec.loads(data) for data, in self._db().execute(sql, params)]
+
+    def window_data(self, start, end):
+        """A window in the working-data shape steps 1-3 load (posts, date_range, totals)"""
+        start = parse_time(start)
+        end = parse_time(end, end_of_day=True)
+        posts = self.window(start, end)
+        return {
+            'scrape_timestamp': None,
+            'processing_timestamp': datetime.now(timezone.utc).isoformat(),
+            'date_range': {'start': start.isoformat(), 'end': end.isoformat()},
+            'total_posts': len(posts),
+            'posts': posts,
+            'brand_counts': brand_counts(posts),
+            'source': f"post store {self.path}"
+        }
+
+    def sentiment_trend(self, start, end, period='%Y-%W'):
+        """{period: {brand: {sentiment: posts}}} for posts created in [start, end]
+
+        period is an SQLite strftime format over created_utc ('%Y-%W' weeks, '%Y-%m' months).
+        """
+        rows = self._db().execute(
+            "SELECT strftime(?, created_utc, 'unixepoch'), primary_brand, sentiment, COUNT(*) FROM posts "
+            "WHERE created_utc BETWEEN ? AND ? AND primary_brand IS NOT NULL GROUP BY 1, 2, 3 ORDER BY 1",
+            (period, parse_time(start).timestamp(), parse_time(end, end_of_day=True).timestamp())
+        )
+        trend = {}
+        for bucket, brand, sentiment, count in rows:
+            trend.setdefault(bucket, {}).setdefault(brand, {})[sentiment or 'neutral'] = count
+        return trend
+
+    def import_archive(self, raw_dir=RAW_DATA_DIR, pack_dir=None):
+        """Upsert every packed week and raw_/filtered_ snapshot in raw_dir (oldest first); returns (files, stored, skipped)"""
+        from archive_pack import PackedArchive
+
+        files = stored = skipped = 0
+        archive = PackedArchive(pack_dir)
+        for week in archive.weeks:
+            for names, data in archive.datasets(week):
+                seen_at = data.get('scrape_timestamp') or names[0].split('_', 1)[1][:10]
+                file_stored, file_skipped = self.upsert(data.get('posts', []), seen_at=seen_at)
+                files += len(names)
+                stored += file_stored
+                skipped += file_skipped
+
+        paths = glob.glob(os.path.join(raw_dir, 'raw_*.json')) + glob.glob(os.path.join(raw_dir, 'filtered_*.json'))
+        for path in sorted(paths, key=lambda path: os.path.basename(path).split('_', 1)[1]):
+            try:
+                data = artifacts.load(path)
+            except (OSError, ValueError) as e:
+                print(f"  Skipping {path}: {e}")
+                continue
+            # Snapshots predating scrape_timestamp are dated by their file name
+            seen_at = data.get('scrape_timestamp') or os.path.basename(path).split('_', 1)[1][:10]
+            file_stored, file_skipped = self.upsert(data.get('posts', []), seen_at=seen_at)
+            files += 1
+            stored += file_stored
+            skipped += file_skipped
+        return files, stored, skipped
+
+    def seed(self, raw_dir=RAW_DATA_DIR, pack_dir=None):
+        """Import the archive if the store is empty (it is not committed, so every
+        fresh checkout starts empty); returns import_archive()'s counts, or None"""
+        if self.stats()['posts']:
+            return None
+        return self.import_archive(raw_dir, pack_dir)
+
+    def stats(self):
+        db = self._db()
+        total, oldest, newest = db.execute("SELECT COUNT(*), MIN(created_utc), MAX(created_utc) FROM posts").fetchone()
+        stats = {'posts': total}
+        if total:
+            stats['oldest'] = datetime.fromtimestamp(oldest, tz=timezone.utc).isoformat()
+            stats['newest'] = datetime.fromtimestamp(newest, tz=timezone.utc).isoformat()
+        return stats
+
+
+def report_window():
+    """Post store window for REPORT_WINDOW_START/END (what steps 1-3 load instead of the
+    working data when set), or None"""
+    if not REPORT_WINDOW_START:
+        return None
+    end = REPORT_WINDOW_END or datetime.now(timezone.utc)
+    store = PostStore()
+    seeded = store.seed()
+    if seeded:
+        print(f"Post store created from {seeded[0]} archived snapshots ({seeded[1]} posts)")
+    data = store.window_data(REPORT_WINDOW_START, end)
+    print(f"Loaded {data['total_posts']} posts from the post store "
+          f"({data['date_range']['start'][:10]} to {data['date_range']['end'][:10]})")
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Historical post store (SQLite)")
+    parser.add_argument('--db', default=POST_STORE_FILE, help='Store file')
+    parser.add_argument('--import', dest='import_dir', nargs='?', const=RAW_DATA_DIR,
+                        help='Ingest raw_/filtered_ snapshots (default: reports/raw)')
+    parser.add_argument('--window', nargs=2, metavar=('START', 'END'), help='Print brand/sentiment counts for a window')
+    parser.add_argument('--trend', nargs=2, metavar=('START', 'END'), help='Print weekly sentiment per brand')
+    parser.add_argument('--monthly', action='store_true', help='Trend by month instead of week')
+    args = parser.parse_args()
+
+    store = PostStore(args.db)
+    if args.import_dir:
+        files, stored, skipped = store.import_archive(args.import_dir)
+        print(f"Imported {files} snapshots: {stored} posts upserted, {skipped} without a Reddit ID skipped")
+
+    if args.window:
+        posts = store.window(*args.window)
+        print(f"{len(posts)} posts from {args.window[0]} to {args.window[1]}")
+        for brand, count in brand_counts(posts).items():
+            print(f"  {brand:12}: {count}")
+
+    if args.trend:
+        trend = store.sentiment_trend(*args.trend, period='%Y-%m' if args.monthly else '%Y-%W')
+        print(f"{'Period':<8} | {'Brand':<13} | {'Pos':>4} | {'Neg':>4} | {'Neu':>4}")
+        print("-" * 45)
+        for bucket, brands in trend.items():
+            for brand, counts in sorted(brands.items()):
+                print(f"{bucket:<8} | {brand:<13} | {counts.get('positive', 0):>4} | "
+                      f"{counts.get('negative', 0):>4} | {counts.get('neutral', 0):>4}")
+
+    print(f"Post store: {store.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Streaming Post Pipeline
+Chains generator stages (fetch -> dedupe -> filter -> analysis) with one
+thread per stage and a bounded queue between each pair, so analysis runs while
+sources are still downloading. A full queue blocks the stage feeding it
+(backpressure); an exception in any stage stops the pipeline and is re-raised
+to the consumer. The queues bound what waits between stages, not the run's
+memory: whatever the consumer keeps (scrape_weekly_data keeps every post) grows
+with the run.
+"""
+
+import queue
+import threading
+
+from config import STREAM_QUEUE_SIZE
+
+_DONE = object()
+
+
+class _Failure:
+    """Carries a stage's exception downstream"""
+
+    def __init__(self, error):
+        self.error = error
+
+
+def _put(q, item, cancelled):
+    """Blocking put that gives up once the pipeline is cancelled"""
+    while not cancelled.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _drain(q, cancelled):
+    """Iterate a stage's input queue until the upstream stage finishes or the pipeline is cancelled"""
+    while not cancelled.is_set():
+        try:
+            item = q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        if item is _DONE:
+            return
+        if isinstance(item, _Failure):
+            raise item.error
+        yield item
+
+
+def _run_stage(stage, items, out, cancelled):
+    try:
+        for item in stage(items):
+            if not _put(out, item, cancelled):
+                return
+        _put(out, _DONE, cancelled)
+    except BaseException as e:
+        _put(out, _Failure(e), cancelled)
+
+
+def stream(source, stages, maxsize=None):
+    """Run source (an iterable) through stages, each a function iterable -> iterable
+
+    Yields the last stage's output. Every stage (and the source) runs on its own
+    thread; queues between them hold at most maxsize items.
+    """
+    maxsize = maxsize or STREAM_QUEUE_SIZE
+    cancelled = threading.Event()
+    threads = []
+    items = source
+    upstream = lambda source_items: source_items  # the source itself runs on a thread too
+    for stage in [upstream] + list(stages):
+        out = queue.Queue(maxsize=maxsize)
+        thread = threading.Thread(target=_run_stage, args=(stage, items, out, cancelled), daemon=True)
+        threads.append(thread)
+        items = _drain(out, cancelled)
+    for thread in threads:
+        thread.start()
+
+    try:
+        yield from items
+    finally:
+        # Consumer finished or failed - unblock any stage still waiting on a full queue
+        cancelled.set()
+        for thread in threads:
+            thread.join(timeout=1.0)
+
+
+def batched(items, size):
+    """Group an iterable into lists of up to size items"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
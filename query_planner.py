@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Query Planner for WEEKLY_LINKS
+Collapses overlapping sources before scraping: same-subreddit searches become
+one listing fetch (or one OR-combined query), equivalent and subsumed global
+queries are merged, and brand attribution happens locally via detect_brands
+"""
+
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+
+from config import QUERY_PLANNER_MERGE_GLOBAL, QUERY_MAX_LENGTH, QUERY_MAX_BRANDS_PER_FETCH
+
+# Listing stop reasons after which a merged fetch is fetched again as its separate
+# sources: one relevance-sorted HTML page, or a listing cut off by LISTING_MAX_PAGES
+SPLIT_MERGED_STOPS = ('html', 'max_pages')
+
+
+def parse_source(url):
+    """Split a normalized Reddit search URL into (subreddit or None, query)"""
+    parsed = urlparse(url)
+    query = parse_qs(parsed.query).get('q', [''])[0].strip()
+    subreddit = None
+    if '/r/' in parsed.path:
+        subreddit = parsed.path.split('/r/')[1].split('/')[0]
+    return subreddit, query
+
+
+def query_terms(query):
+    """Lower-cased term set; Reddit ANDs terms, so more terms = fewer results"""
+    return frozenset(query.lower().split())
+
+
+def equivalence_key(query):
+    """'hello fresh' and 'hellofresh' (or 'green chef' / 'greenchef') share a key"""
+    return ''.join(query.lower().split())
+
+
+def or_query(phrases):
+    """Combine phrases into one Reddit OR query
+
+    Multi-word phrases are parenthesized rather than quoted so their terms keep
+    the implicit-AND meaning they had as separate searches.
+    """
+    if len(phrases) == 1:
+        return phrases[0]
+    return ' OR '.join(f'({p})' if ' ' in p else p for p in phrases)
+
+
+def search_url(query, subreddit=None):
+    """Build a normalized www.reddit.com search URL"""
+    params = {'q': query, 'type': 'posts', 't': 'week'}
+    path = '/search/'
+    if subreddit:
+        path = f'/r/{subreddit}/search/'
+        params['restrict_sr'] = '1'
+    return urlunparse(('https', 'www.reddit.com', path, '', urlencode(params), ''))
+
+
+def batch_phrases(phrases, max_length):
+    """Split phrases into OR queries that stay under Reddit's query length limit"""
+    batches = [[]]
+    for phrase in phrases:
+        if batches[-1] and len(or_query(batches[-1] + [phrase])) > max_length:
+            batches.append([])
+        batches[-1].append(phrase)
+    return [batch for batch in batches if batch]
+
+
+def batch_groups(groups, max_length, max_brands):
+    """Pack phrase groups into OR queries of at most max_brands brands under the length limit
+
+    Each group is a dict with phrases, brands and jobs; each batch is one too.
+    """
+    batches = []
+    for group in groups:
+        for phrases in batch_phrases(group['phrases'], max_length):
+            current = batches[-1] if batches else None
+            if (current is None
+                    or len(set(current['brands']) | set(group['brands'])) > max_brands
+                    or len(or_query(current['phrases'] + phrases)) > max_length):
+                current = {'phrases': [], 'brands': [], 'jobs': []}
+                batches.append(current)
+            current['phrases'].extend(p for p in phrases if p not in current['phrases'])
+            current['brands'].extend(b for b in group['brands'] if b not in current['brands'])
+            current['jobs'].extend(job for job in group['jobs'] if job not in current['jobs'])
+    return batches
+
+
+def planned_fetch(url, jobs):
+    """A planned source: the URL to fetch for these (brand, url) jobs"""
+    return {
+        'url': url,
+        'brands': list(dict.fromkeys(brand for brand, _ in jobs)),
+        'sources': list(dict.fromkeys(source for _, source in jobs)),
+        'jobs': list(jobs)
+    }
+
+
+def plan_sources(jobs, merge_global=None, max_length=None, max_brands=None):
+    """Plan the minimum set of fetches covering every (brand, normalized_url) job
+
+    Returns a list of planned sources, each a dict with:
+        url     - the URL to fetch
+        brands  - brands this fetch serves (attribute posts locally if > 1)
+        sources - the original normalized URLs it replaces
+        jobs    - the original (brand, url) jobs, to fetch separately if the
+                  merged fetch turns out incomplete
+
+    OR queries combine at most max_brands brands: a merged search shares one
+    result set between its brands, so the more brands it serves, the fewer
+    posts each one gets when only a page of it can be read.
+    """
+    merge_global = QUERY_PLANNER_MERGE_GLOBAL if merge_global is None else merge_global
+    max_length = max_length or QUERY_MAX_LENGTH
+    max_brands = max_brands or QUERY_MAX_BRANDS_PER_FETCH
+
+    subreddit_jobs = {}
+    global_jobs = []
+    for brand, url in jobs:
+        subreddit, query = parse_source(url)
+        if subreddit:
+            subreddit_jobs.setdefault(subreddit.lower(), []).append((brand, url, subreddit, query))
+        else:
+            global_jobs.append((brand, url, query))
+
+    plan = []
+
+    # Same-subreddit searches: one listing if any source wants the whole subreddit, else OR queries
+    for members in subreddit_jobs.values():
+        member_jobs = [(brand, url) for brand, url, _, _ in members]
+        if len(members) == 1:
+            plan.append(planned_fetch(members[0][1], member_jobs))
+            continue
+
+        subreddit = members[0][2]
+        if any(query == '' for _, _, _, query in members):
+            plan.append(planned_fetch(search_url('', subreddit), member_jobs))
+            continue
+
+        brand_groups = {}
+        for brand, url, _, query in members:
+            group = brand_groups.setdefault(brand, {'phrases': [], 'brands': [brand], 'jobs': []})
+            if query not in group['phrases']:
+                group['phrases'].append(query)
+            group['jobs'].append((brand, url))
+        for batch in batch_groups(brand_groups.values(), max_length, max_brands):
+            plan.append(planned_fetch(search_url(or_query(batch['phrases']), subreddit), batch['jobs']))
+
+    # Global searches: drop queries subsumed by a query with a subset of their terms
+    # ("every plate food brand" only ever returns a subset of "every plate")
+    terms = {query: query_terms(query) for _, _, query in global_jobs}
+    groups = {}
+    for brand, url, query in global_jobs:
+        covering = [other for other in terms if terms[other] < terms[query]]
+        if covering:
+            query = min(covering, key=len)
+        group = groups.setdefault(equivalence_key(query), {'phrases': [], 'brands': [], 'jobs': []})
+        if query not in group['phrases']:
+            group['phrases'].append(query)
+        if brand not in group['brands']:
+            group['brands'].append(brand)
+        group['jobs'].append((brand, url))
+
+    if merge_global and groups:
+        # Different brands' global queries OR-combined, max_brands brands per search
+        for batch in batch_groups(groups.values(), max_length, max_brands):
+            plan.append(planned_fetch(search_url(or_query(batch['phrases'])), batch['jobs']))
+    else:
+        for group in groups.values():
+            if len(group['jobs']) == 1 and len(group['phrases']) == 1:
+                url = group['jobs'][0][1]
+            else:
+                url = search_url(or_query(group['phrases']))
+            plan.append(planned_fetch(url, group['jobs']))
+
+    return plan
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Per-Host Rate Limiter for the Reddit Scraper
+Token buckets per host (old.reddit.com, www.reddit.com, OAuth API)
+replace the fixed time.sleep(1) between sources. When Reddit reports its
+quota (X-Ratelimit-* headers, or PRAW's reddit.auth.limits) a bucket adapts:
+the remaining requests are spread evenly over the time left in the window,
+and an exhausted quota or a 429 pauses the host until the window resets
+"""
+
+import threading
+import time
+from urllib.parse import urlparse
+
+from config import (HOST_RATE_LIMITS, DEFAULT_HOST_RATE_LIMIT, ADAPTIVE_RATE_LIMIT,
+                    RATE_LIMIT_RESERVE, RATE_LIMIT_MIN_RATE, RATE_LIMIT_MAX_RATE)
+
+# Host used for rate limiting PRAW calls (PRAW talks to the OAuth API)
+OAUTH_HOST = 'oauth.reddit.com'
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `capacity` banked"""
+
+    def __init__(self, rate, capacity, adaptive=False):
+        self.base_rate = float(rate)
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.wait_seconds = 0.0
+
+        # Reddit's view of the quota (None until a response reports it)
+        self.adaptive = adaptive
+        self.remaining = None
+        self.used = None
+        self.reset_at = None
+        self.paused_until = 0.0
+        self.pauses = 0
+        self.rate_limited = 0
+        self.min_rate = None
+
+    def _refill(self, now):
+        elapsed = now - self.updated
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a token is available, return seconds spent waiting"""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            # Reserve the token now (may go negative) so concurrent callers queue up fairly
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            wait = max(wait, self.paused_until - now)
+            if self.remaining is not None and self.reset_at > now:
+                # Count down the reported quota until the next response refreshes it
+                self.remaining -= 1
+                if self.remaining < RATE_LIMIT_RESERVE:
+                    wait = max(wait, self.reset_at - now)
+            self.requests += 1
+
+        waited = 0.0
+        while wait > 0:
+            time.sleep(wait)
+            waited += wait
+            # A pause set while this caller slept (429 / exhausted quota) still applies
+            with self.lock:
+                wait = self.paused_until - time.monotonic()
+
+        with self.lock:
+            self.wait_seconds += waited
+        return waited
+
+    def pause(self, seconds):
+        """Hold every request on this host for seconds (after a 429 or an exhausted quota)"""
+        with self.lock:
+            until = time.monotonic() + seconds
+            if until > self.paused_until:
+                self.paused_until = until
+                self.pauses += 1
+
+    def update_quota(self, remaining, reset_seconds, used=None):
+        """Retune to Reddit's reported quota: remaining requests over reset_seconds
+
+        Keeps RATE_LIMIT_RESERVE requests back for other callers sharing the
+        quota; with nothing usable left, the host pauses until the reset.
+        """
+        if not self.adaptive:
+            return
+        reset_seconds = max(float(reset_seconds), 0.0)
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            reset_at = now + reset_seconds
+            remaining = float(remaining)
+            if self.reset_at is not None and abs(reset_at - self.reset_at) < 2.0 and self.remaining < remaining:
+                # Same window, older snapshot (e.g. another thread's PRAW client) - the quota only goes down
+                remaining = self.remaining
+            self.remaining = remaining
+            self.used = used
+            self.reset_at = reset_at
+            usable = self.remaining - RATE_LIMIT_RESERVE
+            if usable >= 1:
+                self.rate = min(RATE_LIMIT_MAX_RATE, max(RATE_LIMIT_MIN_RATE, usable / max(reset_seconds, 1.0)))
+                # Never bank a burst bigger than the quota left
+                self.tokens = min(self.tokens, usable)
+                self.min_rate = self.rate if self.min_rate is None else min(self.min_rate, self.rate)
+                return
+        self.pause(reset_seconds)
+
+    def stats(self):
+        with self.lock:
+            stats = {
+                'requests': self.requests,
+                'wait_seconds': round(self.wait_seconds, 2),
+                'rate': round(self.rate, 3)
+            }
+            if self.remaining is not None:
+                stats.update({
+                    'base_rate': self.base_rate,
+                    'min_rate': round(self.min_rate, 3) if self.min_rate is not None else None,
+                    'remaining': self.remaining,
+                    'used': self.used,
+                    'reset_in': round(max(0.0, self.reset_at - time.monotonic()), 1)
+                })
+            if self.pauses or self.rate_limited:
+                stats.update({'pauses': self.pauses, 'rate_limited': self.rate_limited})
+            return stats
+
+
+class HostRateLimiter:
+    """One token bucket per host, created lazily from HOST_RATE_LIMITS"""
+
+    def __init__(self, limits=None, default=None, adaptive=None):
+        self.limits = HOST_RATE_LIMITS if limits is None else limits
+        self.default = DEFAULT_HOST_RATE_LIMIT if default is None else default
+        self.adaptive = ADAPTIVE_RATE_LIMIT if adaptive is None else adaptive
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def bucket_for(self, host):
+        """Get (or create) the bucket for a host"""
+        with self.lock:
+            if host not in self.buckets:
+                rate, burst = self.limits.get(host, self.default)
+                self.buckets[host] = TokenBucket(rate, burst, adaptive=self.adaptive)
+            return self.buckets[host]
+
+    def host(self, url_or_host):
+        return urlparse(url_or_host).netloc if '://' in url_or_host else url_or_host
+
+    def acquire(self, url_or_host):
+        """Wait for a request slot on the host of a URL (or a bare host name)"""
+        return self.bucket_for(self.host(url_or_host)).acquire()
+
+    def observe(self, url_or_host, headers, status=None):
+        """Feed a response's X-Ratelimit-* headers (and 429s) back to its host's bucket"""
+        if not self.adaptive:
+            return
+        bucket = self.bucket_for(self.host(url_or_host))
+        remaining = headers.get('X-Ratelimit-Remaining')
+        reset = headers.get('X-Ratelimit-Reset')
+        if status == 429:
+            with bucket.lock:
+                bucket.rate_limited += 1
+            retry_after = headers.get('Retry-After') or reset
+            try:
+                bucket.pause(float(retry_after) if retry_after else 1.0)
+            except ValueError:
+                bucket.pause(1.0)
+        if remaining is not None and reset is not None:
+            try:
+                used = headers.get('X-Ratelimit-Used')
+                bucket.update_quota(float(remaining), float(reset), int(float(used)) if used else None)
+            except ValueError:
+                pass
+
+    def update_quota(self, url_or_host, limits):
+        """Feed PRAW's reddit.auth.limits ({remaining, reset_timestamp, used}) to a bucket"""
+        if not self.adaptive or not limits or limits.get('remaining') is None or limits.get('reset_timestamp') is None:
+            return
+        self.bucket_for(self.host(url_or_host)).update_quota(
+            limits['remaining'], limits['reset_timestamp'] - time.time(), limits.get('used'))
+
+    def stats(self):
+        """Requests, total wait and (once Reddit has reported it) quota state per host"""
+        with self.lock:
+            buckets = dict(self.buckets)
+        return {host: bucket.stats() for host, bucket in buckets.items()}
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Reddit HTTP Fixtures (record / replay)
+Records the pages a weekly scrape requests - old.reddit.com and www.reddit.com
+HTML, the web fallback's public .json listings and the API listing JSON PRAW
+pages through - into a versioned fixture directory that standin_server.py
+replays offline:
+
+    reports/fixtures/<name>/manifest.json   request key -> status, content type, body file
+    reports/fixtures/<name>/bodies/         one file per distinct response body
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from datetime import datetime, timezone, timedelta
+from urllib.parse import urlparse, parse_qsl, urlencode
+
+from config import FIXTURE_DIR, WEEKLY_LINKS, REDDIT_USER_AGENT, LISTING_MAX_PAGES, QUERY_PLANNER_ENABLED
+
+FIXTURE_FORMAT_VERSION = 1
+
+# Host PRAW's listing requests are filed under (it talks to the OAuth API)
+API_HOST = 'oauth.reddit.com'
+
+# Left out of request keys: raw_json is a PRAW formatting flag and the search
+# time filter ('t') depends on when the request is made, not what it returns
+IGNORED_PARAMS = {'raw_json', 't'}
+
+BROWSER_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+EMPTY_LISTING = {'kind': 'Listing', 'data': {'after': None, 'before': None, 'dist': 0, 'children': []}}
+
+
+def request_key(host, path, query=''):
+    """Stable key for a request: host + path + sorted query (minus IGNORED_PARAMS)"""
+    params = sorted((k, v) for k, v in parse_qsl(query, keep_blank_values=True) if k not in IGNORED_PARAMS)
+    return f"{host}{path}?{urlencode(params)}"
+
+
+def url_key(url):
+    parsed = urlparse(url)
+    return request_key(parsed.netloc, parsed.path, parsed.query)
+
+
+class FixtureSet:
+    """One recorded fixture directory"""
+
+    def __init__(self, path):
+        self.path = path
+        self.manifest = {'format_version': FIXTURE_FORMAT_VERSION, 'entries': {}}
+        manifest_file = os.path.join(path, 'manifest.json')
+        if os.path.exists(manifest_file):
+            with open(manifest_file) as f:
+                self.manifest = json.load(f)
+            if self.manifest.get('format_version') != FIXTURE_FORMAT_VERSION:
+                raise ValueError(f"{path}: fixture format {self.manifest.get('format_version')}, "
+                                 f"expected {FIXTURE_FORMAT_VERSION} (re-record it)")
+        self.entries = self.manifest['entries']
+
+    @property
+    def recorded_at(self):
+        """When the fixtures were recorded (replay the scrape as of this time)"""
+        recorded_at = self.manifest.get('recorded_at')
+        return datetime.fromisoformat(recorded_at) if recorded_at else None
+
+    def add(self, key, status, content_type, body):
+        """Store a response body (deduplicated by content hash)"""
+        digest = hashlib.sha256(body).hexdigest()[:16]
+        extension = 'json' if 'json' in content_type else 'html'
+        body_file = os.path.join('bodies', f"{digest}.{extension}")
+        os.makedirs(os.path.join(self.path, 'bodies'), exist_ok=True)
+        with open(os.path.join(self.path, body_file), 'wb') as f:
+            f.write(body)
+        self.entries[key] = {'status': status, 'content_type': content_type, 'body': body_file, 'bytes': len(body)}
+
+    def lookup(self, key):
+        """(status, content_type, body bytes) for a request key, or None"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        with open(os.path.join(self.path, entry['body']), 'rb') as f:
+            return entry['status'], entry['content_type'], f.read()
+
+    def save(self):
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, 'manifest.json'), 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+
+
+def planned_urls():
+    """The URLs a weekly scrape fetches (normalized and query-planned like scrape_weekly_data)"""
+    from accurate_scraper import AccurateScraper
+    from query_planner import plan_sources
+
+    scraper = AccurateScraper(analysis_only=True, sentiment_engine='rules')
+    jobs = []
+    for brand, links in WEEKLY_LINKS.items():
+        for link in [links] if isinstance(links, str) else links:
+            jobs.append((brand, scraper.normalize_reddit_url(link)))
+    if not QUERY_PLANNER_ENABLED:
+        return [url for _, url in jobs]
+    urls = []
+    for planned in plan_sources(jobs):
+        urls.append(planned['url'])
+        # A merged fetch that stops early is split back into its sources
+        if len(planned['brands']) > 1:
+            urls.extend(url for _, url in planned['jobs'])
+    return list(dict.fromkeys(urls))
+
+
+def api_listing(url, start_time):
+    """(API path, params) of the PRAW listing scrape_reddit_link pages through for url"""
+    import praw
+    from query_planner import parse_source
+    from reddit_listings import subreddit_new, search_new
+
+    # Listing objects only build the request; nothing is sent
+    reddit = praw.Reddit(client_id='fixtures', client_secret='fixtures', user_agent=REDDIT_USER_AGENT,
+                         check_for_updates=False)
+    if 'reddit.com/r/' in url:
+        listing = subreddit_new(reddit, url.split('/r/')[1].split('/')[0])
+    else:
+        _, query = parse_source(url)
+        listing = search_new(reddit, query, start_time)
+    return '/' + listing.url.lstrip('/'), dict(listing.params)
+
+
+def record(name=None, days=8, include_api=True, include_html=True, include_json=True):
+    """Record every planned source's pages into reports/fixtures/<name>"""
+    import requests
+    from rate_limiter import HostRateLimiter
+    from web_listings import json_listing_url, parse_json_listing
+
+    now = datetime.now(timezone.utc)
+    start_time = now - timedelta(days=days)
+    fixtures = FixtureSet(os.path.join(FIXTURE_DIR, name or now.strftime('%Y-%m-%d')))
+    fixtures.manifest.update({'recorded_at': now.isoformat(), 'window_start': start_time.isoformat()})
+    limiter = HostRateLimiter()
+    session = requests.Session()
+
+    def fetch(url, key, headers):
+        limiter.acquire(url)
+        try:
+            response = session.get(url, headers=headers, timeout=30)
+        except requests.exceptions.RequestException as e:
+            print(f"  [FAILED] {url}: {e}")
+            return None
+        fixtures.add(key, response.status_code, response.headers.get('Content-Type', 'text/html'), response.content)
+        print(f"  {response.status_code} {len(response.content):>8} bytes  {key}")
+        return response
+
+    for url in planned_urls():
+        print(f"Recording {url}")
+        if include_html:
+            for host in ['old.reddit.com', 'www.reddit.com']:
+                page_url = urlparse(url)._replace(netloc=host).geturl()
+                fetch(page_url, url_key(page_url), {'User-Agent': BROWSER_USER_AGENT})
+
+        if include_json:
+            # The web fallback's .json listing, paged with 'after' the way the scraper pages it
+            after = None
+            for _ in range(LISTING_MAX_PAGES):
+                json_url = json_listing_url(url, after)
+                response = fetch(json_url, url_key(json_url), {'User-Agent': REDDIT_USER_AGENT})
+                if response is None or response.status_code != 200:
+                    break
+                try:
+                    posts, after = parse_json_listing(response.content)
+                except ValueError:
+                    break
+                if not after or not posts or posts[-1]['created_utc'] < start_time.timestamp():
+                    break
+
+        if include_api:
+            # Public .json listings return what the OAuth API returns to PRAW
+            path, params = api_listing(url, start_time)
+            for _ in range(LISTING_MAX_PAGES):
+                json_url = f"https://www.reddit.com{path}.json?{urlencode(params)}"
+                response = fetch(json_url, request_key(API_HOST, path, urlencode(params)),
+                                 {'User-Agent': REDDIT_USER_AGENT})
+                if response is None or response.status_code != 200:
+                    break
+                data = response.json().get('data', {})
+                children = data.get('children', [])
+                if not data.get('after') or not children or children[-1]['data'].get('created_utc', 0) < start_time.timestamp():
+                    break
+                params['after'] = data['after']
+
+    fixtures.save()
+    print(f"\nRecorded {len(fixtures.entries)} responses to {fixtures.path}")
+    return fixtures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record Reddit pages for offline replay (standin_server.py)")
+    parser.add_argument('--name', help='Fixture set name (default: today\'s date)')
+    parser.add_argument('--days', type=int, default=8, help='Page API listings back this many days')
+    parser.add_argument('--no-api', action='store_true', help='Skip the API listing JSON')
+    parser.add_argument('--no-html', action='store_true', help='Skip the old/www reddit HTML pages')
+    parser.add_argument('--no-json', action='store_true', help='Skip the web fallback\'s .json listings')
+    args = parser.parse_args()
+    record(args.name, args.days, include_api=not args.no_api, include_html=not args.no_html,
+           include_json=not args.no_json)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,13 +5,13 @@ Works on any platform that supports SMTP
 Enhanced with embedded chart and top posts per Assaf's feedback
 """
 
-import json
 import os
 import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
 from email import encoders
+import post_ndjson
 
 def calculate_engagement_score(post):
     """Calculate engagement score: score + 3×comments"""
@@ -239,8 +239,7 @@ def send_email_smtp(recipients):
         return False
     
     # Get date range from data
-    with open('reports/working_reddit_data.json', 'r') as f:
-        data = json.load(f)
+    data = post_ndjson.load_working_data()
     
     date_range = data.get('date_range', {})
     start_date = date_range.get('start', '2025-10-20').split('T')[0]
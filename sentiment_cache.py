@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Persistent Sentiment Result Cache
+SQLite store of analyze_sentiment results keyed by a hash of the post text,
+its primary brand, the sentiment engine and the ruleset version, so re-scraped posts skip
+VADER/TextBlob entirely and any keyword-list change starts a fresh key space
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from config import SENTIMENT_CACHE_FILE, SENTIMENT_CACHE_MAX_ENTRIES
+from sentiment_rules import ruleset_version
+
+
+def normalize_text(text):
+    """Whitespace-trimmed text (case is kept - VADER scores capitals differently)"""
+    return (text or '').strip()
+
+
+def content_key(text, title, primary_brand, engine='dual', ruleset=None):
+    """sha256 over everything analyze_sentiment's result depends on"""
+    parts = [ruleset or ruleset_version(), engine, primary_brand or '', normalize_text(title), normalize_text(text)]
+    return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+class SentimentCache:
+    """SQLite-backed sentiment results with LRU eviction and hit/miss counts"""
+
+    def __init__(self, path=None, max_entries=None, enabled=True):
+        self.path = path or SENTIMENT_CACHE_FILE
+        self.max_entries = SENTIMENT_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self._local = threading.local()
+        self._connections = []  # every thread's connection, so close() can reach them all
+        self._generation = 0  # bumped by close(); older thread-local connections are reopened
+        self.counts = {'hits': 0, 'misses': 0, 'stored': 0, 'evicted': 0}
+
+        if self.enabled:
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                db = self._db()
+                db.execute("""CREATE TABLE IF NOT EXISTS sentiment (
+                    key TEXT PRIMARY KEY,
+                    ruleset TEXT NOT NULL,
+                    result TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )""")
+                db.execute("CREATE INDEX IF NOT EXISTS sentiment_last_used ON sentiment (last_used)")
+                # Results from older rulesets can never be hit again
+                stale = db.execute("DELETE FROM sentiment WHERE ruleset != ?", (ruleset_version(),)).rowcount
+                db.commit()
+                self.counts['evicted'] += max(stale, 0)
+            except sqlite3.Error as e:
+                print(f"  Sentiment cache disabled ({self.path}): {e}")
+                self.enabled = False
+
+    def _db(self):
+        """One connection per thread (sqlite3 connections are not shareable)"""
+        db = getattr(self._local, 'db', None)
+        if db is None or self._local.generation != self._generation:
+            # check_same_thread=False only so close() can close it; one thread still uses it
+            db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+            self._local.generation = self._generation
+            with self.lock:
+                self._connections.append(db)
+        return db
+
+    def close(self):
+        """Checkpoint the WAL into the database file and close every connection
+
+        Until then committed results may live only in the -wal file, and a copy
+        of the database file alone (the CI cache) would be missing them. Call it
+        once no thread is using the cache; a later lookup reopens a connection.
+        """
+        if not self.enabled:
+            return
+        try:
+            self._db().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error as e:
+            print(f"  Sentiment cache checkpoint failed: {e}")
+        with self.lock:
+            connections, self._connections = self._connections, []
+            self._generation += 1
+        for db in connections:
+            try:
+                db.close()
+            except sqlite3.Error:
+                pass
+
+    def _count(self, name, amount=1):
+        with self.lock:
+            self.counts[name] += amount
+
+    def get(self, key):
+        """Cached result dict for key, or None"""
+        if not self.enabled:
+            return None
+        try:
+            db = self._db()
+            row = db.execute("SELECT result FROM sentiment WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._count('misses')
+                return None
+            db.execute("UPDATE sentiment SET last_used = ? WHERE key = ?", (time.time(), key))
+            db.commit()
+        except sqlite3.Error as e:
+            print(f"  Sentiment cache read failed: {e}")
+            self._count('misses')
+            return None
+        self._count('hits')
+        return json.loads(row[0])
+
+    def put(self, key, result):
+        if not self.enabled:
+            return
+        now = time.time()
+        try:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO sentiment (key, ruleset, result, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, ruleset_version(), json.dumps(result), now, now)
+            )
+            db.commit()
+        except sqlite3.Error as e:
+            print(f"  Sentiment cache write failed: {e}")
+            return
+        self._count('stored')
+
+    def evict(self):
+        """Drop least recently used results beyond max_entries"""
+        if not self.enabled:
+            return 0
+        try:
+            db = self._db()
+            total = db.execute("SELECT COUNT(*) FROM sentiment").fetchone()[0]
+            excess = total - self.max_entries
+            if excess <= 0:
+                return 0
+            db.execute(
+                "DELETE FROM sentiment WHERE key IN (SELECT key FROM sentiment ORDER BY last_used LIMIT ?)",
+                (excess,)
+            )
+            db.commit()
+        except sqlite3.Error as e:
+            print(f"  Sentiment cache eviction failed: {e}")
+            return 0
+        self._count('evicted', excess)
+        return excess
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.counts)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        stats['ruleset'] = ruleset_version()
+        if self.enabled:
+            try:
+                stats['entries'] = self._db().execute("SELECT COUNT(*) FROM sentiment").fetchone()[0]
+            except sqlite3.Error:
+                pass
+        return stats
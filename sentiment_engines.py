@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Pluggable Sentiment Engines
+The model half of analyze_sentiment: the keyword rules decide first, then an
+engine scores whatever the rules leave open. Engines:
+    dual  - VADER + TextBlob on every post (the original behaviour)
+    vader - VADER only
+    rules - keyword rules only; VADER + TextBlob run lazily, when no rule fires
+"""
+
+from config import POSITIVE_THRESHOLD, NEGATIVE_THRESHOLD, SENTIMENT_ENGINE
+
+
+class DualModelEngine:
+    """VADER + TextBlob combined decision (Brian's spec: Positive/Negative/Suggestion(Neutral))"""
+
+    name = 'dual'
+    lazy = False  # Scores every post, even when a keyword rule already decided it
+
+    def __init__(self):
+        # Models load with the engine, not at import (TextBlob pulls in nltk)
+        from textblob import TextBlob
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        self.vader = SentimentIntensityAnalyzer()
+        self.textblob = TextBlob
+
+    def score(self, text):
+        vader_compound = self.vader.polarity_scores(text)['compound']
+        textblob_polarity = self.textblob(text).sentiment.polarity
+
+        if vader_compound >= POSITIVE_THRESHOLD and textblob_polarity >= 0.1:
+            sentiment = 'positive'
+            confidence = min(abs(vader_compound) + abs(textblob_polarity), 1.0)
+        elif vader_compound <= NEGATIVE_THRESHOLD and textblob_polarity <= -0.1:
+            sentiment = 'negative'
+            confidence = min(abs(vader_compound) + abs(textblob_polarity), 1.0)
+        else:
+            sentiment = 'neutral'  # Suggestion/Neutral as per Brian's spec
+            confidence = 1.0 - abs(vader_compound - textblob_polarity)
+
+        return {
+            'sentiment': sentiment,
+            'confidence': confidence,
+            'reasoning': f"VADER: {vader_compound:.2f}, TextBlob: {textblob_polarity:.2f}"
+        }
+
+
+class VaderEngine:
+    """VADER compound score alone (skips TextBlob's pattern analyzer)"""
+
+    name = 'vader'
+    lazy = False
+
+    def __init__(self):
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        self.vader = SentimentIntensityAnalyzer()
+
+    def score(self, text):
+        vader_compound = self.vader.polarity_scores(text)['compound']
+        if vader_compound >= POSITIVE_THRESHOLD:
+            sentiment = 'positive'
+        elif vader_compound <= NEGATIVE_THRESHOLD:
+            sentiment = 'negative'
+        else:
+            sentiment = 'neutral'
+        confidence = abs(vader_compound) if sentiment != 'neutral' else 1.0 - abs(vader_compound)
+
+        return {
+            'sentiment': sentiment,
+            'confidence': confidence,
+            'reasoning': f"VADER: {vader_compound:.2f}"
+        }
+
+
+class RulesEngine(DualModelEngine):
+    """Keyword rules first; the dual models only run for posts no rule decides
+
+    Labels match the dual engine exactly - only rule-decided posts lose their
+    model scores in the reasoning text.
+    """
+
+    name = 'rules'
+    lazy = True
+
+    def __init__(self):
+        self.vader = None  # Models load on the first post no rule decides
+
+    def score(self, text):
+        if self.vader is None:
+            DualModelEngine.__init__(self)
+        return super().score(text)
+
+
+ENGINES = {engine.name: engine for engine in [DualModelEngine, VaderEngine, RulesEngine]}
+
+
+def create_engine(name=None):
+    """Engine instance by name (SENTIMENT_ENGINE by default)"""
+    name = name or SENTIMENT_ENGINE
+    if name not in ENGINES:
+        raise ValueError(f"Unknown sentiment engine '{name}' (choose from {', '.join(ENGINES)})")
+    return ENGINES[name]()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Sentiment Keyword Rules
+The keyword lists analyze_sentiment applies on top of VADER/TextBlob, plus a
+ruleset_version() fingerprint of everything that can change a sentiment result,
+so cached results are invalidated automatically when any list is edited
+"""
+
+import hashlib
+import json
+from functools import lru_cache
+
+from config import ALL_COMPETITORS, POSITIVE_THRESHOLD, NEGATIVE_THRESHOLD
+
+# Bump when analyze_sentiment's decision logic changes (the lists below are fingerprinted automatically)
+SENTIMENT_LOGIC_VERSION = 1
+
+# HIGH-CONFIDENCE COMPLAINT KEYWORDS (added Dec 22, 2025)
+# These override all other sentiment analysis - if present, post is negative
+# This catches subtle complaints that VADER/TextBlob miss (like "AI photos" post)
+HIGH_CONFIDENCE_COMPLAINTS = [
+    'fake', 'downgraded', 'frustrated', 'thrown off', 'vent', 'venting',
+    'not allowed', 'taking away', 'annoyed', 'upset', 'misleading',
+    'not happy', 'unhappy', 'angry', 'furious', 'ridiculous',
+    'unacceptable', 'pathetic', 'joke', 'laughable'
+]
+
+# Neutral comparison/switching keywords (Brian's feedback: ambiguous posts should be neutral)
+# These indicate the post is asking for options/comparisons, not praising/criticizing
+NEUTRAL_COMPARISON = [
+    'switching to', 'switch to', 'switching from', 'compared to', 'vs', 'versus',
+    'which is better', 'better than', 'trying to decide', 'considering',
+    'what service', 'which service', 'what meal kit', 'which meal kit',
+    'recommendation', 'anyone know', 'anyone tried', 'anyone use',
+    'does anyone', 'has anyone', 'looking for', 'trying to find',
+    'best meal service', 'best meal kit', 'that don\'t use', 'that dont use'
+]
+
+# Strong negative keywords/phrases that override sentiment analysis
+# NOTE: Only include phrases that express DISSATISFACTION, not just stating facts
+STRONG_NEGATIVE = [
+    'stay away', 'avoid', 'terrible', 'worst', 'horrible', 'awful',
+    'disgusting', 'rotten', 'spoiled', 'cancelled', 'cancel', 'refund',
+    'scam', 'fraud', 'disappointed', 'issues with', 'problem with',
+    'never again', 'waste of money', 'do not recommend', 'not recommend',
+    'caution', 'warning', 'beware', 'upcharge', 'overpriced', 'rip off',
+    'complaint', 'unhappy', 'dissatisfied', 'poor quality', 'bad experience',
+    'missing', 'wrong', 'incorrect', 'damaged', 'late delivery', 'disaster',
+    'gross', 'contaminated', 'ruined', 'laughable'
+]
+
+# Strong positive keywords
+STRONG_POSITIVE = [
+    'love it', 'loving', 'amazing', 'excellent', 'best', 'highly recommend',
+    'fantastic', 'perfect', 'delicious', 'fresh', 'great quality',
+    'satisfied', 'happy with', 'impressed', 'exceeded expectations',
+    'worth it', 'great value', 'favorite'
+]
+
+# Title words that mark a post as a question (strong indicator of neutral)
+QUESTION_WORDS = ['what', 'which', 'how', 'does anyone', 'has anyone']
+
+# Positive indicators near the primary brand: "better", "resolved", "fairly", "look better"
+POSITIVE_COMPARISON = ['better', 'resolved', 'fairly', 'look better', 'makes', 'always']
+
+
+def _package_version(name):
+    from importlib import metadata  # slow to import and query; only needed for the cache key
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def ruleset_version():
+    """Short fingerprint of the keyword lists, thresholds, brands and model versions"""
+    ruleset = {
+        'logic': SENTIMENT_LOGIC_VERSION,
+        'high_confidence_complaints': HIGH_CONFIDENCE_COMPLAINTS,
+        'neutral_comparison': NEUTRAL_COMPARISON,
+        'strong_negative': STRONG_NEGATIVE,
+        'strong_positive': STRONG_POSITIVE,
+        'question_words': QUESTION_WORDS,
+        'positive_comparison': POSITIVE_COMPARISON,
+        'thresholds': [POSITIVE_THRESHOLD, NEGATIVE_THRESHOLD],
+        'competitors': ALL_COMPETITORS,
+        'models': [_package_version('vaderSentiment'), _package_version('textblob')]
+    }
+    encoded = json.dumps(ruleset, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Incremental Scrape State - Per-Source High-Water Marks
+Remembers the newest post (created_utc + t3_ id) seen for each normalized
+source URL, plus the posts already scraped inside the retention window,
+so a refresh only fetches what is newer and merges it into the stored window
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timezone, timedelta
+
+from config import INCREMENTAL_STATE_FILE, INCREMENTAL_RETENTION_DAYS
+
+# Listing stop reasons after which every post newer than the mark was read; only
+# these may advance it ('html', 'error', 'max_pages' and unknown stops leave a gap)
+COMPLETE_LISTING_STOPS = ('window', 'high_water_mark', 'exhausted')
+
+
+def is_sample_post(post):
+    """Posts invented by generate_sample_data are never persisted"""
+    return '/sample/' in post.get('url', '')
+
+
+class SourceStateStore:
+    """JSON-backed high-water marks and stored post windows, keyed by source URL"""
+
+    def __init__(self, path=None, retention_days=None):
+        self.path = path or INCREMENTAL_STATE_FILE
+        self.retention = timedelta(days=INCREMENTAL_RETENTION_DAYS if retention_days is None else retention_days)
+        self.lock = threading.Lock()
+        self.sources = {}
+
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    self.sources = json.load(f).get('sources', {})
+            except (OSError, ValueError) as e:
+                print(f"  Ignoring unreadable incremental state {self.path}: {e}")
+
+    def high_water_mark(self, source_url, start_time):
+        """(created_utc, post_id) of the newest stored post, or None if a full fetch is needed
+
+        A full fetch is needed when nothing is stored yet or when the stored
+        window does not reach back to start_time.
+        """
+        with self.lock:
+            state = self.sources.get(source_url)
+            if not state or state.get('newest_created_utc') is None:
+                return None
+            if datetime.fromisoformat(state['covered_from']) > start_time:
+                return None
+            return state['newest_created_utc'], state.get('newest_id')
+
+    def stored_posts(self, source_url):
+        """The posts stored for a source, unchanged"""
+        with self.lock:
+            return list(self.sources.get(source_url, {}).get('posts', []))
+
+    def merge(self, source_url, brand, new_posts, start_time, full_fetch):
+        """Merge freshly fetched posts into the stored window and return every stored post"""
+        real_posts = [p for p in new_posts if not is_sample_post(p)]
+        cutoff = datetime.now(timezone.utc) - self.retention
+
+        with self.lock:
+            state = self.sources.get(source_url)
+            if full_fetch or state is None:
+                state = {'brand': brand, 'covered_from': start_time.isoformat(), 'posts': []}
+
+            posts = {p['url']: p for p in state['posts']}
+            for post in real_posts:
+                posts[post['url']] = post
+
+            kept = [p for p in posts.values() if p['created_utc'] >= cutoff.timestamp()]
+            kept.sort(key=lambda p: p['created_utc'], reverse=True)
+
+            state['posts'] = kept
+            state['covered_from'] = max(datetime.fromisoformat(state['covered_from']), cutoff).isoformat()
+            state['updated_at'] = datetime.now(timezone.utc).isoformat()
+            if kept:
+                state['newest_created_utc'] = kept[0]['created_utc']
+                state['newest_id'] = kept[0].get('post_id')
+            else:
+                state['newest_created_utc'] = None
+                state['newest_id'] = None
+
+            self.sources[source_url] = state
+            return list(kept)
+
+    def save(self):
+        """Write all source state atomically"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self.lock:
+            payload = {'updated_at': datetime.now(timezone.utc).isoformat(), 'sources': self.sources}
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(payload, f)
+        os.replace(tmp_path, self.path)
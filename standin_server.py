@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Local Reddit Stand-in Server
+Replays a recorded fixture set (reddit_fixtures.py) over HTTP with
+configurable latency, error rate and 429 responses, so AccurateScraper can be
+benchmarked offline and deterministically:
+
+    python standin_server.py --fixtures reports/fixtures/2026-01-04 --latency 0.2 --error-rate 0.05
+    REDDIT_STANDIN_URL=http://127.0.0.1:8765 python accurate_scraper.py
+
+Web pages arrive with an X-Reddit-Host header (set by SessionPool); PRAW's
+requests are recognised by their bearer token and served the API listings.
+"""
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse
+
+from reddit_fixtures import FixtureSet, request_key, API_HOST, EMPTY_LISTING
+
+STATS_PATH = '/__standin__/stats'
+
+
+class StandinConfig:
+    """Fault injection settings
+
+    latency       - seconds added to every response (host_latency overrides per host)
+    jitter        - up to this many extra seconds, deterministic per request
+    error_rate    - share of requests answered 503
+    rate_limit_rate - share of requests answered 429
+    max_rps       - per-host requests per second before answering 429 (0 = off)
+    quota         - per-host requests per quota_window, reported in reddit's
+                    X-Ratelimit-Used/Remaining/Reset headers and answered 429
+                    once spent (0 = no quota headers)
+    seed          - fault decisions hash (seed, request key, attempt), so they do
+                    not depend on thread timing
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, rate_limit_rate=0.0,
+                 max_rps=0, host_latency=None, seed=0, quota=0, quota_window=600):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.max_rps = max_rps
+        self.host_latency = host_latency or {}
+        self.seed = seed
+        self.quota = quota
+        self.quota_window = quota_window
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, fixtures, config=None, address=('127.0.0.1', 8765)):
+        super().__init__(address, StandinHandler)
+        self.fixtures = fixtures
+        self.config = config or StandinConfig()
+        self.lock = threading.Lock()
+        self.attempts = defaultdict(int)
+        self.recent = defaultdict(deque)
+        self.counts = defaultdict(int)
+        self.started = time.time()
+        self.quota_used = defaultdict(int)  # (host, window number) -> requests
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def draw(self, key, attempt, salt):
+        """Deterministic value in [0, 1) for this request attempt"""
+        digest = hashlib.sha256(f"{self.config.seed}|{key}|{attempt}|{salt}".encode('utf-8')).digest()
+        return int.from_bytes(digest[:8], 'big') / 2 ** 64
+
+    def over_rate(self, host):
+        if not self.config.max_rps:
+            return False
+        now = time.monotonic()
+        with self.lock:
+            recent = self.recent[host]
+            while recent and now - recent[0] > 1.0:
+                recent.popleft()
+            recent.append(now)
+            return len(recent) > self.config.max_rps
+
+    def spend_quota(self, host):
+        """(headers, exhausted) for one more request against host's quota window"""
+        if not self.config.quota:
+            return {}, False
+        elapsed = time.time() - self.started
+        window = int(elapsed // self.config.quota_window)
+        with self.lock:
+            self.quota_used[host, window] += 1
+            used = self.quota_used[host, window]
+        reset = (window + 1) * self.config.quota_window - elapsed
+        headers = {
+            'X-Ratelimit-Used': str(used),
+            'X-Ratelimit-Remaining': str(max(0, self.config.quota - used)),
+            'X-Ratelimit-Reset': str(int(reset))
+        }
+        return headers, used > self.config.quota
+
+    def count(self, name):
+        with self.lock:
+            self.counts[name] += 1
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counts)
+
+    def start(self):
+        """Serve from a daemon thread (for in-process benchmarks); returns self"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like reddit
+
+    def log_message(self, format, *args):
+        pass
+
+    def send(self, status, content_type, body, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, status, data, headers=None):
+        self.send(status, 'application/json; charset=UTF-8', json.dumps(data).encode('utf-8'), headers)
+
+    def do_POST(self):
+        # PRAW's read-only token request
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if urlparse(self.path).path == '/api/v1/access_token':
+            self.send_json(200, {'access_token': 'standin', 'token_type': 'bearer', 'expires_in': 86400, 'scope': '*'})
+        else:
+            self.send_json(404, {'error': 404})
+
+    def do_GET(self):
+        server = self.server
+        config = server.config
+        parsed = urlparse(self.path)
+        if parsed.path == STATS_PATH:
+            self.send_json(200, server.stats())
+            return
+
+        is_api = self.headers.get('Authorization', '').lower().startswith('bearer')
+        host = API_HOST if is_api else self.headers.get('X-Reddit-Host') or self.headers.get('Host', '')
+        key = request_key(host, parsed.path, parsed.query)
+        with server.lock:
+            server.attempts[key] += 1
+            attempt = server.attempts[key]
+        server.count('requests')
+
+        delay = config.host_latency.get(host, config.latency) + config.jitter * server.draw(key, attempt, 'jitter')
+        if delay > 0:
+            time.sleep(delay)
+
+        quota_headers, exhausted = server.spend_quota(host)
+        if exhausted or server.over_rate(host) or server.draw(key, attempt, '429') < config.rate_limit_rate:
+            server.count('rate_limited')
+            headers = dict(quota_headers, **{'Retry-After': quota_headers.get('X-Ratelimit-Reset', '1')})
+            self.send_json(429, {'message': 'Too Many Requests', 'error': 429}, headers)
+            return
+        if server.draw(key, attempt, 'error') < config.error_rate:
+            server.count('errors')
+            self.send_json(503, {'message': 'Service Unavailable', 'error': 503}, quota_headers)
+            return
+
+        found = server.fixtures.lookup(key)
+        if found is None:
+            server.count('misses')
+            if is_api or (parsed.path.endswith('.json') and 'after=' in parsed.query):
+                # Unrecorded page (e.g. past the last recorded 'after'): end the listing
+                self.send_json(200, EMPTY_LISTING, quota_headers)
+            else:
+                self.send(404, 'text/html; charset=UTF-8', b'<html><body>not recorded</body></html>', quota_headers)
+            return
+
+        status, content_type, body = found
+        server.count('hits')
+        self.send(status, content_type, body, quota_headers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded Reddit fixtures over HTTP")
+    parser.add_argument('--fixtures', required=True, help='Fixture directory (reports/fixtures/<name>)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Up to this many extra seconds per response')
+    parser.add_argument('--host-latency', action='append', default=[], metavar='HOST=SECONDS',
+                        help='Latency override for one host, e.g. old.reddit.com=3')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of requests answered 503')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Share of requests answered 429')
+    parser.add_argument('--max-rps', type=float, default=0, help='Per-host requests/sec before 429s (0 = off)')
+    parser.add_argument('--quota', type=int, default=0, help='Per-host requests per quota window (0 = off)')
+    parser.add_argument('--quota-window', type=int, default=600, help='Quota window in seconds')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for latency jitter and fault injection')
+    args = parser.parse_args()
+
+    host_latency = {host: float(seconds) for host, seconds in (item.split('=', 1) for item in args.host_latency)}
+    config = StandinConfig(args.latency, args.jitter, args.error_rate, args.rate_limit_rate,
+                           args.max_rps, host_latency, args.seed, args.quota, args.quota_window)
+    server = StandinServer(FixtureSet(args.fixtures), config, (args.host, args.port))
+    print(f"Serving {len(server.fixtures.entries)} recorded responses from {args.fixtures} at {server.url}")
+    print(f"  (stats at {server.url}{STATS_PATH})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nStopped. {server.stats()}")
+
+
+if __name__ == "__main__":
+    main()
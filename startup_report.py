@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Startup Import Report
+Runs each pipeline entry point under `python -X importtime`, reports its
+import time, the slowest modules it pulls in and which heavy dependencies
+load at startup, and checks the fast-start scripts stay free of them
+"""
+
+import argparse
+import subprocess
+import sys
+
+ENTRY_POINTS = [
+    'complete_automation',
+    'accurate_scraper',
+    'step1_chart',
+    'step2_ACTIONABLE_analysis',
+    'step3_competitor_analysis',
+    'update_homepage',
+    'send_to_gmail_smtp'
+]
+
+# Third-party packages worth knowing about when they load at startup
+HEAVY_MODULES = ['matplotlib', 'numpy', 'pandas', 'praw', 'prawcore', 'textblob', 'nltk',
+                 'vaderSentiment', 'bs4', 'requests', 'urllib3']
+
+# Scripts that must start without these
+FAST_START = {
+    'step2_ACTIONABLE_analysis': ['matplotlib', 'praw', 'textblob'],
+    'update_homepage': ['matplotlib', 'praw', 'textblob']
+}
+
+
+def import_profile(module):
+    """[(depth, self_us, cumulative_us, name)] from `-X importtime` for one module"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((depth, int(self_us), int(cumulative_us), name.strip()))
+    return rows
+
+
+def summarize(module, rows, top):
+    """Total import time, heavy packages loaded and the slowest direct imports"""
+    entry = next((i for i, row in enumerate(rows) if row[3] == module and row[0] == 0), None)
+    if entry is None:
+        return {'module': module, 'total_ms': 0.0, 'heavy': [], 'slowest': []}
+
+    # importtime lists children before their parent: the entry's subtree is the
+    # run of deeper rows just above it (interpreter startup imports come earlier)
+    start = entry
+    while start > 0 and rows[start - 1][0] > 0:
+        start -= 1
+    subtree = rows[start:entry + 1]
+
+    loaded = {name.split('.')[0] for _, _, _, name in subtree}
+    heavy = [package for package in HEAVY_MODULES if package in loaded]
+    direct = [(cumulative, name) for depth, _, cumulative, name in subtree if depth == 1]
+    slowest = sorted(direct, reverse=True)[:top]
+    total_us = rows[entry][2]
+    return {'module': module, 'total_ms': total_us / 1000, 'heavy': heavy, 'slowest': slowest}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report import-time startup cost for each pipeline script")
+    parser.add_argument('modules', nargs='*', default=ENTRY_POINTS, help='Entry points to profile (default: all)')
+    parser.add_argument('--top', type=int, default=5, help='Slowest direct imports to list per script')
+    parser.add_argument('--check', action='store_true', help='Exit non-zero if a fast-start script loads a heavy module')
+    args = parser.parse_args()
+
+    violations = []
+    print(f"STARTUP IMPORT REPORT ({sys.executable})")
+    print(f"{'Script':<28} | {'Import':<9} | Heavy modules loaded")
+    print("-" * 80)
+    summaries = []
+    for module in args.modules:
+        try:
+            summary = summarize(module, import_profile(module), args.top)
+        except RuntimeError as e:
+            print(f"{module:<28} | {'failed':<9} | {e}")
+            continue
+        summaries.append(summary)
+        print(f"{module:<28} | {summary['total_ms']:>6.0f} ms | {', '.join(summary['heavy']) or '-'}")
+        forbidden = [package for package in FAST_START.get(module, []) if package in summary['heavy']]
+        if forbidden:
+            violations.append((module, forbidden))
+    print("-" * 80)
+
+    for summary in summaries:
+        print(f"\n{summary['module']} - slowest imports:")
+        for cumulative_us, name in summary['slowest']:
+            print(f"  {cumulative_us / 1000:>8.1f} ms  {name}")
+
+    if violations:
+        print()
+        for module, forbidden in violations:
+            print(f"FAST-START VIOLATION: {module} loads {', '.join(forbidden)}")
+        if args.check:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,14 +4,12 @@ Step 1 Chart Generator - Brian's Final Build Plan
 Creates stacked bar chart showing all 6 competitors' sentiment breakdown
 """
 
-import matplotlib.pyplot as plt
-import numpy as np
-import json
 import os
 from datetime import datetime
 from collections import defaultdict
 import subprocess
 from config import *
+import post_ndjson
 
 def get_git_commit_hash():
     """Get current git commit hash"""
@@ -23,12 +21,8 @@ def get_git_commit_hash():
         return "unknown"
 
 def load_data():
-    """Load the working dataset"""
-    if os.path.exists(WORKING_DATA_FILE):
-        with open(WORKING_DATA_FILE, 'r') as f:
-            return json.load(f)
-    else:
-        raise FileNotFoundError("No working data found. Run accurate_scraper.py first.")
+    """Load the working dataset shared by every report step (see post_ndjson.load_working_data)"""
+    return post_ndjson.load_working_data()
 
 def analyze_brand_sentiment(data):
     """Analyze sentiment breakdown by brand (all competitors for Step 1)"""
@@ -49,6 +43,9 @@ def analyze_brand_sentiment(data):
 
 def create_chart(brand_sentiment, data):
     """Create Step 1 chart per Brian's exact specifications"""
+    # matplotlib/numpy are only needed to draw, so they load here rather than at startup
+    import matplotlib.pyplot as plt
+    import numpy as np
     
     # Prepare data for stacking
     positive_counts = [brand_sentiment[brand]['positive'] for brand in ALL_COMPETITORS]
@@ -5,13 +5,14 @@ Deep dive into HelloFresh and Factor75 with actionable insights
 Uses same dataset as Step 1 for validation sync
 """
 
-import json
 import os
 from datetime import datetime
 from config import PRIMARY_DEEPDIVE
 from collections import defaultdict
 import subprocess
 from config import *
+import post_ndjson
+from keyword_rules import STEP2_THEME_KEYWORDS, shared_matcher
 
 def get_git_commit_hash():
     """Get current git commit hash"""
@@ -23,12 +24,8 @@ def get_git_commit_hash():
         return "unknown"
 
 def load_data():
-    """Load the same working dataset used by Step 1"""
-    if os.path.exists(WORKING_DATA_FILE):
-        with open(WORKING_DATA_FILE, 'r') as f:
-            return json.load(f)
-    else:
-        raise FileNotFoundError("No working data found. Run accurate_scraper.py first.")
+    """Load the working dataset shared by every report step (see post_ndjson.load_working_data)"""
+    return post_ndjson.load_working_data()
 
 def calculate_engagement_score(post):
     """Calculate engagement score: score + 3×comments (Brian's spec)"""
@@ -43,7 +40,7 @@ def get_posts_by_brand(data, target_brands=None):
     
     posts_by_brand = defaultdict(list)
     
-    for post in data.get('posts', []):
+    for post in post_ndjson.select(data.get('posts', []), brands=target_brands):
         # Use primary_brand to ensure post is ABOUT this brand, not just mentioning it
         primary_brand = post.get('primary_brand')
         
@@ -55,27 +52,28 @@ def get_posts_by_brand(data, target_brands=None):
     
     return posts_by_brand
 
+def engagement_order(post):
+    """Sort key: engagement, then newest, then URL (so the order posts were stored in never matters)"""
+    return post['engagement_score'], post.get('created_utc', 0), post.get('url', '')
+
 def get_top_posts_by_sentiment(posts, sentiment, limit=3):
     """Get top posts by engagement for a specific sentiment"""
     filtered_posts = [p for p in posts if p.get('sentiment') == sentiment]
-    sorted_posts = sorted(filtered_posts, key=lambda x: x['engagement_score'], reverse=True)
+    sorted_posts = sorted(filtered_posts, key=engagement_order, reverse=True)
     return sorted_posts[:limit]
 
 def categorize_post_themes(posts):
     """Categorize posts into themes (Quality, Delivery, Service, Price)"""
-    theme_keywords = {
-        'Quality': ['taste', 'flavor', 'fresh', 'quality', 'ingredients', 'cooking', 'recipe', 'delicious', 'bland', 'tasteless'],
-        'Delivery': ['delivery', 'shipping', 'late', 'on time', 'packaging', 'arrived', 'damaged', 'cold', 'frozen'],
-        'Service': ['customer service', 'support', 'refund', 'cancel', 'subscription', 'billing', 'help', 'complaint'],
-        'Price': ['price', 'cost', 'expensive', 'cheap', 'value', 'money', 'worth', 'affordable', 'overpriced']
-    }
+    # Theme keywords live in keyword_rules (compiled into the shared matcher)
+    matcher = shared_matcher()
     
     theme_counts = {'Quality': 0, 'Delivery': 0, 'Service': 0, 'Price': 0}
     
     for post in posts:
         text = (post.get('title', '') + ' ' + post.get('selftext', '')).lower()
-        for theme, keywords in theme_keywords.items():
-            if any(keyword in text for keyword in keywords):
+        matches = matcher.scan(text)
+        for theme in STEP2_THEME_KEYWORDS:
+            if matches.has(f'step2_theme:{theme}'):
                 theme_counts[theme] += 1
                 break
     
@@ -87,7 +85,7 @@ def analyze_brand_totals(data):
     
     for brand in PRIMARY_DEEPDIVE:
         pos = neg = neu = 0
-        for post in data.get('posts', []):
+        for post in post_ndjson.select(data.get('posts', []), brands=[brand]):
             # Use primary_brand to ensure post is ABOUT this brand, not just mentioning it
             if post.get('primary_brand') == brand:
                 sentiment = post.get('sentiment', 'neutral')
@@ -287,7 +285,7 @@ def create_html_report(posts_by_brand, brand_totals, data):
             <tbody>"""
         
         # Sort all posts by engagement
-        sorted_posts = sorted(brand_posts, key=lambda x: x['engagement_score'], reverse=True)
+        sorted_posts = sorted(brand_posts, key=engagement_order, reverse=True)
         for post in sorted_posts:
             html += f"""
                 <tr>
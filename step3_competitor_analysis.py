@@ -4,28 +4,21 @@ Step 3: Competitor Deep Dive Analysis
 Benchmark insights against top competitors - strengths/weaknesses table
 """
 
-import json
-import os
 from datetime import datetime
 from collections import defaultdict
 from config import *
+import post_ndjson
+from step2_ACTIONABLE_analysis import engagement_order
+from keyword_rules import STEP3_THEME_KEYWORDS, shared_matcher
 
 def load_data():
-    """Load the working dataset"""
-    if os.path.exists(WORKING_DATA_FILE):
-        with open(WORKING_DATA_FILE, 'r') as f:
-            return json.load(f)
-    else:
-        raise FileNotFoundError("No working data found. Run accurate_scraper.py first.")
+    """Load the working dataset shared by every report step (see post_ndjson.load_working_data)"""
+    return post_ndjson.load_working_data()
 
 def categorize_post_themes(posts):
     """Categorize posts into themes (Quality, Delivery, Service, Price)"""
-    theme_keywords = {
-        'Quality': ['taste', 'flavor', 'fresh', 'quality', 'ingredients', 'cooking', 'recipe', 'delicious', 'bland', 'tasteless', 'amazing', 'terrible'],
-        'Delivery': ['delivery', 'shipping', 'late', 'on time', 'packaging', 'arrived', 'damaged', 'cold', 'frozen', 'early', 'fast'],
-        'Service': ['customer service', 'support', 'refund', 'cancel', 'subscription', 'billing', 'help', 'complaint', 'response', 'staff'],
-        'Price': ['price', 'cost', 'expensive', 'cheap', 'value', 'money', 'worth', 'affordable', 'overpriced', 'budget', 'deal']
-    }
+    # Theme keywords live in keyword_rules (compiled into the shared matcher)
+    matcher = shared_matcher()
     
     theme_sentiment = defaultdict(lambda: {'positive': 0, 'negative': 0, 'neutral': 0})
     
@@ -33,8 +26,9 @@ def categorize_post_themes(posts):
         text = (post.get('title', '') + ' ' + post.get('selftext', '')).lower()
         sentiment = post.get('sentiment', 'neutral')
         
-        for theme, keywords in theme_keywords.items():
-            if any(keyword in text for keyword in keywords):
+        matches = matcher.scan(text)
+        for theme in STEP3_THEME_KEYWORDS:
+            if matches.has(f'step3_theme:{theme}'):
                 theme_sentiment[theme][sentiment] += 1
                 break
     
@@ -45,7 +39,7 @@ def analyze_competitor_themes(data):
     competitor_themes = {}
     
     for brand in ALL_COMPETITORS:
-        brand_posts = [post for post in data.get('posts', []) if post.get('primary_brand') == brand]
+        brand_posts = list(post_ndjson.select(data.get('posts', []), brands=[brand]))
         if brand_posts:
             theme_sentiment = categorize_post_themes(brand_posts)
             competitor_themes[brand] = theme_sentiment
@@ -58,7 +52,7 @@ def generate_strengths_weaknesses(competitor_themes, data):
     
     for brand in ALL_COMPETITORS:
         # Get actual posts for this brand
-        brand_posts = [p for p in data.get('posts', []) if p.get('primary_brand') == brand]
+        brand_posts = list(post_ndjson.select(data.get('posts', []), brands=[brand]))
         
         if not brand_posts:
             # No posts recorded this week
@@ -158,7 +152,7 @@ def create_competitor_table_html(competitor_analysis, data):
     other_competitors = [b for b in ALL_COMPETITORS if b not in PRIMARY_DEEPDIVE]
     
     for brand in other_competitors:
-        brand_posts = [post for post in data.get('posts', []) if post.get('primary_brand') == brand]
+        brand_posts = list(post_ndjson.select(data.get('posts', []), brands=[brand]))
         if not brand_posts:
             continue
             
@@ -168,9 +162,9 @@ def create_competitor_table_html(competitor_analysis, data):
         
         # Get top 3 positive and negative
         top_positive = sorted([p for p in brand_posts if p.get('sentiment') == 'positive'], 
-                             key=lambda x: x['engagement_score'], reverse=True)[:3]
+                             key=engagement_order, reverse=True)[:3]
         top_negative = sorted([p for p in brand_posts if p.get('sentiment') == 'negative'], 
-                             key=lambda x: x['engagement_score'], reverse=True)[:3]
+                             key=engagement_order, reverse=True)[:3]
         
         html += f"""
         <h2 style="margin-top: 40px; color: #166534;">{brand} - Top Reddit Posts</h2>
@@ -0,0 +1,63 @@
+"""Brand attribution of posts from merged (multi-brand) fetches"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from accurate_scraper import AccurateScraper
+from post_index import PostIndex
+from query_planner import plan_sources, search_url
+
+MERGED_BRANDS = ['HelloFresh', 'Factor75', 'Home Chef']
+
+
+def scraper():
+    scraper = AccurateScraper(analysis_only=True, sentiment_engine='rules')
+    scraper.post_index = PostIndex()
+    return scraper
+
+
+def post(post_id, title, requested='HelloFresh'):
+    return {'post_id': post_id, 'title': title, 'selftext': '', 'url': f'https://reddit.com/comments/{post_id}/',
+            'competitors_mentioned': [requested], 'source_brand': requested}
+
+
+def test_single_candidate_takes_that_brand():
+    posts, dropped = scraper().attribute_brands([post('a1', 'Factor meals were cold again')], MERGED_BRANDS)
+    assert dropped == 0
+    assert posts[0]['source_brand'] == 'Factor75'
+    assert posts[0]['competitors_mentioned'] == ['Factor75']
+
+
+def test_multi_brand_post_keeps_requested_brand():
+    title = 'Home Chef vs Factor vs HelloFresh - which one?'
+    posts, _ = scraper().attribute_brands([post('a2', title, requested='Factor75')], MERGED_BRANDS)
+    assert posts[0]['source_brand'] == 'Factor75'
+    assert posts[0]['competitors_mentioned'] == MERGED_BRANDS
+
+
+def test_multi_brand_post_follows_fetch_order_not_text_order():
+    title = 'Switched from Home Chef to HelloFresh'
+    forward, _ = scraper().attribute_brands([post('a3', title, requested='Factor75')], MERGED_BRANDS)
+    reverse, _ = scraper().attribute_brands([post('a3', title, requested='Factor75')], MERGED_BRANDS[::-1])
+    assert forward[0]['source_brand'] == 'HelloFresh'
+    assert reverse[0]['source_brand'] == 'Home Chef'
+
+
+def test_posts_naming_no_brand_are_counted_and_released():
+    s = scraper()
+    s.post_index.claim('t3_a4')
+    posts, dropped = s.attribute_brands([post('a4', 'Which meal kit is cheapest?')], MERGED_BRANDS)
+    assert posts == []
+    assert dropped == 1
+    # Another source can still take the post
+    assert s.post_index.claim('t3_a4')
+
+
+def test_or_queries_are_capped_by_brand():
+    brands = ['HelloFresh', 'Factor75', 'Home Chef', 'Blue Apron', 'Marley Spoon']
+    jobs = [(brand, search_url(brand.lower(), 'mealkits')) for brand in brands]
+    plan = plan_sources(jobs, max_brands=2)
+    assert [planned['brands'] for planned in plan] == [brands[0:2], brands[2:4], brands[4:]]
+    assert sorted(job for planned in plan for job in planned['jobs']) == sorted(jobs)
@@ -0,0 +1,51 @@
+"""Typed Post records keep every field the scraper writes"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_codec
+from accurate_scraper import AccurateScraper
+from batch_scoring import SCORED_FIELDS
+from pipeline_stages import StageStats
+from post_index import PostIndex
+from web_listings import json_post
+
+LISTING_DATA = {
+    'name': 't3_abc123', 'title': 'HelloFresh box review', 'selftext': 'My hellofresh meal kit arrived',
+    'score': 12, 'num_comments': 4, 'subreddit': 'hellofresh', 'permalink': '/r/hellofresh/comments/abc123/x/',
+    'created_utc': 1763400000.0, 'author': 'someone', 'upvote_ratio': 0.9, 'is_self': True
+}
+
+
+def scraper():
+    s = AccurateScraper(analysis_only=True, sentiment_engine='rules')
+    s.post_index = PostIndex()
+    s.stages = StageStats()
+    return s
+
+
+def scored(post):
+    return dict(post, **{field: 'x' if field != 'confidence' else 0.5 for field in SCORED_FIELDS})
+
+
+def assert_round_trips(post):
+    typed = data_codec.decode_posts(data_codec.dumps({'posts': [post]}))[0]
+    assert typed.to_dict() == post
+    assert data_codec.Post.from_dict(post).to_dict() == post
+
+
+def test_web_post_fields_survive():
+    post = dict(json_post(LISTING_DATA), competitors_mentioned=['HelloFresh'], source_brand='HelloFresh',
+                source_url='https://www.reddit.com/r/hellofresh/search/')
+    assert_round_trips(scored(post))
+
+
+def test_extract_post_data_fields_survive():
+    praw_post = SimpleNamespace(subreddit=SimpleNamespace(display_name=LISTING_DATA['subreddit']),
+                                **{key: value for key, value in LISTING_DATA.items() if key != 'subreddit'})
+    post = scraper().extract_post_data(praw_post, 'HelloFresh', 'https://www.reddit.com/r/hellofresh/search/')
+    assert post['post_id'] == 't3_abc123'
+    assert_round_trips(scored(post))
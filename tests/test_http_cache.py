@@ -0,0 +1,32 @@
+"""HTTP cache eviction of files no cache entry owns"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from http_cache import HTTPCache
+
+
+def write(cache_dir, name, age):
+    path = os.path.join(cache_dir, name)
+    with open(path, 'w') as f:
+        json.dump({'url': name, 'stored_at': time.time(), 'size': 1}, f)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+
+
+def test_evict_sweeps_stale_tmp_files_and_unpaired_bodies(tmp_path):
+    stale = 2 * 3600
+    write(tmp_path, 'interrupted.json.140001.tmp', stale)
+    write(tmp_path, 'orphan.body', stale)
+    write(tmp_path, 'entry.json', stale)
+    write(tmp_path, 'entry.body', stale)
+    # A body whose metadata is still being written
+    write(tmp_path, 'writing.body', 0)
+
+    cache = HTTPCache(cache_dir=str(tmp_path), ttl=3600)
+    assert sorted(os.listdir(tmp_path)) == ['entry.body', 'entry.json', 'writing.body']
+    assert cache.stats()['swept'] == 2
@@ -0,0 +1,71 @@
+"""Incremental scraping: when a source's high-water mark may advance"""
+
+import os
+import sys
+from datetime import datetime, timezone, timedelta
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from accurate_scraper import AccurateScraper
+from data_codec import dumps
+from source_state import SourceStateStore
+
+SOURCE = 'https://www.reddit.com/r/mealkits/search/?q=hellofresh&type=posts&t=week&restrict_sr=1'
+NOW = datetime.now(timezone.utc)
+START = NOW - timedelta(days=7)
+
+
+def child(post_id, hours_ago):
+    return {'kind': 't3', 'data': {
+        'name': f't3_{post_id}', 'title': f'HelloFresh box {post_id}', 'selftext': 'my hellofresh meal kit',
+        'subreddit': 'mealkits', 'permalink': f'/r/mealkits/comments/{post_id}/x/',
+        'created_utc': (NOW - timedelta(hours=hours_ago)).timestamp()
+    }}
+
+
+class Response:
+    def __init__(self, children, after):
+        self.content = dumps({'kind': 'Listing', 'data': {'children': children, 'after': after}})
+
+
+def scraper(tmp_path, pages):
+    """A scraper whose .json listing serves pages in turn (a page that is None fails)"""
+    s = AccurateScraper()
+    s.reddit = None
+    s.source_state = SourceStateStore(path=str(tmp_path / 'state.json'))
+    served = iter(pages)
+
+    def web_get_retrying(url, headers, accept=None, max_retries=3):
+        page = next(served)
+        if page is None:
+            raise requests.exceptions.ConnectionError('page failed')
+        return page
+
+    s.web_get_retrying = web_get_retrying
+    return s
+
+
+def test_failed_second_page_keeps_the_mark(tmp_path):
+    # Stored from last run: posts up to 30 hours ago
+    s = scraper(tmp_path, [Response([child('old1', 30), child('old2', 40)], None)])
+    s.scrape_source(SOURCE, 'HelloFresh', START, NOW)
+    s.source_state.save()
+    mark = s.source_state.high_water_mark(SOURCE, START)
+
+    # This run: page 1 has the newest posts, page 2 (reaching back to the mark) fails
+    s = scraper(tmp_path, [Response([child('new1', 1), child('new2', 2)], 't3_new2'), None])
+    posts = s.scrape_source(SOURCE, 'HelloFresh', START, NOW)
+    assert s._local.listing_stats['stopped'] == 'error'
+    assert {p['post_id'] for p in posts} == {'t3_new1', 't3_new2', 't3_old1', 't3_old2'}
+    assert s.source_state.high_water_mark(SOURCE, START) == mark
+    s.source_state.save()
+
+    # Next run resumes from the old mark, so the posts behind the failed page are fetched
+    s = scraper(tmp_path, [Response([child('new1', 1), child('new2', 2)], 't3_new2'),
+                           Response([child('gap1', 10), child('old1', 30)], None)])
+    posts = s.scrape_source(SOURCE, 'HelloFresh', START, NOW)
+    assert s._local.listing_stats['stopped'] == 'high_water_mark'
+    assert 't3_gap1' in {p['post_id'] for p in posts}
+    assert s.source_state.high_water_mark(SOURCE, START)[1] == 't3_new1'
@@ -0,0 +1,27 @@
+"""Streaming pipeline shutdown: closing the consumer stops every stage thread"""
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from post_stream import stream
+
+
+def test_close_stops_stages_waiting_on_an_empty_queue():
+    release = threading.Event()
+
+    def source():
+        yield 1
+        release.wait(5)  # a source stuck on a slow fetch
+
+    before = set(threading.enumerate())
+    pipeline = stream(source(), [lambda items: (item * 2 for item in items)] * 2)
+    assert next(pipeline) == 2 * 2
+    pipeline.close()
+
+    # Only the source thread, still inside its own fetch, may outlive the close
+    alive = [thread for thread in set(threading.enumerate()) - before if thread.is_alive()]
+    release.set()
+    assert len(alive) <= 1
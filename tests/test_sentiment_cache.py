@@ -0,0 +1,38 @@
+"""Sentiment cache persistence (the database file alone is what CI carries between runs)"""
+
+import os
+import shutil
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sentiment_cache import SentimentCache
+
+
+def test_close_checkpoints_every_thread_into_the_database_file(tmp_path):
+    cache = SentimentCache(path=str(tmp_path / 'sentiment.sqlite3'))
+    threads = [threading.Thread(target=cache.put, args=(f'key{i}', {'sentiment': 'positive'})) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    cache.put('main', {'sentiment': 'negative'})
+    cache.close()
+
+    wal = tmp_path / 'sentiment.sqlite3-wal'
+    assert not wal.exists() or wal.stat().st_size == 0
+
+    # Only the database file is restored next run
+    os.makedirs(tmp_path / 'restored')
+    shutil.copy(tmp_path / 'sentiment.sqlite3', tmp_path / 'restored' / 'sentiment.sqlite3')
+    restored = SentimentCache(path=str(tmp_path / 'restored' / 'sentiment.sqlite3'))
+    assert restored.get('key3') == {'sentiment': 'positive'}
+    assert restored.get('main') == {'sentiment': 'negative'}
+
+
+def test_cache_reopens_after_close(tmp_path):
+    cache = SentimentCache(path=str(tmp_path / 'sentiment.sqlite3'))
+    cache.put('a', {'sentiment': 'neutral'})
+    cache.close()
+    assert cache.get('a') == {'sentiment': 'neutral'}
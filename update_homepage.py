@@ -3,18 +3,17 @@
 Update homepage with current actionable data
 """
 
-import json
-import os
 import re
 from datetime import datetime
 from config import ALL_COMPETITORS, PRIMARY_DEEPDIVE
+import post_ndjson
 
 def load_latest_data():
-    """Load the latest working data"""
-    if os.path.exists('reports/working_reddit_data.json'):
-        with open('reports/working_reddit_data.json', 'r') as f:
-            return json.load(f)
-    return None
+    """Load the latest working data (the dataset steps 1-3 reported on)"""
+    try:
+        return post_ndjson.load_working_data()
+    except FileNotFoundError:
+        return None
 
 def calculate_brand_stats(data):
     """Calculate current brand statistics"""
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Reddit Web Listings (.json endpoints, old.reddit.com HTML fallback)
+Turns a scrape source into its public .json listing URL (new-sorted, paged
+with 'after') and parses listing pages with the shared codec (data_codec:
+orjson when it is installed, stdlib json otherwise). parse_html_listing is
+the old old.reddit.com page parser, kept for when the .json endpoints are
+unavailable
+"""
+
+import re
+from datetime import datetime
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+
+from config import LISTING_PAGE_SIZE, WEB_JSON_HOST
+from data_codec import loads
+from query_planner import parse_source
+
+
+def json_listing_url(url, after=None, host=WEB_JSON_HOST):
+    """Public .json listing for a normalized source URL, LISTING_PAGE_SIZE posts per page
+
+    Subreddit sources without a query become r/<subreddit>/new; searches keep
+    their query and time filter, sorted by new so paging can stop at the window start.
+    """
+    subreddit, query = parse_source(url)
+    if subreddit and not query:
+        path = f"/r/{subreddit}/new.json"
+        params = {}
+    else:
+        path = f"/r/{subreddit}/search.json" if subreddit else "/search.json"
+        params = {'q': query, 'sort': 'new', 't': parse_qs(urlparse(url).query).get('t', ['week'])[0]}
+        if subreddit:
+            params['restrict_sr'] = 'on'
+    params['limit'] = LISTING_PAGE_SIZE
+    params['raw_json'] = 1  # titles/self-text without HTML entity escaping
+    if after:
+        params['after'] = after
+    return urlunparse(('https', host, path, '', urlencode(params), ''))
+
+
+def json_post(data):
+    """Post fields from one listing child's data (the fields extract_post_data takes from PRAW)"""
+    return {
+        'post_id': data.get('name') or f"t3_{data.get('id')}",
+        'title': data.get('title', ''),
+        'selftext': data.get('selftext') or '',
+        'score': data.get('score', 0),
+        'num_comments': data.get('num_comments', 0),
+        'subreddit': data.get('subreddit', 'Unknown'),
+        'url': f"https://reddit.com{data.get('permalink', '')}",
+        'created_utc': float(data.get('created_utc', 0)),
+        'author': data.get('author') or 'Unknown',
+        'upvote_ratio': data.get('upvote_ratio', 0.5),
+        'is_self': data.get('is_self', True)
+    }
+
+
+def parse_json_listing(body):
+    """(posts, after) from a .json listing page; raises ValueError if it is not a listing"""
+    listing = loads(body)
+    if not isinstance(listing, dict) or listing.get('kind') != 'Listing':
+        raise ValueError("response is not a Reddit listing")
+    data = listing.get('data') or {}
+    posts = [json_post(child['data']) for child in data.get('children', []) if child.get('kind') == 't3']
+    return posts, data.get('after')
+
+
+def parse_html_listing(body, default_created_utc):
+    """Posts from an old.reddit.com listing page (no self-text; default_created_utc if a post has no time)"""
+    from bs4 import BeautifulSoup
+
+    posts = []
+    soup = BeautifulSoup(body, 'html.parser')
+
+    # Find all post links on old.reddit.com
+    for thing in soup.find_all('div', class_='thing'):
+        try:
+            title_elem = thing.find('a', class_='title')
+            if not title_elem:
+                continue
+
+            title = title_elem.get_text().strip()
+            post_url = title_elem.get('href', '')
+            if post_url.startswith('/'):
+                post_url = f"https://old.reddit.com{post_url}"
+
+            # Get score
+            score_elem = thing.find('div', class_='score')
+            score = 0
+            if score_elem:
+                score_text = score_elem.get_text().strip()
+                if score_text and score_text != '•':
+                    try:
+                        score = int(score_text)
+                    except ValueError:
+                        pass
+
+            # Get comments count
+            comments_elem = thing.find('a', class_='comments')
+            num_comments = 0
+            if comments_elem:
+                comments_text = comments_elem.get_text().strip()
+                num_comments = int(re.sub(r'\D', '', comments_text) or '0')
+
+            subreddit_elem = thing.find('a', class_='subreddit')
+            author_elem = thing.find('a', class_='author')
+
+            post_time_elem = thing.find('time')
+            created_utc = default_created_utc
+            if post_time_elem and 'datetime' in post_time_elem.attrs:
+                try:
+                    created_utc = datetime.fromisoformat(post_time_elem['datetime'].replace('Z', '+00:00')).timestamp()
+                except ValueError:
+                    pass
+
+            posts.append({
+                'post_id': thing.get('data-fullname'),
+                'title': title,
+                'selftext': '',  # Old reddit listings don't show full text
+                'score': score,
+                'num_comments': num_comments,
+                'subreddit': subreddit_elem.get_text().strip() if subreddit_elem else 'Unknown',
+                'url': post_url,
+                'created_utc': created_utc,
+                'author': author_elem.get_text().strip() if author_elem else 'Unknown',
+                'upvote_ratio': 0.8,  # Default
+                'is_self': True
+            })
+        except Exception as e:
+            print(f"  Error parsing post: {e}")
+            continue
+
+    return posts